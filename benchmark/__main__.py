@@ -0,0 +1,117 @@
+# benchmark/__main__.py
+"""Benchmark harness for the controllers.
+
+    python -m benchmark run --scales 1k,100k --out bench.json
+    python -m benchmark compare baseline.json bench.json --threshold 0.1
+"""
+import argparse
+import json
+import os
+import sys
+
+# Default directory for the generated SQLite databases
+DEFAULT_DATA_DIR = ".bench"
+
+
+def parse_scale(value):
+    """Parses case counts such as 1000, 100k or 1M."""
+    value = value.strip().lower()
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(value[-1:], 1)
+    number = value[:-1] if multiplier != 1 else value
+    return int(float(number) * multiplier)
+
+
+def command_run(args):
+    # The app's engine is created on import, so point it at the benchmark
+    # data before anything from src is loaded; scenarios use their own engines
+    os.makedirs(args.data_dir, exist_ok=True)
+    os.environ.setdefault(
+        "DATABASE_URL", f"sqlite:///{os.path.join(args.data_dir, 'default.sqlite')}")
+
+    # pylint: disable=import-outside-toplevel
+    from benchmark.datagen import DataSpec
+    from benchmark.runner import run
+
+    specs = [
+        DataSpec(
+            cases=parse_scale(scale),
+            people=args.people,
+            suspects_per_case=args.suspects_per_case,
+            victims_per_case=args.victims_per_case,
+            date_spread_days=args.date_spread_days,
+            seed=args.seed,
+        )
+        for scale in args.scales.split(",")
+    ]
+    only = args.only.split(",") if args.only else None
+    report = run(specs, args.data_dir, args.warmup,
+                 args.iterations, only, args.warm_cache)
+
+    with open(args.out, "w", encoding="utf-8") as out:
+        json.dump(report, out, indent=2)
+    print(f"Results written to {args.out}")
+    return 0
+
+
+def command_compare(args):
+    # pylint: disable=import-outside-toplevel
+    from benchmark.report import compare
+
+    with open(args.baseline, encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+    with open(args.current, encoding="utf-8") as current_file:
+        current = json.load(current_file)
+
+    rows = compare(baseline, current, args.threshold,
+                   args.min_delta_ms, args.metric)
+    regressions = [row for row in rows if row["regression"]]
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(f"{row['scale']:>9} {row['scenario']:<45} {row['before_ms']:9.3f} -> "
+              f"{row['after_ms']:9.3f} ms  x{row['ratio']:.2f} {flag}")
+    print(f"{len(regressions)} regression(s) out of {len(rows)} scenario(s)")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmark")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser(
+        "run", help="time every controller method")
+    run_parser.add_argument("--scales", default="1k",
+                            help="comma separated case counts, e.g. 1k,100k,1M")
+    run_parser.add_argument("--people", type=int, default=None,
+                            help="suspects and victims each (default: cases / 10)")
+    run_parser.add_argument("--suspects-per-case", type=int, default=2)
+    run_parser.add_argument("--victims-per-case", type=int, default=1)
+    run_parser.add_argument("--date-spread-days", type=int, default=3650)
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--warmup", type=int, default=2)
+    run_parser.add_argument("--iterations", type=int, default=10)
+    run_parser.add_argument("--only", default=None,
+                            help="comma separated substrings of scenario names to run")
+    run_parser.add_argument("--warm-cache", action="store_true",
+                            help="keep the controllers' caches between iterations")
+    run_parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    run_parser.add_argument("--out", default="bench.json")
+    run_parser.set_defaults(func=command_run)
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="flag regressions between two runs")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="allowed slowdown as a fraction (default 0.10)")
+    compare_parser.add_argument("--min-delta-ms", type=float, default=0.05,
+                                help="ignore slowdowns smaller than this")
+    compare_parser.add_argument("--metric", default="p50_ms",
+                                choices=["mean_ms", "p50_ms", "p90_ms", "p99_ms"])
+    compare_parser.set_defaults(func=command_compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+# benchmark/datagen.py
+import random
+from datetime import date, timedelta
+
+from src.models.case import Case
+from src.models.case_suspect import CaseSuspect
+from src.models.case_victim import CaseVictim
+from src.models.suspect import Suspect
+from src.models.victim import Victim
+
+# Rows sent per executemany() call
+CHUNK_SIZE = 10_000
+
+PRIORITIES = ["Rendah", "Sedang", "Tinggi"]
+DETECTIVES = [f"Detective {n:02d}" for n in range(1, 41)]
+FIRST_NAMES = ["Budi", "Siti", "Andi", "Dewi", "Agus", "Rina", "Joko", "Sri",
+               "Eko", "Ayu", "Hadi", "Lina", "Rudi", "Maya", "Dian", "Tono"]
+LAST_NAMES = ["Santoso", "Wijaya", "Pratama", "Saputra", "Lestari", "Hidayat",
+              "Kusuma", "Nugroho", "Putri", "Setiawan", "Gunawan", "Halim"]
+
+
+class DataSpec:
+    """Shape of a synthetic dataset; the same spec and seed always give the same rows."""
+
+    def __init__(self, cases, people=None, suspects_per_case=2, victims_per_case=1,
+                 start_date=date(2015, 1, 1), date_spread_days=3650, seed=42):
+        self.cases = cases
+        # One suspect and one victim per ten cases unless told otherwise
+        self.people = people if people is not None else max(cases // 10, 100)
+        self.suspects_per_case = suspects_per_case
+        self.victims_per_case = victims_per_case
+        self.start_date = start_date
+        self.date_spread_days = date_spread_days
+        self.seed = seed
+
+    def as_dict(self):
+        return {
+            "cases": self.cases,
+            "people": self.people,
+            "suspects_per_case": self.suspects_per_case,
+            "victims_per_case": self.victims_per_case,
+            "start_date": self.start_date.isoformat(),
+            "date_spread_days": self.date_spread_days,
+            "seed": self.seed,
+        }
+
+    def file_name(self):
+        return (f"bench_c{self.cases}_p{self.people}_s{self.suspects_per_case}"
+                f"_v{self.victims_per_case}_d{self.date_spread_days}_r{self.seed}.sqlite")
+
+
+def _chunks(rows):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == CHUNK_SIZE:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _people(rng, count, with_gender):
+    for person_id in range(1, count + 1):
+        row = {
+            "id": person_id,
+            "nik": f"{rng.randrange(10 ** 15, 10 ** 16)}",
+            "picture_path": f"img/bench_{person_id % 50}.png",
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "age": rng.randint(12, 80),
+        }
+        if with_gender:
+            row["gender"] = rng.random() < 0.5
+            row["note"] = "Catatan " * rng.randint(5, 60)
+        else:
+            row["forensic_result"] = "Hasil forensik " * rng.randint(5, 60)
+        yield row
+
+
+def _cases(rng, spec):
+    for case_id in range(1, spec.cases + 1):
+        yield {
+            "id": case_id,
+            "progress": rng.randint(0, 2),
+            "startDate": spec.start_date + timedelta(days=rng.randrange(spec.date_spread_days)),
+            "description": "Deskripsi kasus " * rng.randint(10, 120),
+            "detective": rng.choice(DETECTIVES),
+            "priority": rng.choice(PRIORITIES),
+        }
+
+
+def _links(rng, spec, person_column, fanout):
+    fanout = min(fanout, spec.people)
+    for case_id in range(1, spec.cases + 1):
+        for person_id in rng.sample(range(1, spec.people + 1), fanout):
+            yield {"case_id": case_id, person_column: person_id}
+
+
+def generate(engine, spec):
+    """Fills an empty database described by ``spec`` using bulk inserts."""
+    rng = random.Random(spec.seed)
+    tables = [
+        (Suspect.__table__, _people(rng, spec.people, with_gender=True)),
+        (Victim.__table__, _people(rng, spec.people, with_gender=False)),
+        (Case.__table__, _cases(rng, spec)),
+        (CaseSuspect, _links(rng, spec, "suspect_id", spec.suspects_per_case)),
+        (CaseVictim, _links(rng, spec, "victim_id", spec.victims_per_case)),
+    ]
+    with engine.begin() as connection:
+        for table, rows in tables:
+            for chunk in _chunks(rows):
+                connection.execute(table.insert(), chunk)
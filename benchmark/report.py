@@ -0,0 +1,53 @@
+# benchmark/report.py
+
+
+def percentile(sorted_values, fraction):
+    """Linearly interpolated percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+def summarize(samples):
+    """Reduces timings in seconds to a dict of millisecond statistics."""
+    values = sorted(sample * 1000 for sample in samples)
+    return {
+        "n": len(values),
+        "mean_ms": sum(values) / len(values),
+        "min_ms": values[0],
+        "p50_ms": percentile(values, 0.50),
+        "p90_ms": percentile(values, 0.90),
+        "p99_ms": percentile(values, 0.99),
+        "max_ms": values[-1],
+    }
+
+
+def compare(baseline, current, threshold=0.10, min_delta_ms=0.05, metric="p50_ms"):
+    """Lists scenarios whose ``metric`` got more than ``threshold`` slower between two reports.
+
+    Differences below ``min_delta_ms`` are treated as noise.
+    """
+    rows = []
+    for scale, current_scale in current["scales"].items():
+        baseline_scale = baseline["scales"].get(scale)
+        if baseline_scale is None:
+            continue
+        for name, stats in current_scale["results"].items():
+            base_stats = baseline_scale["results"].get(name)
+            if base_stats is None:
+                continue
+            before, after = base_stats[metric], stats[metric]
+            ratio = after / before if before else float("inf")
+            rows.append({
+                "scale": scale,
+                "scenario": name,
+                "before_ms": before,
+                "after_ms": after,
+                "ratio": ratio,
+                "regression": ratio > 1 + threshold and after - before > min_delta_ms,
+            })
+    return rows
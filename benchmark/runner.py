@@ -0,0 +1,207 @@
+# benchmark/runner.py
+import os
+import platform
+import time
+from datetime import date, datetime
+
+import sqlalchemy
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from benchmark.datagen import generate
+from benchmark.report import summarize
+from src.controllers import invalidation
+from src.controllers.calendar_controller import CalendarController
+from src.controllers.case_controller import CaseController
+from src.controllers.pagination import encode_cursor
+from src.controllers.statistics import TOPIC_PANELS, StatisticsService
+from src.controllers.search_controller import SearchController
+from src.controllers.suspect_controller import SuspectController
+from src.controllers.victim_controller import VictimController
+from src.models.database import Base
+from src.models.migrations import run_migrations
+
+# Every statistics panel, for the full Statistic view workload
+STATISTICS_PANELS = sorted({panel for panels in TOPIC_PANELS.values() for panel in panels})
+
+
+class Context:
+    """Controllers bound to one benchmark session plus sample IDs to query with."""
+
+    def __init__(self, db, spec):
+        self.db = db
+        self.spec = spec
+        self.cases = CaseController(db)
+        self.suspects = SuspectController(db)
+        self.victims = VictimController(db)
+        self.calendar = CalendarController(db)
+        self.search = SearchController(db)
+        self.case_id = max(spec.cases // 2, 1)
+        self.person_id = max(spec.people // 2, 1)
+        middle = spec.start_date.toordinal() + spec.date_spread_days // 2
+        self.month = date.fromordinal(middle).month
+        self.year = date.fromordinal(middle).year
+        self.deep_page = max(spec.cases // 12 - 1, 1)
+        self.deep_cursor = None
+
+
+def _deep_cursor(ctx):
+    if ctx.deep_cursor is None:
+        # Walk once to a cursor near the end; later iterations reuse it
+        result = ctx.cases.get_all_cases_pagination(
+            ctx.deep_page, 12, None)
+        last = result["cases"][-1] if result["cases"] else None
+        ctx.deep_cursor = encode_cursor(
+            last.startDate, last.id) if last else None
+    return ctx.cases.get_all_cases_cursor(ctx.deep_cursor, 12)
+
+
+def _case_round_trip(ctx):
+    case = ctx.cases.add_case(0, date(2024, 1, 1), "Benchmark", "Bench", "Rendah")
+    ctx.cases.update_case(case.id, 1, case.startDate,
+                          "Benchmark updated", "Bench", "Sedang")
+    ctx.cases.delete_case(case.id)
+
+
+def _suspect_round_trip(ctx):
+    suspect = ctx.suspects.add_suspect(
+        "0000", "img/bench.png", "Bench Suspect", 30, "True", "-")
+    ctx.suspects.update_suspect(suspect.id, name="Bench Suspect 2")
+    ctx.suspects.delete_suspect(suspect.id)
+
+
+def _victim_round_trip(ctx):
+    victim = ctx.victims.add_victim(
+        "0000", "img/bench.png", "Bench Victim", 30, "-")
+    ctx.victims.update_victim(victim.id, name="Bench Victim 2")
+    ctx.victims.delete_victim(victim.id)
+
+
+def _assign_suspect_round_trip(ctx):
+    ctx.cases.assign_suspect_to_case(ctx.case_id, ctx.spec.people)
+    ctx.cases.remove_suspect_from_case(ctx.case_id, ctx.spec.people)
+
+
+def _assign_victim_round_trip(ctx):
+    ctx.cases.assign_victim_to_case(ctx.case_id, ctx.spec.people)
+    ctx.cases.remove_victim_from_case(ctx.case_id, ctx.spec.people)
+
+
+# Scenario name -> callable(ctx); names are stable so runs can be compared
+SCENARIOS = {
+    "case.get_all_cases": lambda ctx: ctx.cases.get_all_cases(),
+    "case.get_case_by_id": lambda ctx: ctx.cases.get_case_by_id(ctx.case_id),
+    "case.get_all_cases_pagination.first": lambda ctx: ctx.cases.get_all_cases_pagination(1, 12, None),
+    "case.get_all_cases_pagination.deep": lambda ctx: ctx.cases.get_all_cases_pagination(ctx.deep_page, 12, None),
+    "case.get_all_cases_pagination.filtered": lambda ctx: ctx.cases.get_all_cases_pagination(1, 12, 1),
+    "case.get_all_cases_cursor.first": lambda ctx: ctx.cases.get_all_cases_cursor(None, 12),
+    "case.get_all_cases_cursor.deep": _deep_cursor,
+    "case.count_cases": lambda ctx: ctx.cases.count_cases(),
+    "case.get_unassigned_suspects": lambda ctx: ctx.cases.get_unassigned_suspects(ctx.case_id),
+    "case.get_unassigned_victims": lambda ctx: ctx.cases.get_unassigned_victims(ctx.case_id),
+    "case.get_top_ten_suspects": lambda ctx: ctx.cases.get_top_ten_suspects(),
+    "case.get_top_ten_victims": lambda ctx: ctx.cases.get_top_ten_victims(),
+    "case.get_statistics": lambda ctx: StatisticsService(ctx.cases.db).get(*STATISTICS_PANELS),
+    "case.add_update_delete": _case_round_trip,
+    "case.assign_remove_suspect": _assign_suspect_round_trip,
+    "case.assign_remove_victim": _assign_victim_round_trip,
+    "suspect.get_all_suspects": lambda ctx: ctx.suspects.get_all_suspects(),
+    "suspect.get_suspect_by_id": lambda ctx: ctx.suspects.get_suspect_by_id(ctx.person_id),
+    "suspect.get_suspects_by_case": lambda ctx: list(ctx.suspects.get_suspects_by_case(ctx.case_id)),
+    "suspect.get_suspects_page": lambda ctx: ctx.suspects.get_suspects_page(1, 12),
+    "suspect.search_suspects": lambda ctx: ctx.suspects.search_suspects(name="budi", nik="12"),
+    "suspect.add_update_delete": _suspect_round_trip,
+    "victim.get_all_victims": lambda ctx: ctx.victims.get_all_victims(),
+    "victim.get_victim_by_id": lambda ctx: ctx.victims.get_victim_by_id(ctx.person_id),
+    "victim.get_victims_by_case": lambda ctx: list(ctx.victims.get_victims_by_case(ctx.case_id)),
+    "victim.iter_victim_batches": lambda ctx: next(ctx.victims.iter_victim_batches(), None),
+    "victim.get_victims_before": lambda ctx: ctx.victims.get_victims_before(ctx.person_id),
+    "victim.search_victims": lambda ctx: ctx.victims.search_victims(name="siti", nik="12"),
+    "victim.add_update_delete": _victim_round_trip,
+    "calendar.get_all_cases": lambda ctx: ctx.calendar.get_all_cases(ctx.month, ctx.year),
+    "calendar.get_filtered_cases": lambda ctx: ctx.calendar.get_filtered_cases(ctx.month, ctx.year, priority="Tinggi"),
+    "calendar.get_daily_counts": lambda ctx: ctx.calendar.get_daily_counts(ctx.month, ctx.year),
+    "search.search_people": lambda ctx: ctx.search.search_people(name="dewi", nik="12"),
+}
+
+
+def prepare_database(spec, data_dir):
+    """Returns an engine for the spec's database file, generating it on first use."""
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, spec.file_name())
+    fresh = not os.path.exists(path)
+    engine = create_engine(f"sqlite:///{path}")
+    if fresh:
+        try:
+            Base.metadata.create_all(bind=engine)
+            started = time.perf_counter()
+            generate(engine, spec)
+            print(f"  generated {spec.cases} cases in "
+                  f"{time.perf_counter() - started:.1f}s -> {path}")
+        except BaseException:
+            engine.dispose()
+            os.remove(path)
+            raise
+    run_migrations(engine)
+    return engine
+
+
+def _invalidate_caches():
+    invalidation.notify(invalidation.CASES, invalidation.ASSIGNMENTS,
+                        invalidation.SUSPECTS, invalidation.VICTIMS)
+
+
+def run_scale(spec, data_dir, warmup=2, iterations=10, only=None, warm_cache=False):
+    """Times every scenario against the dataset described by ``spec``."""
+    engine = prepare_database(spec, data_dir)
+    session_factory = sessionmaker(
+        autocommit=False, autoflush=False, bind=engine)
+    results = {}
+    try:
+        for name, scenario in SCENARIOS.items():
+            if only and not any(part in name for part in only):
+                continue
+            db = session_factory()
+            ctx = Context(db, spec)
+            samples = []
+            try:
+                for iteration in range(warmup + iterations):
+                    if not warm_cache:
+                        _invalidate_caches()
+                    started = time.perf_counter()
+                    scenario(ctx)
+                    elapsed = time.perf_counter() - started
+                    # A fresh identity map per call, like one session per user action
+                    db.expunge_all()
+                    if iteration >= warmup:
+                        samples.append(elapsed)
+            finally:
+                db.close()
+            results[name] = summarize(samples)
+            print(f"  {name:<45} p50 {results[name]['p50_ms']:9.3f} ms"
+                  f"  p90 {results[name]['p90_ms']:9.3f} ms")
+    finally:
+        engine.dispose()
+        _invalidate_caches()
+    return {"data": spec.as_dict(), "results": results}
+
+
+def run(specs, data_dir, warmup=2, iterations=10, only=None, warm_cache=False):
+    """Runs the benchmark at every scale and returns the JSON-serializable report."""
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "platform": platform.platform(),
+            "warmup": warmup,
+            "iterations": iterations,
+            "warm_cache": warm_cache,
+        },
+        "scales": {},
+    }
+    for spec in specs:
+        print(f"Scale {spec.cases} cases / {spec.people} people")
+        report["scales"][str(spec.cases)] = run_scale(
+            spec, data_dir, warmup, iterations, only, warm_cache)
+    return report
@@ -1,15 +1,32 @@
+import os
+
 import flet as ft
 
+from src.models import instrumentation
+from src.models.database import engine
 from src.models.init_database import init_db
+from src.models.session_manager import session_manager
 from src.views.case_view import CaseView
+from src.views.debug_overlay import install_shortcut
+
+# DB_INSTRUMENTATION=true records per-action query statistics (Ctrl+Shift+D)
+INSTRUMENTATION_ENABLED = os.getenv(
+    "DB_INSTRUMENTATION", "false").strip().lower() in ("1", "true", "yes", "on")
 
 
 def main(page: ft.Page):
     page.theme_mode = ft.ThemeMode.DARK
     page.title = "Kasus Kriminal"
-    CaseView().render(page)
+    # Release the page's database session when the client goes away
+    page.on_disconnect = lambda e: session_manager.close(page.session_id)
+    if INSTRUMENTATION_ENABLED:
+        install_shortcut(page)
+    with session_manager.scope(page.session_id):
+        CaseView().render(page)
 
 
 if __name__ == "__main__":
     init_db()
+    if INSTRUMENTATION_ENABLED:
+        instrumentation.install(engine)
     ft.app(main)
@@ -0,0 +1,76 @@
+# controllers/assignments.py
+from sqlalchemy import and_, delete, exists, insert, select, true
+
+from src.controllers import invalidation
+from src.models.case import Case
+from src.models.counters import PERSON_LINKS, recount_case_counts
+
+
+def _insert_ignoring_duplicates(dialect_name, table):
+    """Returns an INSERT that skips rows already present, where the dialect supports it."""
+    # pylint: disable=import-outside-toplevel
+    if dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        return sqlite_insert(table).on_conflict_do_nothing()
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+        return postgresql_insert(table).on_conflict_do_nothing()
+    return None
+
+
+def link_people(db, kind, case_ids, person_ids):
+    """Links every given case to every given person in one INSERT ... SELECT.
+
+    Only pairs whose case and person exist are inserted, and pairs that are
+    already linked are skipped, so calling it twice is harmless. The people's
+    case_count is updated in the same transaction. Returns the number of new
+    links; the caller commits.
+    """
+    model, table, person_column = PERSON_LINKS[kind]
+    case_ids, person_ids = list(case_ids), list(person_ids)
+    if not case_ids or not person_ids:
+        return 0
+
+    # Build the (case, person) pairs from the rows that actually exist
+    pairs = select(Case.id, model.id).join(model, true()).where(
+        Case.id.in_(case_ids), model.id.in_(person_ids))
+
+    statement = _insert_ignoring_duplicates(db.get_bind().dialect.name, table)
+    if statement is None:
+        # Portable fallback: leave out pairs that are already linked
+        statement = insert(table)
+        pairs = pairs.where(~exists().where(and_(
+            table.c.case_id == Case.id, table.c[person_column] == model.id)))
+
+    result = db.execute(statement.from_select(
+        ["case_id", person_column], pairs))
+    if result.rowcount:
+        recount_case_counts(db, kind, person_ids)
+    return result.rowcount
+
+
+def unlink_people(db, kind, case_ids, person_ids):
+    """Removes the links between the given cases and people in one DELETE.
+
+    The people's case_count is updated in the same transaction. Returns the
+    number of links removed; the caller commits.
+    """
+    _model, table, person_column = PERSON_LINKS[kind]
+    case_ids, person_ids = list(case_ids), list(person_ids)
+    if not case_ids or not person_ids:
+        return 0
+
+    result = db.execute(delete(table).where(
+        table.c.case_id.in_(case_ids), table.c[person_column].in_(person_ids)))
+    if result.rowcount:
+        recount_case_counts(db, kind, person_ids)
+    return result.rowcount
+
+
+def change_links(db, change, kind, case_ids, person_ids):
+    """Runs link_people or unlink_people and commits, notifying only if a row changed."""
+    changed = change(db, kind, case_ids, person_ids)
+    db.commit()
+    if changed:
+        invalidation.notify(invalidation.ASSIGNMENTS)
+    return changed
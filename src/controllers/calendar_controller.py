@@ -1,19 +1,227 @@
 # controllers/calendar_controller.py
-from sqlalchemy import extract
-from sqlalchemy.orm import joinedload
+import queue
+import threading
+from collections import OrderedDict
+from datetime import date
+
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
+from src.controllers import invalidation
+from src.controllers.case_filter import CaseFilter
 from src.models.case import Case
+from src.models.loading import LIST, loading_options
+from src.models.suspect import Suspect
+from src.models.victim import Victim
 from src.models.database import SessionLocal
+from src.models.session_manager import session_manager
+
+# Number of (month, filters) entries kept by the month cache
+MONTH_CACHE_SIZE = 48
+
+
+def month_bounds(month, year):
+    """Returns the half-open [start, end) date range covering a month."""
+    month, year = int(month), int(year)
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+
+def adjacent_months(month, year):
+    """Returns the (month, year) pairs before and after the given month."""
+    month, year = int(month), int(year)
+    previous = (12, year - 1) if month == 1 else (month - 1, year)
+    following = (1, year + 1) if month == 12 else (month + 1, year)
+    return [previous, following]
+
+
+class MonthCache:
+    """Thread-safe LRU cache of per-month calendar data.
+
+    Every invalidation bumps a generation number; values computed before the
+    bump are dropped by ``put`` so a slow query can never store stale data.
+    """
+
+    def __init__(self, max_entries=MONTH_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def get(self, key):
+        """Returns the cached value for ``key`` or None, marking it recently used."""
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key, value, generation):
+        """Stores ``value`` unless the cache was invalidated since ``generation``."""
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self):
+        """Drops every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class MonthPrefetcher:
+    """Background worker that warms the month cache for neighbouring months."""
+
+    def __init__(self, session_factory=SessionLocal):
+        self._session_factory = session_factory
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def schedule(self, month, year, filters):
+        """Queues a month for prefetching unless it is cached or already queued."""
+        key = _cache_key(month, year, filters)
+        with self._lock:
+            if key in month_cache or key in self._pending:
+                return
+            self._pending.add(key)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="calendar-prefetch", daemon=True)
+                self._thread.start()
+        self._queue.put((month, year, filters))
+
+    def wait(self):
+        """Blocks until every queued month has been prefetched."""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            month, year, filters = self._queue.get()
+            try:
+                with self._session_factory() as db:
+                    CalendarController(db).get_daily_counts(
+                        month, year, **filters)
+            except Exception:
+                # Prefetching is best effort; the view queries on demand anyway
+                pass
+            finally:
+                with self._lock:
+                    self._pending.discard(_cache_key(month, year, filters))
+                self._queue.task_done()
+
+
+def _cache_key(month, year, filters):
+    return (int(year), int(month), filters.get("priority"),
+            filters.get("victim_id"), filters.get("suspect_id"))
+
+
+month_cache = MonthCache()
+month_prefetcher = MonthPrefetcher()
+
+# Any case or assignment write may change what a month shows
+invalidation.subscribe(month_cache.invalidate,
+                       invalidation.CASES, invalidation.ASSIGNMENTS)
 
 
 class CalendarController:
-    def __init__(self):
-        self.db = SessionLocal()
-
-    def get_all_cases(self, month, year):
-        return self.db.query(Case).outerjoin(Case.victims).outerjoin(Case.suspects).filter(
-            extract('year', Case.startDate) == year,
-            extract('month', Case.startDate) == month
-        ).options(
-            joinedload(Case.victims),
-            joinedload(Case.suspects)
-        ).all()
+    def __init__(self, db=None):
+        # Share the session of the active scope unless one is given
+        self.db = db if db is not None else session_manager.get()
+
+    def get_all_cases(self, month, year, profile=LIST):
+        """Retrieves the cases starting in the given month with their victims and suspects."""
+        start, end = month_bounds(month, year)
+        return self.get_cases_between(start, end, profile)
+
+    def get_cases_between(self, start, end, profile=LIST):
+        """Retrieves cases with start <= startDate < end.
+
+        Victims and suspects are loaded with one extra IN query each rather than
+        a join, so a case is never repeated once per victim/suspect pair.
+        """
+        return self.db.query(Case).filter(
+            Case.startDate >= start,
+            Case.startDate < end
+        ).options(*self._calendar_options(profile)).order_by(Case.startDate, Case.id).all()
+
+    def get_filtered_cases(self, month, year, priority=None, victim_id=None, suspect_id=None,
+                           profile=LIST):
+        """Retrieves the month's cases matching the priority and involving the given victim/suspect."""
+        start, end = month_bounds(month, year)
+        query = self.db.query(Case).options(*self._calendar_options(profile))
+        return self._apply_filters(
+            query, start, end, priority, victim_id, suspect_id
+        ).order_by(Case.startDate, Case.id).all()
+
+    def get_daily_counts(self, month, year, priority=None, victim_id=None, suspect_id=None):
+        """Returns {day: {priority: count}} for the month without loading Case objects.
+
+        Results are served from the shared month cache when possible; the
+        returned dict is shared and must not be modified.
+        """
+        filters = {"priority": priority,
+                   "victim_id": victim_id, "suspect_id": suspect_id}
+        key = _cache_key(month, year, filters)
+        cached = month_cache.get(key)
+        if cached is not None:
+            return cached
+
+        generation = month_cache.generation
+        day_counts = self._query_daily_counts(month, year, **filters)
+        month_cache.put(key, day_counts, generation)
+        return day_counts
+
+    def prefetch_adjacent(self, month, year, priority=None, victim_id=None, suspect_id=None):
+        """Warms the cache for the previous and next month in the background."""
+        filters = {"priority": priority,
+                   "victim_id": victim_id, "suspect_id": suspect_id}
+        for adjacent_month, adjacent_year in adjacent_months(month, year):
+            month_prefetcher.schedule(adjacent_month, adjacent_year, filters)
+
+    def _query_daily_counts(self, month, year, priority, victim_id, suspect_id):
+        """Aggregates the month's cases per day and priority in SQL."""
+        start, end = month_bounds(month, year)
+        query = self.db.query(
+            Case.startDate, Case.priority, func.count(Case.id)
+        )
+        rows = self._apply_filters(
+            query, start, end, priority, victim_id, suspect_id
+        ).group_by(Case.startDate, Case.priority).all()
+
+        day_counts = {}
+        for start_date, priority_value, count in rows:
+            day_counts.setdefault(start_date.day, {})[priority_value] = count
+        return day_counts
+
+    @staticmethod
+    def _calendar_options(profile):
+        """Loads cases by ``profile`` and the names of their people, without Text columns."""
+        return [
+            *loading_options(Case, profile),
+            selectinload(Case.victims).options(*loading_options(Victim, LIST)),
+            selectinload(Case.suspects).options(*loading_options(Suspect, LIST)),
+        ]
+
+    @staticmethod
+    def _apply_filters(query, start, end, priority, victim_id, suspect_id):
+        """Restricts a case query to [start, end) and the optional filters."""
+        return CaseFilter(priority=priority, start_from=start, start_before=end,
+                          suspect_id=suspect_id, victim_id=victim_id).apply(query)
@@ -1,37 +1,64 @@
 # controllers/case_controller.py
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+
+from sqlalchemy import exists, func, select, tuple_
+
+from src.controllers import invalidation
+from src.controllers.assignments import change_links, link_people, unlink_people
+from src.controllers.case_filter import CaseFilter
+from src.controllers.pagination import COUNT_CACHE_SIZE, COUNT_CACHE_TTL, decode_cursor, encode_cursor
+from src.controllers.fulltext import CaseHit, case_matches, query_words
+from src.controllers.search_controller import SEARCH_LIMIT, person_search_rank, person_term_filter
+from src.controllers.statistics import TOP_SUSPECTS, TOP_VICTIMS, StatisticsService
 from src.models.case import Case
-from src.models.database import SessionLocal
+from src.models.case_suspect import CaseSuspect
+from src.models.case_victim import CaseVictim
+from src.models.counters import SUSPECT, VICTIM, recount_case_counts
+from src.models.loading import CARD, DETAIL, LIST, loading_options
+from src.models.session_manager import session_manager
 from src.models.victim import Victim
 from src.models.suspect import Suspect
 
+# Most people offered at once by the assign screens' typeahead
+UNASSIGNED_LIMIT = 20
+
 
 class CaseController:
-    def __init__(self):
-        self.db = SessionLocal()
+    # Total case counts shared by every controller, keyed by filter, least recently used first
+    _count_cache = OrderedDict()
+    _count_lock = threading.Lock()
+
+    def __init__(self, db=None):
+        # Share the session of the active scope unless one is given
+        self.db = db if db is not None else session_manager.get()
 
-    def get_all_cases(self):
-        return self.db.query(Case).all()
+    def get_all_cases(self, profile: str = LIST):
+        """Retrieves every case, loading only the columns of the given profile."""
+        return self.db.query(Case).options(*loading_options(Case, profile)).all()
 
-    def get_case_by_id(self, case_id):
+    def get_case_by_id(self, case_id, profile: str = DETAIL):
         """Retrieves a case by its ID."""
-        return self.db.query(Case).filter(Case.id == case_id).first()
+        return self.db.query(Case).options(*loading_options(Case, profile)).filter(
+            Case.id == case_id).first()
 
-    def get_all_cases_pagination(self, page: int = 1, per_page: int = 10, filter_progress: int = None):
-        """Fetches paginated cases, optionally filtering by progress."""
+    def get_all_cases_pagination(self, page: int = 1, per_page: int = 10, filter_progress: int = None,
+                                 case_filter: CaseFilter = None):
+        """Fetches paginated cases, optionally filtering by progress or a CaseFilter."""
         offset = (page - 1) * per_page
+        case_filter = self._resolve_filter(filter_progress, case_filter)
 
         # Build base query
-        query = self.db.query(Case)
+        query = self._filtered_query(case_filter)
 
-        # Apply filter if filter_progress is provided
-        if filter_progress is not None:
-            query = query.filter(Case.progress == filter_progress)
-
-        # Fetch filtered and paginated cases
-        cases = query.offset(offset).limit(per_page).all()
+        # Fetch filtered and paginated cases in a stable order
+        cases = query.order_by(Case.startDate, Case.id).offset(
+            offset).limit(per_page).all()
 
         # Total number of cases in the database (considering the filter)
-        total_cases = query.count()
+        total_cases = self.count_cases(case_filter=case_filter)
 
         return {
             "cases": cases,
@@ -40,18 +67,163 @@ class CaseController:
             "total_pages": (total_cases + per_page - 1) // per_page,
         }
 
+    def get_all_cases_cursor(self, cursor: str = None, per_page: int = 10,
+                             filter_progress: int = None, backwards: bool = False,
+                             case_filter: CaseFilter = None):
+        """Fetches a page of cases ordered by (startDate, id) using keyset pagination.
+
+        Pass the ``next_cursor`` of a result to get the following page, or its
+        ``prev_cursor`` with ``backwards=True`` to get the preceding page.
+        ``case_filter`` narrows the listing on several criteria at once.
+        """
+        case_filter = self._resolve_filter(filter_progress, case_filter)
+        query = self._filtered_query(case_filter)
+
+        if cursor is not None:
+            start_date, case_id = decode_cursor(cursor)
+            key = tuple_(Case.startDate, Case.id)
+            bound = tuple_(date.fromisoformat(start_date), case_id)
+            query = query.filter(key < bound if backwards else key > bound)
+
+        if backwards:
+            query = query.order_by(Case.startDate.desc(), Case.id.desc())
+        else:
+            query = query.order_by(Case.startDate, Case.id)
+
+        # Fetch one extra row to know whether another page exists
+        cases = query.limit(per_page + 1).all()
+        has_more = len(cases) > per_page
+        cases = cases[:per_page]
+
+        if backwards:
+            if not has_more:
+                # Reached the beginning, so serve a full first page instead
+                return self.get_all_cases_cursor(
+                    None, per_page, case_filter=case_filter)
+            cases.reverse()
+
+        # Walking backwards, the extra row says whether an earlier page exists
+        has_next = cursor is not None if backwards else has_more
+        has_previous = has_more if backwards else cursor is not None
+        total_cases = self.count_cases(case_filter=case_filter)
+
+        return {
+            "cases": cases,
+            "total_cases": total_cases,
+            "total_pages": max((total_cases + per_page - 1) // per_page, 1),
+            "next_cursor": self._cursor_for(cases[-1]) if cases and has_next else None,
+            "prev_cursor": self._cursor_for(cases[0]) if cases and has_previous else None,
+        }
+
+    def search_cases(self, query: str, filters=None, cursor: str = None,
+                     per_page: int = SEARCH_LIMIT):
+        """Full-text searches case descriptions and the notes of linked people, best first.
+
+        ``filters`` is a CaseFilter or a dict of its fields. Returns
+        ``hits`` (CaseHit rows with the case, rank and snippet) and a
+        ``next_cursor`` to pass back for the following page.
+        """
+        words = query_words(query)
+        if not words:
+            return {"hits": [], "next_cursor": None}
+
+        # Keep the best match per case: own description first, then by rank
+        matches = case_matches(self.db.get_bind().dialect.name, words)
+        best = select(
+            matches,
+            func.row_number().over(
+                partition_by=matches.c.id,
+                order_by=(matches.c.tier, matches.c.rank),
+            ).label("pick"),
+        ).subquery("best")
+
+        if not isinstance(filters, CaseFilter):
+            filters = CaseFilter.from_dict(filters or {})
+        search = filters.apply(self.db.query(Case, best.c.tier, best.c.rank, best.c.snippet).join(
+            best, best.c.id == Case.id).filter(best.c.pick == 1)).options(
+                *loading_options(Case, CARD))
+
+        if cursor is not None:
+            tier, rank, case_id = decode_cursor(cursor)
+            search = search.filter(tuple_(best.c.tier, best.c.rank, Case.id)
+                                   > tuple_(tier, rank, case_id))
+
+        # Fetch one extra row to know whether another page exists
+        rows = search.order_by(best.c.tier, best.c.rank, Case.id).limit(
+            per_page + 1).all()
+        hits = [CaseHit(*row) for row in rows[:per_page]]
+        last = hits[-1] if hits else None
+        return {
+            "hits": hits,
+            "next_cursor": encode_cursor(last.tier, last.rank, last.case.id)
+            if len(rows) > per_page else None,
+        }
+
+    def count_cases(self, filter_progress: int = None, case_filter: CaseFilter = None):
+        """Returns the number of cases matching the filter, cached for COUNT_CACHE_TTL seconds."""
+        case_filter = self._resolve_filter(filter_progress, case_filter)
+        key = case_filter.key()
+        with self._count_lock:
+            cached = self._count_cache.pop(key, None)
+            # Expired entries stay dropped; fresh ones move to the recent end
+            if cached is not None and time.monotonic() - cached[0] < COUNT_CACHE_TTL:
+                self._count_cache[key] = cached
+                return cached[1]
+
+        total_cases = self._filtered_query(case_filter).count()
+        with self._count_lock:
+            self._count_cache[key] = (time.monotonic(), total_cases)
+            while len(self._count_cache) > COUNT_CACHE_SIZE:
+                self._count_cache.popitem(last=False)
+        return total_cases
+
+    @classmethod
+    def invalidate_counts(cls):
+        """Drops every cached case count after a write."""
+        with cls._count_lock:
+            cls._count_cache.clear()
+
+    @staticmethod
+    def _resolve_filter(filter_progress, case_filter):
+        """Merges the legacy progress argument into a CaseFilter."""
+        if case_filter is None:
+            return CaseFilter(progress=filter_progress)
+        if filter_progress is not None and case_filter.progress is None:
+            return case_filter.replace(progress=filter_progress)
+        return case_filter
+
+    def _filtered_query(self, case_filter):
+        """Builds the case card query restricted to the filter."""
+        return case_filter.apply(self.db.query(Case).options(*loading_options(Case, CARD)))
+
+    @staticmethod
+    def _cursor_for(case):
+        """Builds the opaque cursor pointing at the given case."""
+        return encode_cursor(case.startDate, case.id)
+
     def add_case(self, progress, startDate, description, detective, priority):
         new_case = Case(progress=progress, startDate=startDate,
                         description=description, detective=detective, priority=priority)
         self.db.add(new_case)
         self.db.commit()
+        invalidation.notify(invalidation.CASES)
         self.db.refresh(new_case)
+        return new_case
 
     def delete_case(self, case_id):
         case = self.db.query(Case).filter(Case.id == case_id).first()
         if case:
+            # People linked to the case lose one from their case_count
+            suspect_ids = self.db.scalars(select(CaseSuspect.c.suspect_id).where(
+                CaseSuspect.c.case_id == case_id)).all()
+            victim_ids = self.db.scalars(select(CaseVictim.c.victim_id).where(
+                CaseVictim.c.case_id == case_id)).all()
             self.db.delete(case)
+            self.db.flush()
+            recount_case_counts(self.db, SUSPECT, suspect_ids)
+            recount_case_counts(self.db, VICTIM, victim_ids)
             self.db.commit()
+            invalidation.notify(invalidation.CASES, invalidation.ASSIGNMENTS)
 
     def update_case(self, case_id, progress, startDate, description, detective, priority):
         case = self.db.query(Case).filter(Case.id == case_id).first()
@@ -62,124 +234,68 @@ class CaseController:
             case.detective = detective
             case.priority = priority
             self.db.commit()
+            invalidation.notify(invalidation.CASES)
             self.db.refresh(case)
 
-    def get_unassigned_suspects(self, case_id):
-        """Retrieve suspects not yet assigned to this case."""
-        case = self.get_case_by_id(case_id)
+    def link(self, kind, case_id, person_ids):
+        """Assigns many suspects or victims (``kind``) to a case in one statement.
 
-        if not case:
-            return []
+        Returns the number of new links.
+        """
+        return change_links(self.db, link_people, kind, [case_id], person_ids)
 
-        # Get IDs of suspects already assigned to this case
-        assigned_suspect_ids = [suspect.id for suspect in case.suspects]
+    def unlink(self, kind, case_id, person_ids):
+        """Removes many suspects or victims (``kind``) from a case in one statement.
 
-        # If no suspects are assigned, return all suspects
-        if not assigned_suspect_ids:
-            return self.db.query(Suspect).all()
+        Returns the number of links removed.
+        """
+        return change_links(self.db, unlink_people, kind, [case_id], person_ids)
 
-        # Return suspects not in the assigned list
-        return self.db.query(Suspect).filter(Suspect.id.notin_(assigned_suspect_ids)).all()
+    def get_unassigned_suspects(self, case_id, term: str = None, limit: int = UNASSIGNED_LIMIT):
+        """Retrieve suspects not yet assigned to this case, optionally matching a name/NIK term."""
+        return self._unassigned_query(Suspect, CaseSuspect.c.suspect_id, case_id, term, limit)
 
     def assign_suspect_to_case(self, case_id, suspect_id):
         """Assign a suspect to a specific case."""
-        case = self.get_case_by_id(case_id)
-        suspect = self.db.query(Suspect).filter(
-            Suspect.id == suspect_id).first()
-
-        if case and suspect:
-            case.suspects.append(suspect)
-            self.db.commit()
+        self.link(SUSPECT, case_id, [suspect_id])
 
     def remove_suspect_from_case(self, case_id, suspect_id):
         """Remove a suspect from a specific case."""
-        case = self.get_case_by_id(case_id)
-        suspect = self.db.query(Suspect).filter(
-            Suspect.id == suspect_id).first()
-
-        if case and suspect:
-            case.suspects.remove(suspect)
-            self.db.commit()
-
-    def get_unassigned_victims(self, case_id):
-        """Retrieve victims not yet assigned to this case."""
-        case = self.get_case_by_id(case_id)
-
-        if not case:
-            return []
-
-        # Get IDs of victims already assigned to this case
-        assigned_victim_ids = [victim.id for victim in case.victims]
-
-        # If no victims are assigned, return all victims
-        if not assigned_victim_ids:
-            return self.db.query(Victim).all()
-
-        # Return victims not in the assigned list
-        return self.db.query(Victim).filter(Victim.id.notin_(assigned_victim_ids)).all()
+        self.unlink(SUSPECT, case_id, [suspect_id])
+
+    def get_unassigned_victims(self, case_id, term: str = None, limit: int = UNASSIGNED_LIMIT):
+        """Retrieve victims not yet assigned to this case, optionally matching a name/NIK term."""
+        return self._unassigned_query(Victim, CaseVictim.c.victim_id, case_id, term, limit)
+
+    def _unassigned_query(self, model, person_column, case_id, term, limit):
+        """People without a link to the case (NOT EXISTS anti-join), best matches first."""
+        link = person_column.table
+        query = self.db.query(model).filter(~exists().where(
+            link.c.case_id == case_id, person_column == model.id))
+        if term:
+            query = query.filter(person_term_filter(model, term))
+        query = query.order_by(
+            person_search_rank(model, term, term), model.name, model.id)
+        return query.limit(limit).all()
 
     def assign_victim_to_case(self, case_id, victim_id):
         """Assign a victim to a specific case."""
-        case = self.get_case_by_id(case_id)
-        victim = self.db.query(Victim).filter(Victim.id == victim_id).first()
-
-        if case and victim:
-            case.victims.append(victim)
-            self.db.commit()
+        self.link(VICTIM, case_id, [victim_id])
 
     def remove_victim_from_case(self, case_id, victim_id):
         """Remove a victim from a specific case."""
-        case = self.get_case_by_id(case_id)
-        victim = self.db.query(Victim).filter(Victim.id == victim_id).first()
-
-        if case and victim:
-            case.victims.remove(victim)
-            self.db.commit()
+        self.unlink(VICTIM, case_id, [victim_id])
 
     def get_top_ten_suspects(self):
         """Retrieve top 10 suspects by number of cases they are involved in."""
-        from sqlalchemy import func
-
-        # Create a subquery to count cases per suspect
-        suspect_case_counts = (
-            self.db.query(Suspect.id, Suspect.name,
-                          func.count(Case.id).label('cases_count'))
-            .join(Case.suspects)
-            .group_by(Suspect.id, Suspect.name)
-            .order_by(func.count(Case.id).desc())
-            .limit(10)
-            .all()
-        )
-
-        # Convert results to a list of objects with name and cases_count attributes
-        return [
-            type('SuspectStats', (), {
-                'id': suspect[0],
-                'name': suspect[1],
-                'cases_count': suspect[2]
-            })() for suspect in suspect_case_counts
-        ]
+        return StatisticsService(self.db).get(TOP_SUSPECTS)[TOP_SUSPECTS]
 
     def get_top_ten_victims(self):
         """Retrieve top 10 victims by number of cases they are involved in."""
-        from sqlalchemy import func
-
-        # Create a subquery to count cases per victim
-        victim_case_counts = (
-            self.db.query(Victim.id, Victim.name, func.count(
-                Case.id).label('cases_count'))
-            .join(Case.victims)
-            .group_by(Victim.id, Victim.name)
-            .order_by(func.count(Case.id).desc())
-            .limit(10)
-            .all()
-        )
-
-        # Convert results to a list of objects with name and cases_count attributes
-        return [
-            type('VictimStats', (), {
-                'id': victim[0],
-                'name': victim[1],
-                'cases_count': victim[2]
-            })() for victim in victim_case_counts
-        ]
+        return StatisticsService(self.db).get(TOP_VICTIMS)[TOP_VICTIMS]
+
+
+# Cached counts go stale whenever a case changes, or a link does for
+# counts filtered by suspect or victim
+invalidation.subscribe(CaseController.invalidate_counts,
+                       invalidation.CASES, invalidation.ASSIGNMENTS)
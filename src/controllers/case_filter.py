@@ -0,0 +1,96 @@
+# controllers/case_filter.py
+from datetime import date
+
+from sqlalchemy import exists
+
+from src.models.case import Case
+from src.models.case_suspect import CaseSuspect
+from src.models.case_victim import CaseVictim
+
+
+class CaseFilter:
+    """Criteria for listing cases; every field left as None matches all cases.
+
+    The dates form a half-open range, ``start_from <= startDate < start_before``.
+    Involvement is checked with EXISTS on the association tables, so the whole
+    filter compiles into the WHERE clause of one query and a case is matched
+    once no matter how many people it has.
+    """
+    FIELDS = ("progress", "priority", "detective", "start_from", "start_before",
+              "suspect_id", "victim_id")
+
+    def __init__(self, progress=None, priority=None, detective=None, start_from=None,
+                 start_before=None, suspect_id=None, victim_id=None):
+        if start_from is not None and start_before is not None and start_before < start_from:
+            raise ValueError("start_before must not be earlier than start_from")
+        self.progress = progress
+        self.priority = priority
+        self.detective = detective
+        self.start_from = start_from
+        self.start_before = start_before
+        self.suspect_id = suspect_id
+        self.victim_id = victim_id
+
+    @classmethod
+    def from_dict(cls, values):
+        """Builds a filter from a dict, rejecting unknown fields."""
+        unknown = set(values) - set(cls.FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown case filter field(s): {', '.join(sorted(unknown))}")
+        values = dict(values)
+        for field in ("start_from", "start_before"):
+            if isinstance(values.get(field), str):
+                values[field] = date.fromisoformat(values[field])
+        return cls(**values)
+
+    def replace(self, **changes):
+        """Returns a copy with the given fields changed."""
+        return CaseFilter(**{**dict(zip(self.FIELDS, self.key())), **changes})
+
+    def clauses(self):
+        """Returns the WHERE clauses for the fields that are set."""
+        clauses = []
+        if self.progress is not None:
+            clauses.append(Case.progress == self.progress)
+        if self.priority is not None:
+            clauses.append(Case.priority == self.priority)
+        if self.detective is not None:
+            clauses.append(Case.detective == self.detective)
+        if self.start_from is not None:
+            clauses.append(Case.startDate >= self.start_from)
+        if self.start_before is not None:
+            clauses.append(Case.startDate < self.start_before)
+        if self.suspect_id is not None:
+            clauses.append(exists().where(
+                CaseSuspect.c.case_id == Case.id,
+                CaseSuspect.c.suspect_id == self.suspect_id
+            ))
+        if self.victim_id is not None:
+            clauses.append(exists().where(
+                CaseVictim.c.case_id == Case.id,
+                CaseVictim.c.victim_id == self.victim_id
+            ))
+        return clauses
+
+    def apply(self, query):
+        """Restricts a Query or select() on cases to this filter."""
+        clauses = self.clauses()
+        return query.filter(*clauses) if clauses else query
+
+    def key(self):
+        """Hashable identity of the filter, for caches keyed by criteria."""
+        return tuple(getattr(self, field) for field in self.FIELDS)
+
+    def is_empty(self):
+        return all(value is None for value in self.key())
+
+    def __eq__(self, other):
+        return isinstance(other, CaseFilter) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        fields = ", ".join(f"{field}={getattr(self, field)!r}"
+                           for field in self.FIELDS if getattr(self, field) is not None)
+        return f"CaseFilter({fields})"
@@ -0,0 +1,96 @@
+# controllers/fulltext.py
+import re
+
+from sqlalchemy import Float, Integer, String, text
+
+# Words of a search query; everything else (quotes, operators) is dropped
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+# Tier 0 rows match the case description, tier 1 rows a linked suspect's note
+# or victim's forensic result; matched words are wrapped in [ ]
+SQLITE_MATCHES = """
+SELECT rowid AS id, 0 AS tier, bm25(cases_fts) AS rank,
+       snippet(cases_fts, -1, '[', ']', '...', 12) AS snippet
+FROM cases_fts WHERE cases_fts MATCH :query
+UNION ALL
+SELECT case_suspects.case_id, 1, bm25(suspects_fts),
+       snippet(suspects_fts, -1, '[', ']', '...', 12)
+FROM suspects_fts JOIN case_suspects ON case_suspects.suspect_id = suspects_fts.rowid
+WHERE suspects_fts MATCH :query
+UNION ALL
+SELECT case_victims.case_id, 1, bm25(victims_fts),
+       snippet(victims_fts, -1, '[', ']', '...', 12)
+FROM victims_fts JOIN case_victims ON case_victims.victim_id = victims_fts.rowid
+WHERE victims_fts MATCH :query
+"""
+
+# The to_tsvector expressions must match the GIN indexes of migration 6
+POSTGRESQL_MATCHES = """
+SELECT cases.id AS id, 0 AS tier,
+       -ts_rank(to_tsvector('simple', cases.description), q) AS rank,
+       ts_headline('simple', cases.description, q,
+                   'StartSel=[, StopSel=], MaxWords=20, MinWords=5') AS snippet
+FROM cases, to_tsquery('simple', :query) AS q
+WHERE to_tsvector('simple', cases.description) @@ q
+UNION ALL
+SELECT case_suspects.case_id, 1, -ts_rank(to_tsvector('simple', suspects.note), q),
+       ts_headline('simple', suspects.note, q, 'StartSel=[, StopSel=], MaxWords=20, MinWords=5')
+FROM suspects JOIN case_suspects ON case_suspects.suspect_id = suspects.id,
+     to_tsquery('simple', :query) AS q
+WHERE to_tsvector('simple', suspects.note) @@ q
+UNION ALL
+SELECT case_victims.case_id, 1, -ts_rank(to_tsvector('simple', victims.forensic_result), q),
+       ts_headline('simple', victims.forensic_result, q, 'StartSel=[, StopSel=], MaxWords=20, MinWords=5')
+FROM victims JOIN case_victims ON case_victims.victim_id = victims.id,
+     to_tsquery('simple', :query) AS q
+WHERE to_tsvector('simple', victims.forensic_result) @@ q
+"""
+
+# Databases without a full-text index fall back to substring matching
+FALLBACK_MATCHES = """
+SELECT cases.id AS id, 0 AS tier, 0.0 AS rank, substr(cases.description, 1, 120) AS snippet
+FROM cases WHERE lower(cases.description) LIKE lower(:query) ESCAPE '\\'
+"""
+
+
+class CaseHit:
+    """A case matched by a full-text search, with its rank and a highlighted snippet."""
+    __slots__ = ("case", "tier", "rank", "snippet")
+
+    def __init__(self, case, tier, rank, snippet):
+        self.case = case
+        self.tier = tier
+        self.rank = rank
+        self.snippet = snippet
+
+
+def query_words(query):
+    """Splits user input into the words to search for."""
+    return _WORD.findall(query or "")
+
+
+def match_expression(dialect_name, words):
+    """Builds the dialect's full-text query: every word must match, as a prefix."""
+    if dialect_name == "sqlite":
+        return " ".join(f'"{word}"*' for word in words)
+    if dialect_name == "postgresql":
+        return " & ".join(f"{word}:*" for word in words)
+    # pylint: disable=import-outside-toplevel
+    from src.controllers.search_controller import escape_like
+    return f"%{escape_like(' '.join(words))}%"
+
+
+def case_matches(dialect_name, words):
+    """Returns a subquery of (id, tier, rank, snippet) rows, lower rank is better.
+
+    A case can appear more than once, e.g. when both its description and a
+    linked suspect's note match; callers keep the best row per case.
+    """
+    sql = {"sqlite": SQLITE_MATCHES, "postgresql": POSTGRESQL_MATCHES}.get(
+        dialect_name, FALLBACK_MATCHES)
+    return (
+        text(sql)
+        .bindparams(query=match_expression(dialect_name, words))
+        .columns(id=Integer, tier=Integer, rank=Float, snippet=String)
+        .subquery("matches")
+    )
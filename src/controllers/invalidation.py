@@ -0,0 +1,31 @@
+# controllers/invalidation.py
+import threading
+
+# Topics published by the controllers after a successful commit
+CASES = "cases"
+ASSIGNMENTS = "assignments"
+SUSPECTS = "suspects"
+VICTIMS = "victims"
+
+_subscribers = {}
+_lock = threading.Lock()
+
+
+def subscribe(callback, *topics):
+    """Registers ``callback`` to be called whenever one of ``topics`` is notified."""
+    with _lock:
+        for topic in topics:
+            _subscribers.setdefault(topic, []).append(callback)
+    return callback
+
+
+def notify(*topics):
+    """Tells every cache subscribed to ``topics`` that its data changed."""
+    with _lock:
+        callbacks = []
+        for topic in topics:
+            for callback in _subscribers.get(topic, []):
+                if callback not in callbacks:
+                    callbacks.append(callback)
+    for callback in callbacks:
+        callback()
@@ -0,0 +1,29 @@
+# controllers/pagination.py
+import base64
+import json
+from datetime import date
+
+# How long a cached total row count stays valid, in seconds
+COUNT_CACHE_TTL = 30
+# Most filter combinations whose total row count is kept at once
+COUNT_CACHE_SIZE = 64
+
+
+def encode_cursor(*values):
+    """Encodes the sort key of a row into an opaque, URL-safe cursor string."""
+    payload = [value.isoformat() if isinstance(value, date) else value
+               for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Decodes a cursor produced by encode_cursor back into its key values."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError) as exc:
+        raise ValueError(f"Invalid pagination cursor: {cursor!r}") from exc
+    if not isinstance(values, list):
+        raise ValueError(f"Invalid pagination cursor: {cursor!r}")
+    return values
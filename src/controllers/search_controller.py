@@ -0,0 +1,82 @@
+# controllers/search_controller.py
+from sqlalchemy import Boolean, case, literal, or_, select, union_all
+
+from src.models.session_manager import session_manager
+from src.models.suspect import Suspect
+from src.models.victim import Victim
+
+# Default number of search results returned per page
+SEARCH_LIMIT = 50
+
+
+def escape_like(term):
+    """Escapes LIKE wildcards so user input is matched literally."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def person_search_filters(model, name=None, nik=None):
+    """Builds the predicates for a name (substring) and NIK (prefix) search, ANDed by the caller."""
+    filters = []
+    if name:
+        filters.append(model.name.ilike(
+            f"%{escape_like(name)}%", escape="\\"))
+    if nik:
+        # NIKs are digits, so a plain LIKE loses nothing and can use the prefix index
+        filters.append(model.nik.like(f"{escape_like(nik)}%", escape="\\"))
+    return filters
+
+
+def person_term_filter(model, term):
+    """Matches a single typeahead term against the name (substring) or the NIK (prefix)."""
+    return or_(*person_search_filters(model, name=term), *person_search_filters(model, nik=term))
+
+
+def person_search_rank(model, name=None, nik=None):
+    """Ranks matches: exact NIK first, then names starting with the term, then the rest."""
+    whens = []
+    if nik:
+        whens.append((model.nik == nik, 0))
+    if name:
+        whens.append(
+            (model.name.ilike(f"{escape_like(name)}%", escape="\\"), 1))
+    return case(*whens, else_=2) if whens else literal(2)
+
+
+class SearchController:
+    def __init__(self, db=None):
+        # Share the session of the active scope unless one is given
+        self.db = db if db is not None else session_manager.get()
+
+    def search_people(self, name=None, nik=None, limit: int = SEARCH_LIMIT, offset: int = 0):
+        """Searches suspects and victims together in a single query.
+
+        Returns rows with ``kind`` ("suspect" or "victim"), id, nik, name, age,
+        picture_path, gender (None for victims) and ``summary``, the note or
+        forensic result truncated in SQL, best matches first.
+        """
+        if not name and not nik:
+            return []
+
+        selects = []
+        for kind, model in (("suspect", Suspect), ("victim", Victim)):
+            selects.append(
+                select(
+                    literal(kind).label("kind"),
+                    model.id.label("id"),
+                    model.nik.label("nik"),
+                    model.name.label("name"),
+                    model.age.label("age"),
+                    model.picture_path.label("picture_path"),
+                    (model.gender if model is Suspect
+                     else literal(None, Boolean)).label("gender"),
+                    (model.note_preview if model is Suspect
+                     else model.forensic_result_preview).label("summary"),
+                    person_search_rank(model, name, nik).label("rank"),
+                ).where(*person_search_filters(model, name, nik))
+            )
+
+        people = union_all(*selects).subquery()
+        statement = select(people).order_by(
+            people.c.rank, people.c.name, people.c.kind, people.c.id
+        ).limit(limit).offset(offset)
+        return self.db.execute(statement).all()
@@ -0,0 +1,202 @@
+# controllers/statistics.py
+import threading
+from functools import partial
+
+from sqlalchemy import case, extract, func, select
+
+from src.controllers import invalidation
+from src.models.case import Case
+from src.models.case_suspect import CaseSuspect
+from src.models.case_victim import CaseVictim
+from src.models.suspect import Suspect
+from src.models.victim import Victim
+
+# Panels the Statistic view can ask for
+BY_PROGRESS = "by_progress"
+BY_PRIORITY = "by_priority"
+PER_MONTH = "per_month"
+WORKLOAD = "workload"
+AVERAGES = "averages"
+TOP_SUSPECTS = "top_suspects"
+TOP_VICTIMS = "top_victims"
+
+# Progress codes as used by the case forms
+OPEN_PROGRESS = 0
+
+# Which writes make which panels stale
+TOPIC_PANELS = {
+    invalidation.CASES: (BY_PROGRESS, BY_PRIORITY, PER_MONTH, WORKLOAD, AVERAGES),
+    invalidation.ASSIGNMENTS: (AVERAGES, TOP_SUSPECTS, TOP_VICTIMS),
+    invalidation.SUSPECTS: (TOP_SUSPECTS,),
+    invalidation.VICTIMS: (TOP_VICTIMS,),
+}
+
+
+class PersonStats:
+    """A person's name and case count, as shown on the statistics charts."""
+    __slots__ = ("id", "name", "cases_count")
+
+    def __init__(self, id, name, cases_count):  # pylint: disable=redefined-builtin
+        self.id = id
+        self.name = name
+        self.cases_count = cases_count
+
+    def __repr__(self):
+        return f"PersonStats(id={self.id!r}, name={self.name!r}, cases_count={self.cases_count!r})"
+
+
+class PanelCache:
+    """Thread-safe cache of computed panels with per-panel invalidation.
+
+    Each panel has its own generation number, so a value computed before the
+    panel was invalidated is never stored.
+    """
+
+    def __init__(self):
+        self._values = {}
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, panel):
+        with self._lock:
+            return self._values.get(panel)
+
+    def generation(self, panel):
+        with self._lock:
+            return self._generations.get(panel, 0)
+
+    def put(self, panel, value, generation):
+        """Stores ``value`` unless the panel was invalidated since ``generation``."""
+        with self._lock:
+            if self._generations.get(panel, 0) == generation:
+                self._values[panel] = value
+
+    def invalidate(self, *panels):
+        """Drops the given panels."""
+        with self._lock:
+            for panel in panels:
+                self._values.pop(panel, None)
+                self._generations[panel] = self._generations.get(panel, 0) + 1
+
+    def __contains__(self, panel):
+        with self._lock:
+            return panel in self._values
+
+
+panel_cache = PanelCache()
+
+for _topic, _panels in TOPIC_PANELS.items():
+    invalidation.subscribe(partial(panel_cache.invalidate, *_panels), _topic)
+
+
+class StatisticsService:
+    """Computes the statistics panels with grouped queries and caches them until a write."""
+
+    def __init__(self, db):
+        self.db = db
+        # Panels computed by the same query are loaded together
+        self._loaders = {
+            BY_PROGRESS: self._case_breakdown,
+            BY_PRIORITY: self._case_breakdown,
+            PER_MONTH: self._cases_per_month,
+            WORKLOAD: self._detective_workload,
+            AVERAGES: self._people_per_case,
+            TOP_SUSPECTS: partial(self._top_by_case_count, Suspect, TOP_SUSPECTS),
+            TOP_VICTIMS: partial(self._top_by_case_count, Victim, TOP_VICTIMS),
+        }
+
+    def get(self, *panels):
+        """Returns ``{panel: value}`` for the requested panels, querying only cache misses."""
+        unknown = set(panels) - set(self._loaders)
+        if unknown:
+            raise ValueError(f"Unknown statistics panel(s): {', '.join(sorted(unknown))}")
+
+        result = {}
+        loaders = []
+        for panel in panels:
+            cached = panel_cache.get(panel)
+            if cached is not None:
+                result[panel] = cached
+            elif self._loaders[panel] not in loaders:
+                loaders.append(self._loaders[panel])
+
+        for loader in loaders:
+            generations = {}
+            values = loader(generations)
+            for panel, value in values.items():
+                panel_cache.put(panel, value, generations[panel])
+                if panel in panels:
+                    result[panel] = value
+        return result
+
+    @staticmethod
+    def _begin(generations, *panels):
+        """Records the panels' generations before their query runs."""
+        for panel in panels:
+            generations[panel] = panel_cache.generation(panel)
+
+    def _case_breakdown(self, generations):
+        """Case counts by progress and by priority from one grouped query."""
+        self._begin(generations, BY_PROGRESS, BY_PRIORITY)
+        rows = self.db.execute(
+            select(Case.progress, Case.priority, func.count())
+            .group_by(Case.progress, Case.priority)
+        ).all()
+        by_progress, by_priority = {}, {}
+        for progress, priority, count in rows:
+            by_progress[progress] = by_progress.get(progress, 0) + count
+            by_priority[priority] = by_priority.get(priority, 0) + count
+        return {BY_PROGRESS: by_progress, BY_PRIORITY: by_priority}
+
+    def _cases_per_month(self, generations):
+        """Cases opened per (year, month), oldest first."""
+        self._begin(generations, PER_MONTH)
+        year = extract("year", Case.startDate)
+        month = extract("month", Case.startDate)
+        rows = self.db.execute(
+            select(year, month, func.count())
+            .group_by(year, month)
+            .order_by(year, month)
+        ).all()
+        return {PER_MONTH: [((int(y), int(m)), count) for y, m, count in rows]}
+
+    def _detective_workload(self, generations):
+        """Total and still open cases per detective, busiest first."""
+        self._begin(generations, WORKLOAD)
+        total = func.count()
+        # COUNT skips the NULLs the CASE yields for cases that are not open
+        open_cases = func.count(case((Case.progress == OPEN_PROGRESS, 1)))
+        rows = self.db.execute(
+            select(Case.detective, total, open_cases)
+            .group_by(Case.detective)
+            .order_by(total.desc(), Case.detective)
+        ).all()
+        return {WORKLOAD: [
+            {"detective": detective, "cases": count, "open": open_count}
+            for detective, count, open_count in rows
+        ]}
+
+    def _people_per_case(self, generations):
+        """Average suspects and victims per case, from three counts in one statement."""
+        self._begin(generations, AVERAGES)
+        cases, suspects, victims = self.db.execute(select(
+            select(func.count()).select_from(Case).scalar_subquery(),
+            select(func.count()).select_from(CaseSuspect).scalar_subquery(),
+            select(func.count()).select_from(CaseVictim).scalar_subquery(),
+        )).one()
+        return {AVERAGES: {
+            "cases": cases,
+            "suspects_per_case": suspects / cases if cases else 0.0,
+            "victims_per_case": victims / cases if cases else 0.0,
+        }}
+
+    def _top_by_case_count(self, model, panel, generations, limit=10):
+        """Reads the top people off the maintained case_count index."""
+        self._begin(generations, panel)
+        rows = self.db.execute(
+            select(model.id, model.name, model.case_count)
+            .where(model.case_count > 0)
+            .order_by(model.case_count.desc(), model.id.desc())
+            .limit(limit)
+        ).all()
+        return {panel: [PersonStats(*row) for row in rows]}
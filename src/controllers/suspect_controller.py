@@ -1,15 +1,77 @@
+import time
+
+from sqlalchemy import func
+
 from src.models.suspect import Suspect
-from src.models.database import SessionLocal
+from src.models.session_manager import session_manager
+from src.controllers import invalidation
+from src.controllers.assignments import change_links, link_people, unlink_people
+from src.media import picture_store
+from src.controllers.search_controller import SEARCH_LIMIT, person_search_filters, person_search_rank
+from src.controllers.pagination import COUNT_CACHE_TTL
 from src.models.case import Case
+from src.models.counters import SUSPECT
+from src.models.loading import LIST, loading_options
 
 
 class SuspectController:
-    def __init__(self):
-        self.db = SessionLocal()
+    # Cached (timestamp, total) of the suspect table, shared by every controller
+    _count_cache = (None, None)
+
+    def __init__(self, db=None):
+        # Share the session of the active scope unless one is given
+        self.db = db if db is not None else session_manager.get()
+
+    def get_all_suspects(self, profile: str = LIST):
+        """Get all suspects, loading only the columns of the given profile."""
+        return self.db.query(Suspect).options(*loading_options(Suspect, profile)).all()
+
+    def get_suspects_page(self, page: int = 1, per_page: int = 12, after_id: int = None):
+        """Fetches one page of suspect card data ordered by ID.
+
+        Only the columns a card shows are selected, and the note is truncated
+        in SQL. Pass the last ID of the previous page as ``after_id`` to seek
+        to the page instead of skipping rows with OFFSET.
+        """
+        query = self.db.query(
+            Suspect.id,
+            Suspect.nik,
+            Suspect.name,
+            Suspect.age,
+            Suspect.gender,
+            Suspect.picture_path,
+            Suspect.note_preview.label("note"),
+        ).order_by(Suspect.id)
+
+        if after_id is not None:
+            query = query.filter(Suspect.id > after_id)
+        else:
+            query = query.offset((page - 1) * per_page)
 
-    def get_all_suspects(self):
-        """Get all suspects."""
-        return self.db.query(Suspect).all()
+        suspects = query.limit(per_page).all()
+        total_suspects = self.count_suspects()
+
+        return {
+            "suspects": suspects,
+            "total_suspects": total_suspects,
+            "current_page": page,
+            "total_pages": (total_suspects + per_page - 1) // per_page,
+        }
+
+    def count_suspects(self):
+        """Returns the number of suspects, cached for COUNT_CACHE_TTL seconds."""
+        cached_at, cached_total = SuspectController._count_cache
+        if cached_at is not None and time.monotonic() - cached_at < COUNT_CACHE_TTL:
+            return cached_total
+
+        total_suspects = self.db.query(func.count(Suspect.id)).scalar()
+        SuspectController._count_cache = (time.monotonic(), total_suspects)
+        return total_suspects
+
+    @classmethod
+    def invalidate_counts(cls):
+        """Drops the cached suspect count after a write."""
+        cls._count_cache = (None, None)
 
     def get_suspect_by_id(self, suspect_id):
         """Retrieve a suspect by their ID."""
@@ -34,6 +96,7 @@ class SuspectController:
         )
         self.db.add(new_suspect)
         self.db.commit()
+        invalidation.notify(invalidation.SUSPECTS)
         self.db.refresh(new_suspect)
         return new_suspect
 
@@ -42,6 +105,7 @@ class SuspectController:
         suspect = self.db.query(Suspect).filter(
             Suspect.id == suspect_id).first()
         if suspect:
+            old_picture = suspect.picture_path
             if nik:
                 suspect.nik = nik
             if picture_path:
@@ -55,6 +119,9 @@ class SuspectController:
             if note:
                 suspect.note = note
             self.db.commit()
+            invalidation.notify(invalidation.SUSPECTS)
+            if old_picture != suspect.picture_path:
+                picture_store.release(self.db, old_picture)
             self.db.refresh(suspect)
             return suspect
         return None
@@ -64,41 +131,39 @@ class SuspectController:
         suspect = self.db.query(Suspect).filter(
             Suspect.id == suspect_id).first()
         if suspect:
+            picture_path = suspect.picture_path
             self.db.delete(suspect)
             self.db.commit()
+            # Deleting a suspect also drops their case assignments
+            invalidation.notify(invalidation.SUSPECTS, invalidation.ASSIGNMENTS)
+            picture_store.release(self.db, picture_path)
+
+    def link_to_cases(self, suspect_id, case_ids):
+        """Assigns a suspect to many cases in one statement; returns the number of new links."""
+        return change_links(self.db, link_people, SUSPECT, case_ids, [suspect_id])
+
+    def unlink_from_cases(self, suspect_id, case_ids):
+        """Removes a suspect from many cases in one statement; returns the number removed."""
+        return change_links(self.db, unlink_people, SUSPECT, case_ids, [suspect_id])
 
     def add_suspect_to_case(self, suspect_id, case_id):
-        """Add a suspect to a case."""
-        case = self.db.query(Case).filter(Case.id == case_id).first()
-        suspect = self.db.query(Suspect).filter(
-            Suspect.id == suspect_id).first()
-        if case and suspect:
-            case.suspects.append(suspect)
-            self.db.commit()
-            self.db.refresh(case)
-            return case
-        return None
+        """Add a suspect to a case; returns True if a new link was made."""
+        return self.link_to_cases(suspect_id, [case_id]) > 0
 
     def remove_suspect_from_case(self, suspect_id, case_id):
-        """Remove a suspect from a case."""
-        case = self.db.query(Case).filter(Case.id == case_id).first()
-        suspect = self.db.query(Suspect).filter(
-            Suspect.id == suspect_id).first()
-        if case and suspect:
-            case.suspects.remove(suspect)
-            self.db.commit()
-            self.db.refresh(case)
-            return case
-        return None
+        """Remove a suspect from a case; returns True if a link was removed."""
+        return self.unlink_from_cases(suspect_id, [case_id]) > 0
+
+    def search_suspects(self, name=None, nik=None, limit: int = SEARCH_LIMIT, offset: int = 0):
+        """Searches suspects matching every given criterion in one query, best matches first."""
+        if not name and not nik:
+            return []
+        return self.db.query(Suspect).filter(
+            *person_search_filters(Suspect, name, nik)
+        ).order_by(
+            person_search_rank(Suspect, name, nik), Suspect.name, Suspect.id
+        ).limit(limit).offset(offset).all()
+
 
-    def search_suspects(self, name=None, nik=None):
-        if name and nik:
-            by_name = set(self.db.query(Suspect).filter(
-                Suspect.name.ilike(f"%{name}%")).all())
-            by_nik = set(self.db.query(Suspect).filter(
-                Suspect.nik.ilike(f"{nik}%")).all())
-            return list(by_name & by_nik)
-        if name:
-            return self.db.query(Suspect).filter(Suspect.name.ilike(f"%{name}%")).all()
-        if nik:
-            return self.db.query(Suspect).filter(Suspect.nik.ilike(f"{nik}%")).all()
+# Cached counts go stale whenever a suspect is added or removed
+invalidation.subscribe(SuspectController.invalidate_counts, invalidation.SUSPECTS)
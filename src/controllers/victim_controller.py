@@ -1,16 +1,66 @@
 # controllers/victim_controller.py
 from src.models.victim import Victim
-from src.models.database import SessionLocal
+from src.models.session_manager import session_manager
+from src.controllers import invalidation
+from src.controllers.assignments import change_links, link_people, unlink_people
+from src.media import picture_store
+from src.controllers.search_controller import SEARCH_LIMIT, person_search_filters, person_search_rank
 from src.models.case import Case
+from src.models.counters import VICTIM
+from src.models.loading import LIST, loading_options
+
+# Number of victims fetched per scroll batch
+VICTIM_BATCH_SIZE = 24
 
 
 class VictimController:
-    def __init__(self):
-        self.db = SessionLocal()  # Initialize the database session here
+    def __init__(self, db=None):
+        # Share the session of the active scope unless one is given
+        self.db = db if db is not None else session_manager.get()
+
+    def get_all_victims(self, profile: str = LIST):
+        """Get all victims, loading only the columns of the given profile."""
+        return self.db.query(Victim).options(*loading_options(Victim, profile)).all()
+
+    def iter_victim_batches(self, after_id: int = None, batch_size: int = VICTIM_BATCH_SIZE):
+        """Streams victim card rows ordered by ID, one list of ``batch_size`` rows at a time.
 
-    def get_all_victims(self):
-        """Get all victims."""
-        return self.db.query(Victim).all()
+        The query runs once and rows are pulled from the cursor with
+        ``yield_per``, so only one batch is held in memory. Close the
+        generator before committing on or closing the session, as that
+        invalidates a server-side cursor.
+        """
+        query = self._card_query()
+        if after_id is not None:
+            query = query.filter(Victim.id > after_id)
+
+        result = self.db.execute(
+            query.order_by(Victim.id).statement.execution_options(
+                yield_per=batch_size)
+        )
+        try:
+            yield from result.partitions()
+        finally:
+            result.close()
+
+    def get_victims_before(self, before_id: int, limit: int = VICTIM_BATCH_SIZE):
+        """Fetches the ``limit`` victim card rows just before ``before_id``, in ID order."""
+        victims = self._card_query().filter(
+            Victim.id < before_id
+        ).order_by(Victim.id.desc()).limit(limit).all()
+        victims.reverse()
+        return victims
+
+    def _card_query(self):
+        """Selects only the columns shown on a victim card."""
+        return self.db.query(
+            Victim.id,
+            Victim.nik,
+            Victim.name,
+            Victim.age,
+            Victim.picture_path,
+            Victim.forensic_result_preview.label("forensic_result"),
+        )
 
     def get_victim_by_id(self, suspect_id):
         """Retrieve a victim by their ID."""
@@ -34,6 +84,7 @@ class VictimController:
         )
         self.db.add(new_victim)
         self.db.commit()
+        invalidation.notify(invalidation.VICTIMS)
         self.db.refresh(new_victim)
         return new_victim
 
@@ -41,6 +92,7 @@ class VictimController:
         """Update details of an existing victim."""
         victim = self.db.query(Victim).filter(Victim.id == victim_id).first()
         if victim:
+            old_picture = victim.picture_path
             if nik:
                 victim.nik = nik
             if picture_path:
@@ -52,6 +104,9 @@ class VictimController:
             if forensic_result:
                 victim.forensic_result = forensic_result
             self.db.commit()
+            invalidation.notify(invalidation.VICTIMS)
+            if old_picture != victim.picture_path:
+                picture_store.release(self.db, old_picture)
             self.db.refresh(victim)
             return victim
         return None
@@ -60,39 +115,35 @@ class VictimController:
         """Delete a victim by ID."""
         victim = self.db.query(Victim).filter(Victim.id == victim_id).first()
         if victim:
+            picture_path = victim.picture_path
             self.db.delete(victim)
             self.db.commit()
+            # Deleting a victim also drops their case assignments
+            invalidation.notify(invalidation.VICTIMS, invalidation.ASSIGNMENTS)
+            picture_store.release(self.db, picture_path)
+
+    def link_to_cases(self, victim_id, case_ids):
+        """Assigns a victim to many cases in one statement; returns the number of new links."""
+        return change_links(self.db, link_people, VICTIM, case_ids, [victim_id])
+
+    def unlink_from_cases(self, victim_id, case_ids):
+        """Removes a victim from many cases in one statement; returns the number removed."""
+        return change_links(self.db, unlink_people, VICTIM, case_ids, [victim_id])
 
     def add_victim_to_case(self, victim_id, case_id):
-        """Add a victim to a case."""
-        case = self.db.query(Case).filter(Case.id == case_id).first()
-        victim = self.db.query(Victim).filter(Victim.id == victim_id).first()
-        if case and victim:
-            case.victims.append(victim)
-            self.db.commit()
-            self.db.refresh(case)
-            return case
-        return None
+        """Add a victim to a case; returns True if a new link was made."""
+        return self.link_to_cases(victim_id, [case_id]) > 0
 
     def remove_victim_from_case(self, victim_id, case_id):
-        """Remove a victim from a case."""
-        case = self.db.query(Case).filter(Case.id == case_id).first()
-        victim = self.db.query(Victim).filter(Victim.id == victim_id).first()
-        if case and victim:
-            case.victims.remove(victim)
-            self.db.commit()
-            self.db.refresh(case)
-            return case
-        return None
+        """Remove a victim from a case; returns True if a link was removed."""
+        return self.unlink_from_cases(victim_id, [case_id]) > 0
 
-    def search_victims(self, name=None, nik=None):
-        if name and nik:
-            by_name = set(self.db.query(Victim).filter(
-                Victim.name.ilike(f"%{name}%")).all())
-            by_nik = set(self.db.query(Victim).filter(
-                Victim.nik.ilike(f"{nik}%")).all())
-            return list(by_name & by_nik)
-        if name:
-            return self.db.query(Victim).filter(Victim.name.ilike(f"%{name}%")).all()
-        if nik:
-            return self.db.query(Victim).filter(Victim.nik.ilike(f"{nik}%")).all()
+    def search_victims(self, name=None, nik=None, limit: int = SEARCH_LIMIT, offset: int = 0):
+        """Searches victims matching every given criterion in one query, best matches first."""
+        if not name and not nik:
+            return []
+        return self.db.query(Victim).filter(
+            *person_search_filters(Victim, name, nik)
+        ).order_by(
+            person_search_rank(Victim, name, nik), Victim.name, Victim.id
+        ).limit(limit).offset(offset).all()
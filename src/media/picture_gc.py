@@ -0,0 +1,239 @@
+# media/picture_gc.py
+import argparse
+import json
+import os
+import re
+import shutil
+import time
+from datetime import datetime
+
+from sqlalchemy import select, union
+
+from src.media import picture_store, thumbnails
+from src.media.thumbnails import PICTURE_DIR
+from src.models.database import engine
+from src.models.suspect import Suspect
+from src.models.victim import Victim
+
+# Unreferenced files younger than this are kept; uploads of forms still open
+# have no row yet. Never shorter than the picture store's own grace period.
+GRACE_SECONDS = max(24 * 60 * 60, picture_store.PENDING_GRACE_SECONDS)
+
+# Quarantined files go to a dated folder here instead of being deleted
+QUARANTINE_DIR = ".quarantine"
+
+# Rows fetched per round trip while streaming the live paths
+FETCH_SIZE = 1000
+
+# Digests of live pictures not named by content, kept between runs
+DIGEST_INDEX = ".digests.json"
+
+_THUMBNAIL_NAME = re.compile(r"^([0-9a-f]{64})_\d+\.[a-z]+$")
+
+
+class GCReport:
+    """What a collection run found and did."""
+
+    def __init__(self, dry_run, mode):
+        self.dry_run = dry_run
+        self.mode = mode
+        self.scanned = 0
+        self.live = 0
+        self.recent = 0
+        self.orphans = []  # (path, size)
+        self.bytes_reclaimed = 0
+        self.errors = {}
+        self.started = time.monotonic()
+        self.seconds = 0.0
+
+    def add_orphan(self, path, size):
+        self.orphans.append((path, size))
+        self.bytes_reclaimed += size
+
+    def summary(self):
+        return {
+            "dry_run": self.dry_run,
+            "mode": self.mode,
+            "scanned": self.scanned,
+            "live": self.live,
+            "too_recent": self.recent,
+            "orphans": len(self.orphans),
+            "bytes_reclaimed": self.bytes_reclaimed,
+            "errors": len(self.errors),
+            "seconds": round(self.seconds, 3),
+        }
+
+
+def _key(path):
+    """Comparable form of a path, however it was written into the database."""
+    return os.path.normcase(os.path.abspath(path))
+
+
+def live_paths(bind=engine):
+    """Every picture_path in use by a suspect or victim, streamed in one query."""
+    query = union(select(Suspect.picture_path), select(Victim.picture_path))
+    with bind.connect() as connection:
+        result = connection.execution_options(
+            stream_results=True, yield_per=FETCH_SIZE).execute(query)
+        return {_key(path) for (path,) in result if path}
+
+
+def _load_digest_index(directory):
+    """{path: [mtime_ns, size, digest]} saved by the previous run, or {} when unreadable."""
+    try:
+        with open(os.path.join(directory, DIGEST_INDEX), encoding="utf-8") as index:
+            entries = json.load(index)
+    except (OSError, ValueError):
+        return {}
+    return entries if isinstance(entries, dict) else {}
+
+
+def _save_digest_index(directory, entries):
+    """Writes the digest index under a temporary name and renames it into place."""
+    path = os.path.join(directory, DIGEST_INDEX)
+    temporary = f"{path}.tmp"
+    try:
+        with open(temporary, "w", encoding="utf-8") as index:
+            json.dump(entries, index)
+        os.replace(temporary, path)
+    except OSError:
+        pass
+
+
+def _live_digests(live, directory, dry_run=False):
+    """Content digests of the live pictures, for matching their thumbnails.
+
+    Pictures in the store carry their digest in their name. Others are
+    hashed once and remembered in DIGEST_INDEX until their size or mtime
+    changes; a dry run reads that index but does not write it.
+    """
+    store = _key(directory)
+    previous = _load_digest_index(directory)
+    index = {}
+    digests = set()
+    for path in live:
+        if picture_store.is_stored(path, store):
+            digests.add(thumbnails.named_digest(path))
+            continue
+        try:
+            stat = os.stat(path)
+            entry = [stat.st_mtime_ns, stat.st_size, None]
+            cached = previous.get(path)
+            if isinstance(cached, list) and len(cached) == 3 and cached[:2] == entry[:2]:
+                digest = cached[2]
+            else:
+                digest = thumbnails.file_digest(path)
+        except OSError:
+            continue
+        entry[2] = digest
+        index[path] = entry
+        digests.add(digest)
+    if not dry_run and index != previous:
+        _save_digest_index(directory, index)
+    return digests
+
+
+def _candidates(directory):
+    """Top-level files of the picture directory, skipping hidden entries."""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.name.startswith(".") and entry.is_file(follow_symlinks=False):
+                yield entry
+
+
+def _thumbnail_candidates(directory):
+    thumbnail_dir = os.path.join(directory, ".thumbs")
+    if not os.path.isdir(thumbnail_dir):
+        return
+    with os.scandir(thumbnail_dir) as shards:
+        for shard in shards:
+            if not shard.is_dir(follow_symlinks=False):
+                continue
+            with os.scandir(shard.path) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False) and _THUMBNAIL_NAME.match(entry.name):
+                        yield entry
+
+
+def _dispose(entry, directory, mode, report):
+    """Deletes or quarantines one file, recording failures instead of stopping."""
+    try:
+        if mode == "delete":
+            os.remove(entry.path)
+        else:
+            target_dir = os.path.join(directory, QUARANTINE_DIR,
+                                      datetime.now().strftime("%Y%m%d"))
+            os.makedirs(target_dir, exist_ok=True)
+            shutil.move(entry.path, os.path.join(target_dir, entry.name))
+    except OSError as exc:
+        report.errors[entry.path] = str(exc)
+        return False
+    return True
+
+
+def collect(bind=engine, directory=PICTURE_DIR, grace_seconds=GRACE_SECONDS,
+            mode="quarantine", dry_run=False, include_thumbnails=True):
+    """Removes pictures no suspect or victim refers to; returns a GCReport.
+
+    ``mode`` is "quarantine" (move into ``<directory>/.quarantine/<date>/``)
+    or "delete". With ``dry_run`` nothing is touched and the report lists
+    what would go. Thumbnails whose source picture is gone are collected too.
+    """
+    if mode not in ("quarantine", "delete"):
+        raise ValueError(f"Unknown GC mode: {mode}")
+    report = GCReport(dry_run, mode)
+    live = live_paths(bind)
+    cutoff = time.time() - grace_seconds
+
+    def sweep(entries, is_live):
+        for entry in entries:
+            report.scanned += 1
+            if is_live(entry):
+                report.live += 1
+                continue
+            stat = entry.stat(follow_symlinks=False)
+            if stat.st_mtime > cutoff:
+                report.recent += 1
+                continue
+            if dry_run or _dispose(entry, directory, mode, report):
+                report.add_orphan(entry.path, stat.st_size)
+
+    sweep(_candidates(directory), lambda entry: _key(entry.path) in live)
+    if include_thumbnails:
+        digests = _live_digests(live, directory, dry_run)
+        sweep(_thumbnail_candidates(directory),
+              lambda entry: _THUMBNAIL_NAME.match(entry.name).group(1) in digests)
+
+    report.seconds = time.monotonic() - report.started
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Quarantine or delete pictures no suspect or victim refers to.")
+    parser.add_argument("--dir", default=PICTURE_DIR,
+                        help=f"picture directory (default {PICTURE_DIR})")
+    parser.add_argument("--grace-hours", type=float, default=GRACE_SECONDS / 3600,
+                        help="keep unreferenced files younger than this (default %(default)s)")
+    parser.add_argument("--delete", action="store_true",
+                        help=f"delete instead of moving into {QUARANTINE_DIR}/")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="only report what would be collected")
+    args = parser.parse_args()
+
+    report = collect(directory=args.dir, grace_seconds=args.grace_hours * 3600,
+                     mode="delete" if args.delete else "quarantine", dry_run=args.dry_run)
+    verb = "would reclaim" if report.dry_run else "reclaimed"
+    for path, size in report.orphans:
+        print(f"    {path} ({size} bytes)")
+    for path, error in report.errors.items():
+        print(f"    failed {path}: {error}")
+    summary = report.summary()
+    print(f"scanned {summary['scanned']}, live {summary['live']}, "
+          f"too recent {summary['too_recent']}, {verb} {summary['orphans']} file(s) "
+          f"/ {summary['bytes_reclaimed']} bytes in {summary['seconds']}s")
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
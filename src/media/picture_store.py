@@ -0,0 +1,138 @@
+# media/picture_store.py
+import hashlib
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import func, select
+
+from src.media import thumbnails
+from src.media.thumbnails import PICTURE_DIR
+from src.models.suspect import Suspect
+from src.models.victim import Victim
+
+CHUNK_SIZE = 1024 * 1024
+
+# A stored file that was written or reused this recently may belong to a form
+# that has not been saved yet, so releasing it leaves it to the GC instead
+PENDING_GRACE_SECONDS = 60 * 60
+
+# Uploads run here so the UI thread never waits on the disk
+_uploads = ThreadPoolExecutor(max_workers=2, thread_name_prefix="picture-upload")
+
+
+class StoredPicture:
+    """Result of storing a picture: where it lives and whether the content was already there."""
+    __slots__ = ("path", "digest", "size", "reused")
+
+    def __init__(self, path, digest, size, reused):
+        self.path = path
+        self.digest = digest
+        self.size = size
+        self.reused = reused
+
+    def __repr__(self):
+        return f"StoredPicture(path={self.path!r}, size={self.size!r}, reused={self.reused!r})"
+
+
+def stored_path(digest, extension, directory=PICTURE_DIR):
+    """Where content with ``digest`` is stored; the extension keeps the type visible."""
+    return os.path.join(directory, f"{digest}{extension.lower()}")
+
+
+def is_stored(path, directory=PICTURE_DIR):
+    """Whether ``path`` is a digest-named file directly in the store directory."""
+    return (os.path.normpath(os.path.dirname(path)) == os.path.normpath(directory)
+            and thumbnails.named_digest(path) is not None)
+
+
+def store(source, directory=PICTURE_DIR, progress=None, chunk_size=CHUNK_SIZE):
+    """Copies ``source`` into the store in chunks, hashing it on the way.
+
+    The copy goes to a temporary file first. If the store already holds the
+    same content, the copy is dropped and the existing file is reused.
+    ``progress(copied, total)`` is called after every chunk.
+    """
+    os.makedirs(directory, exist_ok=True)
+    total = os.path.getsize(source)
+    temporary = os.path.join(directory, f".upload-{uuid.uuid4().hex}.tmp")
+    digest = hashlib.sha256()
+    copied = 0
+    try:
+        with open(source, "rb") as reader, open(temporary, "wb") as writer:
+            for chunk in iter(lambda: reader.read(chunk_size), b""):
+                digest.update(chunk)
+                writer.write(chunk)
+                copied += len(chunk)
+                if progress:
+                    progress(copied, total)
+
+        digest = digest.hexdigest()
+        path = stored_path(digest, os.path.splitext(source)[1] or ".bin", directory)
+        reused = os.path.exists(path)
+        if reused:
+            os.remove(temporary)
+            # Mark the file as in use again so release() leaves it alone for now
+            os.utime(path)
+        else:
+            os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+    thumbnails.remember_digest(path, digest)
+    return StoredPicture(path, digest, copied, reused)
+
+
+def upload(source, directory=PICTURE_DIR, progress=None):
+    """Stores ``source`` on a worker thread and generates its thumbnails.
+
+    Returns a Future resolving to a StoredPicture; ``progress`` is called from
+    the worker thread.
+    """
+    def run():
+        picture = store(source, directory, progress)
+        try:
+            thumbnails.generate(picture.path,
+                                thumbnail_dir=os.path.join(directory, ".thumbs"))
+        except Exception:  # pylint: disable=broad-except
+            # Not a decodable image (or too large to decode); the picture is
+            # stored all the same and views show the original
+            pass
+        return picture
+
+    return _uploads.submit(run)
+
+
+def reference_count(db, path):
+    """How many suspects and victims use the picture at ``path``, in one query."""
+    return db.execute(select(
+        select(func.count()).select_from(Suspect).where(
+            Suspect.picture_path == path).scalar_subquery()
+        + select(func.count()).select_from(Victim).where(
+            Victim.picture_path == path).scalar_subquery()
+    )).scalar()
+
+
+def release(db, path, directory=PICTURE_DIR):
+    """Deletes a stored picture and its thumbnails once no suspect or victim refers to it.
+
+    Call after the change that dropped the reference was committed. Files
+    outside the store and files touched within PENDING_GRACE_SECONDS are
+    kept. Returns True if the file was removed.
+    """
+    if not path or not is_stored(path, directory):
+        return False
+    if reference_count(db, path):
+        return False
+    try:
+        if time.time() - os.path.getmtime(path) < PENDING_GRACE_SECONDS:
+            return False
+        os.remove(path)
+    except FileNotFoundError:
+        return False
+    thumbnails.remove_thumbnails(thumbnails.named_digest(path),
+                                 os.path.join(directory, ".thumbs"))
+    return True
@@ -0,0 +1,242 @@
+# media/thumbnails.py
+import argparse
+import hashlib
+import os
+import re
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from PIL import Image, ImageOps, features
+
+# Directory uploaded pictures are copied into
+PICTURE_DIR = "img"
+# Derivatives live under the picture directory, named by source content digest
+THUMBNAIL_DIR = os.path.join(PICTURE_DIR, ".thumbs")
+
+# Card thumbnails are cropped squares; detail thumbnails keep the aspect ratio
+SMALL = 96
+LARGE = 320
+SIZES = (SMALL, LARGE)
+
+# WebP is much smaller than JPEG for photos; fall back where Pillow lacks it
+FORMAT, EXTENSION = ("WEBP", "webp") if features.check("webp") else ("JPEG", "jpg")
+QUALITY = 80
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp", ".tif", ".tiff"}
+
+_CHUNK_SIZE = 1024 * 1024
+
+# Pictures in the store are named <sha256>.<extension>
+_CONTENT_NAME = re.compile(r"^([0-9a-f]{64})\.[a-z0-9]+$")
+
+# (path, mtime_ns, size) -> digest, so rendering a card does not re-read the file
+_digests = {}
+_digests_lock = threading.Lock()
+
+# Pictures not named by content are hashed here, never while a view renders
+_hashing = ThreadPoolExecutor(max_workers=1, thread_name_prefix="picture-digest")
+_hashing_pending = set()
+
+
+def file_digest(path):
+    """SHA-256 of the file's content, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        for chunk in iter(lambda: source.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cached_digest(path):
+    """file_digest, remembered until the file's size or mtime changes."""
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    with _digests_lock:
+        digest = _digests.get(key)
+    if digest is None:
+        digest = file_digest(path)
+        with _digests_lock:
+            _digests[key] = digest
+    return digest
+
+
+def named_digest(path):
+    """The digest a content-addressed file name carries, or None for other names."""
+    match = _CONTENT_NAME.match(os.path.basename(path))
+    return match.group(1) if match else None
+
+
+def known_digest(path):
+    """The picture's digest if it is known without reading the file, else None."""
+    digest = named_digest(path)
+    if digest is not None:
+        return digest
+    stat = os.stat(path)
+    with _digests_lock:
+        return _digests.get((path, stat.st_mtime_ns, stat.st_size))
+
+
+def _hash_later(path):
+    """Queues ``path`` for hashing on the background thread, once."""
+    def run():
+        try:
+            cached_digest(path)
+        except OSError:
+            pass
+        finally:
+            with _digests_lock:
+                _hashing_pending.discard(path)
+
+    with _digests_lock:
+        if path in _hashing_pending:
+            return
+        _hashing_pending.add(path)
+    _hashing.submit(run)
+
+
+def remember_digest(path, digest):
+    """Records a digest computed elsewhere, e.g. while the file was being copied."""
+    stat = os.stat(path)
+    with _digests_lock:
+        _digests[(path, stat.st_mtime_ns, stat.st_size)] = digest
+
+
+def thumbnail_path(digest, size, thumbnail_dir=THUMBNAIL_DIR):
+    """Where the ``size`` derivative of the content ``digest`` is stored."""
+    return os.path.join(thumbnail_dir, digest[:2], f"{digest}_{size}.{EXTENSION}")
+
+
+def remove_thumbnails(digest, thumbnail_dir=THUMBNAIL_DIR):
+    """Deletes every derivative of the content ``digest``; returns how many went."""
+    shard = os.path.join(thumbnail_dir, digest[:2])
+    removed = 0
+    try:
+        names = [name for name in os.listdir(shard) if name.startswith(f"{digest}_")]
+    except FileNotFoundError:
+        return removed
+    for name in names:
+        try:
+            os.remove(os.path.join(shard, name))
+            removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+def generate(source, sizes=SIZES, thumbnail_dir=THUMBNAIL_DIR, force=False):
+    """Writes the derivatives of ``source`` that are missing and returns {size: path}.
+
+    Identical pictures share their thumbnails, since they are named by content.
+    Files are written under a temporary name and renamed, so a reader never
+    sees a half-written thumbnail.
+    """
+    digest = cached_digest(source)
+    paths = {size: thumbnail_path(digest, size, thumbnail_dir) for size in sizes}
+    missing = [size for size, path in paths.items() if force or not os.path.exists(path)]
+    if not missing:
+        return paths
+
+    with Image.open(source) as image:
+        # Honour camera rotation, and drop alpha/palettes the output format lacks
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        for size in missing:
+            if size == SMALL:
+                derivative = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+            else:
+                derivative = image.copy()
+                derivative.thumbnail((size, size), Image.Resampling.LANCZOS)
+            path = paths[size]
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temporary = f"{path}.{uuid.uuid4().hex}.tmp"
+            derivative.save(temporary, FORMAT, quality=QUALITY)
+            os.replace(temporary, path)
+    return paths
+
+
+def thumbnail_for(picture_path, size, thumbnail_dir=THUMBNAIL_DIR):
+    """Returns the path to show for ``picture_path`` at ``size``.
+
+    Falls back to the picture itself while no thumbnail has been generated.
+    Stored pictures carry their digest in their name; older ones are hashed
+    in the background and show the original until that is done.
+    """
+    if not picture_path:
+        return picture_path
+    try:
+        digest = known_digest(picture_path)
+    except OSError:
+        return picture_path
+    if digest is None:
+        _hash_later(picture_path)
+        return picture_path
+    path = thumbnail_path(digest, size, thumbnail_dir)
+    return path if os.path.exists(path) else picture_path
+
+
+def find_pictures(directory=PICTURE_DIR):
+    """Yields the image files directly in ``directory``, skipping hidden entries."""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.startswith(".") or not entry.is_file():
+                continue
+            if os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS:
+                yield entry.path
+
+
+def _backfill_one(job):
+    """Process pool worker: generates one picture's thumbnails, reporting instead of raising."""
+    source, sizes, thumbnail_dir, force = job
+    try:
+        generate(source, sizes, thumbnail_dir, force)
+        return source, None
+    except (OSError, ValueError) as exc:
+        return source, str(exc)
+
+
+def backfill(directory=PICTURE_DIR, sizes=SIZES, thumbnail_dir=None, workers=None,
+             force=False, progress=None):
+    """Generates missing thumbnails for every picture in ``directory`` across processes.
+
+    Decoding and resizing are CPU bound, so a process pool scales them past
+    the GIL. ``progress(done, total)`` is called after each picture. Returns
+    ``{"pictures": n, "failed": {path: error}}``.
+    """
+    thumbnail_dir = thumbnail_dir or os.path.join(directory, ".thumbs")
+    pictures = list(find_pictures(directory))
+    jobs = [(path, tuple(sizes), thumbnail_dir, force) for path in pictures]
+    failed = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for done, (source, error) in enumerate(
+                pool.map(_backfill_one, jobs, chunksize=8), start=1):
+            if error is not None:
+                failed[source] = error
+            if progress:
+                progress(done, len(jobs))
+    return {"pictures": len(pictures), "failed": failed}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate missing thumbnails for the uploaded pictures.")
+    parser.add_argument("--dir", default=PICTURE_DIR,
+                        help=f"picture directory (default {PICTURE_DIR})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--force", action="store_true",
+                        help="regenerate thumbnails that already exist")
+    args = parser.parse_args()
+
+    def progress(done, total):
+        if done == total or done % 50 == 0:
+            print(f"{done}/{total} pictures")
+
+    result = backfill(args.dir, workers=args.workers, force=args.force, progress=progress)
+    for path, error in result["failed"].items():
+        print(f"    failed {path}: {error}")
+    print(f"{result['pictures']} picture(s), {len(result['failed'])} failed")
+    return 1 if result["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,19 +1,32 @@
-from sqlalchemy import Column, Integer, String, Text, Date
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, Date, Index, func
+from sqlalchemy.orm import column_property, relationship
 from .case_victim import CaseVictim
 from .case_suspect import CaseSuspect
 from .database import Base
 
+# Number of characters of the description shown on a case card
+DESCRIPTION_PREVIEW_LENGTH = 200
+
 
 class Case(Base):
     __tablename__ = "cases"
+    __table_args__ = (
+        # Serves month ranges on startDate and the (startDate, id) keyset order
+        Index("ix_cases_start_date_id", "startDate", "id"),
+        # Serves a detective filter in the same keyset order, without a sort
+        Index("ix_cases_detective_start_date_id", "detective", "startDate", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    progress = Column(Integer, nullable=False)
+    progress = Column(Integer, nullable=False, index=True)
     startDate = Column(Date, nullable=False)
     description = Column(Text, nullable=False)
     detective = Column(String, nullable=True)
-    priority = Column(String, nullable=True)
+    priority = Column(String, nullable=True, index=True)
+
+    # Truncated by the database, so cards never transfer the full text
+    description_preview = column_property(
+        func.substr(description, 1, DESCRIPTION_PREVIEW_LENGTH), deferred=True)
 
     victims = relationship(
         'Victim', secondary=CaseVictim, back_populates="cases")
@@ -1,4 +1,4 @@
-from sqlalchemy import Table, ForeignKey, Column
+from sqlalchemy import Table, ForeignKey, Column, Index
 from .database import Base
 
 CaseSuspect = Table(
@@ -6,4 +6,6 @@ CaseSuspect = Table(
     Base.metadata,
     Column("case_id", ForeignKey("cases.id"), primary_key=True),
     Column("suspect_id", ForeignKey("suspects.id"), primary_key=True),
+    # The primary key serves case -> suspects; this serves suspect -> cases
+    Index("ix_case_suspects_suspect_id", "suspect_id", "case_id"),
 )
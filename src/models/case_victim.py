@@ -1,4 +1,4 @@
-from sqlalchemy import Table, ForeignKey, Column
+from sqlalchemy import Table, ForeignKey, Column, Index
 from .database import Base
 
 
@@ -7,4 +7,6 @@ CaseVictim = Table(
     Base.metadata,
     Column("case_id", ForeignKey("cases.id"), primary_key=True),
     Column("victim_id", ForeignKey("victims.id"), primary_key=True),
+    # The primary key serves case -> victims; this serves victim -> cases
+    Index("ix_case_victims_victim_id", "victim_id", "case_id"),
 )
@@ -0,0 +1,96 @@
+import argparse
+
+from sqlalchemy import func, select, update
+
+from .case_suspect import CaseSuspect
+from .case_victim import CaseVictim
+from .database import engine
+from .suspect import Suspect
+from .victim import Victim
+
+SUSPECT = "suspect"
+VICTIM = "victim"
+
+# kind -> (person model, association table, person column on the table)
+PERSON_LINKS = {
+    SUSPECT: (Suspect, CaseSuspect, "suspect_id"),
+    VICTIM: (Victim, CaseVictim, "victim_id"),
+}
+
+
+def actual_case_count(kind):
+    """Correlated subquery counting a person's rows in the association table."""
+    model, link, person_column = PERSON_LINKS[kind]
+    return (select(func.count())
+            .select_from(link)
+            .where(link.c[person_column] == model.__table__.c.id)
+            .scalar_subquery())
+
+
+def recount_case_counts(executor, kind, person_ids=None):
+    """Recomputes case_count from the association table for the given people (or everyone).
+
+    ``executor`` is a session or connection; the update joins its transaction,
+    so counters change atomically with the links they describe.
+    """
+    model, _link, _person_column = PERSON_LINKS[kind]
+    table = model.__table__
+    statement = update(table).values(case_count=actual_case_count(kind))
+    if person_ids is not None:
+        person_ids = list(person_ids)
+        if not person_ids:
+            return 0
+        statement = statement.where(table.c.id.in_(person_ids))
+    return executor.execute(statement).rowcount
+
+
+def find_drift(executor, kind):
+    """Returns (id, stored, actual) for every person whose counter is wrong."""
+    model, _link, _person_column = PERSON_LINKS[kind]
+    table = model.__table__
+    actual = actual_case_count(kind)
+    rows = executor.execute(
+        select(table.c.id, table.c.case_count, actual)
+        .where(table.c.case_count != actual)
+        .order_by(table.c.id)
+    ).all()
+    return [tuple(row) for row in rows]
+
+
+def verify(bind=engine):
+    """Returns the drifted counters of every kind, keyed by kind."""
+    with bind.connect() as connection:
+        return {kind: find_drift(connection, kind) for kind in PERSON_LINKS}
+
+
+def rebuild(bind=engine):
+    """Recomputes every counter and returns how many rows were wrong before, per kind."""
+    with bind.begin() as connection:
+        drift = {kind: len(find_drift(connection, kind)) for kind in PERSON_LINKS}
+        for kind in PERSON_LINKS:
+            recount_case_counts(connection, kind)
+    return drift
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check or repair the denormalized case_count counters.")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="recompute every counter instead of only reporting drift")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        for kind, count in rebuild().items():
+            print(f"{kind}: repaired {count} counter(s)")
+        return 0
+
+    drift = verify()
+    for kind, rows in drift.items():
+        print(f"{kind}: {len(rows)} drifted counter(s)")
+        for person_id, stored, actual in rows[:20]:
+            print(f"    id {person_id}: stored {stored}, actual {actual}")
+    return 1 if any(drift.values()) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,10 +1,18 @@
 from .database import Base, engine
+from .migrations import run_migrations
 
 
-def init_db():
+def load_models():
+    """Imports every model so their tables are registered on Base.metadata."""
     # pylint: disable=import-outside-toplevel
     # pylint: disable=unused-import
     import src.models.case
     import src.models.victim
     import src.models.suspect
+
+
+def init_db():
+    load_models()
     Base.metadata.create_all(bind=engine)
+    # Bring existing databases up to date with indexes added since they were created
+    return run_migrations(engine)
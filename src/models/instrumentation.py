@@ -0,0 +1,192 @@
+import json
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+# Upper bounds (ms) of the latency histogram buckets; slower ones go to the last
+LATENCY_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000)
+# A statement shape repeated more than this many times in one action is an N+1
+N_PLUS_ONE_THRESHOLD = 5
+# How many N+1 findings are kept for the summary
+MAX_FINDINGS = 50
+# Action name for statements issued outside any tagged view action
+NO_ACTION = "(no action)"
+# Packages whose frames are used to tag statements with their caller
+CALLER_PACKAGES = ("src.controllers.", "src.views.")
+
+_current_action = ContextVar("query_action", default=None)
+
+_WHITESPACE = re.compile(r"\s+")
+_PARAMETER_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s|%s)(?:\s*,\s*(?:\?|%\(\w+\)s|%s))*\s*\)")
+
+
+def statement_shape(statement):
+    """Normalizes a SQL statement so repeated lookups with different lists compare equal."""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    return _PARAMETER_LIST.sub("(?)", shape)
+
+
+def find_caller(frame, packages=CALLER_PACKAGES):
+    """Returns "Class.method" (or "module.function") of the nearest app frame."""
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(packages):
+            instance = frame.f_locals.get("self")
+            owner = type(instance).__name__ if instance is not None else module.rsplit(".", 1)[-1]
+            return f"{owner}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "(unknown)"
+
+
+class LatencyHistogram:
+    """Counts statement latencies into fixed buckets."""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, elapsed_ms):
+        index = len(LATENCY_BUCKETS_MS)
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def as_dict(self):
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS]
+        labels.append(f">{LATENCY_BUCKETS_MS[-1]}ms")
+        count = self.count
+        return {
+            "count": count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / count, 3) if count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "histogram": dict(zip(labels, self.counts)),
+        }
+
+
+class _ActionRun:
+    """Statements seen during one run of a view action."""
+
+    def __init__(self, name):
+        self.name = name
+        self.shapes = Counter()
+        self.callers = {}
+
+
+class QueryStats:
+    """Collects statement counts, latencies and N+1 findings per action and caller."""
+
+    def __init__(self, threshold=N_PLUS_ONE_THRESHOLD):
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.actions = {}
+            self.callers = {}
+            self.action_runs = Counter()
+            self.findings = deque(maxlen=MAX_FINDINGS)
+
+    def record(self, action_name, caller, elapsed_ms):
+        with self._lock:
+            self.actions.setdefault(action_name, LatencyHistogram()).add(elapsed_ms)
+            self.callers.setdefault(caller, LatencyHistogram()).add(elapsed_ms)
+
+    def finish(self, run):
+        """Counts a finished action run and flags the shapes it repeated too often."""
+        with self._lock:
+            self.action_runs[run.name] += 1
+            for shape, count in run.shapes.items():
+                if count > self.threshold:
+                    self.findings.append({
+                        "action": run.name,
+                        "caller": run.callers[shape],
+                        "count": count,
+                        "statement": shape,
+                    })
+
+    def summary(self):
+        """Returns a JSON-serializable snapshot of everything recorded so far."""
+        with self._lock:
+            actions = {
+                name: dict(histogram.as_dict(), runs=self.action_runs.get(name, 0))
+                for name, histogram in sorted(
+                    self.actions.items(), key=lambda item: -item[1].count)
+            }
+            callers = {
+                name: histogram.as_dict()
+                for name, histogram in sorted(
+                    self.callers.items(), key=lambda item: -item[1].total_ms)
+            }
+            return {
+                "n_plus_one_threshold": self.threshold,
+                "actions": actions,
+                "callers": callers,
+                "n_plus_one": list(self.findings),
+            }
+
+    def dump(self, path):
+        """Writes the summary to ``path`` as JSON and returns the path."""
+        with open(path, "w", encoding="utf-8") as out:
+            json.dump(self.summary(), out, indent=2)
+        return path
+
+
+stats = QueryStats()
+
+
+@contextmanager
+def action(name):
+    """Tags the statements run inside the block (or decorated function) with a view action."""
+    run = _ActionRun(name)
+    token = _current_action.set(run)
+    try:
+        yield run
+    finally:
+        _current_action.reset(token)
+        stats.finish(run)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+    caller = find_caller(sys._getframe(1))  # pylint: disable=protected-access
+    run = _current_action.get()
+    if run is not None:
+        shape = statement_shape(statement)
+        run.shapes[shape] += 1
+        run.callers.setdefault(shape, caller)
+    stats.record(run.name if run is not None else NO_ACTION, caller, elapsed_ms)
+
+
+def install(bind):
+    """Starts recording every statement executed through the engine."""
+    if not event.contains(bind, "before_cursor_execute", _before_cursor_execute):
+        event.listen(bind, "before_cursor_execute", _before_cursor_execute)
+        event.listen(bind, "after_cursor_execute", _after_cursor_execute)
+
+
+def uninstall(bind):
+    """Stops recording statements executed through the engine."""
+    if event.contains(bind, "before_cursor_execute", _before_cursor_execute):
+        event.remove(bind, "before_cursor_execute", _before_cursor_execute)
+        event.remove(bind, "after_cursor_execute", _after_cursor_execute)
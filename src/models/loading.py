@@ -0,0 +1,52 @@
+from sqlalchemy.orm import load_only, selectinload, undefer
+
+from .case import Case
+from .suspect import Suspect
+from .victim import Victim
+
+# Loading profiles, from lightest to heaviest
+LIST = "list"      # ids and short fields, e.g. dropdowns and calendar lookups
+CARD = "card"      # what a card shows, with a database-truncated text preview
+DETAIL = "detail"  # every column
+REPORT = "report"  # every column plus the linked people's names
+
+PROFILES = (LIST, CARD, DETAIL, REPORT)
+
+# Short columns loaded by the LIST profile of each model
+_LIST_COLUMNS = {
+    Case: (Case.id, Case.progress, Case.startDate, Case.detective, Case.priority),
+    Suspect: (Suspect.id, Suspect.nik, Suspect.name),
+    Victim: (Victim.id, Victim.nik, Victim.name),
+}
+
+# Extra columns a card shows on top of the LIST columns
+_CARD_COLUMNS = {
+    Case: (Case.description_preview,),
+    Suspect: (Suspect.age, Suspect.gender, Suspect.picture_path, Suspect.note_preview),
+    Victim: (Victim.age, Victim.picture_path, Victim.forensic_result_preview),
+}
+
+
+def loading_options(model, profile):
+    """Returns the loader options that load ``model`` for the given profile.
+
+    LIST and CARD leave the large Text columns unloaded and raise if they are
+    touched, so a screen that needs them has to ask for DETAIL explicitly
+    instead of issuing one lazy query per row.
+    """
+    if profile == LIST:
+        return [load_only(*_LIST_COLUMNS[model], raiseload=True)]
+    if profile == CARD:
+        card_columns = _CARD_COLUMNS[model]
+        return [load_only(*_LIST_COLUMNS[model], *card_columns, raiseload=True),
+                *(undefer(column) for column in card_columns)]
+    if profile == DETAIL:
+        return []
+    if profile == REPORT:
+        if model is not Case:
+            return []
+        return [
+            selectinload(Case.suspects).options(*loading_options(Suspect, LIST)),
+            selectinload(Case.victims).options(*loading_options(Victim, LIST)),
+        ]
+    raise ValueError(f"Unknown loading profile: {profile}")
@@ -0,0 +1,332 @@
+import argparse
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect
+from sqlalchemy.exc import DBAPIError
+
+from .database import engine
+
+_metadata = MetaData()
+
+SchemaMigrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+# Representative lookups whose plans a dry run reports before and after
+CALENDAR_PROBE = ('SELECT id FROM cases WHERE "startDate" >= \'2024-01-01\' '
+                  'AND "startDate" < \'2024-02-01\' ORDER BY "startDate", id')
+PROGRESS_PROBE = "SELECT id FROM cases WHERE progress = 1"
+PRIORITY_PROBE = "SELECT id FROM cases WHERE priority = 'Tinggi'"
+SUSPECT_NIK_PROBE = "SELECT id FROM suspects WHERE nik LIKE '12%'"
+VICTIM_NIK_PROBE = "SELECT id FROM victims WHERE nik LIKE '12%'"
+SUSPECT_CASES_PROBE = "SELECT case_id FROM case_suspects WHERE suspect_id = 1"
+VICTIM_CASES_PROBE = "SELECT case_id FROM case_victims WHERE victim_id = 1"
+TOP_SUSPECTS_PROBE = ("SELECT id, name, case_count FROM suspects WHERE case_count > 0 "
+                      "ORDER BY case_count DESC, id DESC LIMIT 10")
+CASE_TEXT_PROBE = {
+    "sqlite": "SELECT rowid FROM cases_fts WHERE cases_fts MATCH 'pencurian'",
+    "postgresql": "SELECT id FROM cases WHERE to_tsvector('simple', description) @@ to_tsquery('simple', 'pencurian')",
+}
+DETECTIVE_PROBE = ("SELECT id FROM cases WHERE detective = 'Rina Wijaya' "
+                   'ORDER BY "startDate", id LIMIT 10')
+PICTURE_REFERENCES_PROBE = ("SELECT count(*) FROM suspects "
+                            "WHERE picture_path = 'img/placeholder.png'")
+TOP_VICTIMS_PROBE = ("SELECT id, name, case_count FROM victims WHERE case_count > 0 "
+                     "ORDER BY case_count DESC, id DESC LIMIT 10")
+
+
+class Migration:
+    """A numbered, idempotent schema change.
+
+    ``statements`` is either a list of SQL strings run on every database, or
+    a dict of such lists keyed by dialect name with an optional "default".
+    Entries may also be callables taking the connection, for changes that
+    need to inspect the schema first.
+    """
+
+    def __init__(self, version, description, statements, probes=()):
+        self.version = version
+        self.description = description
+        self.statements = statements
+        self.probes = list(probes)
+
+    def probes_for(self, dialect_name):
+        """Probe queries for the dialect; a probe may be a dict of SQL by dialect name."""
+        probes = []
+        for probe in self.probes:
+            if isinstance(probe, dict):
+                probe = probe.get(dialect_name, probe.get("default"))
+            if probe:
+                probes.append(probe)
+        return probes
+
+    def statements_for(self, dialect_name):
+        if isinstance(self.statements, dict):
+            return self.statements.get(dialect_name, self.statements.get("default", []))
+        return self.statements
+
+
+def sqlite_fts(table, column):
+    """Statements for an FTS5 index over ``table.column`` kept in sync by triggers."""
+    fts = f"{table}_fts"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({column}, content='{table}', "
+        f"content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {column}) VALUES (new.id, new.{column}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column}) VALUES ('delete', old.id, old.{column}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF {column} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column}) VALUES ('delete', old.id, old.{column}); "
+        f"INSERT INTO {fts}(rowid, {column}) VALUES (new.id, new.{column}); END",
+        # Index the rows that existed before the triggers
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def add_column(table, column, definition):
+    """Builds a migration step that adds a column unless the table already has it."""
+    def step(connection):
+        columns = {c["name"] for c in inspect(connection).get_columns(table)}
+        if column not in columns:
+            connection.exec_driver_sql(
+                f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    step.__doc__ = f"ALTER TABLE {table} ADD COLUMN {column} {definition} (if missing)"
+    return step
+
+
+MIGRATIONS = [
+    Migration(
+        1,
+        "Composite (startDate, id) index on cases",
+        ['CREATE INDEX IF NOT EXISTS ix_cases_start_date_id ON cases ("startDate", id)'],
+        probes=[CALENDAR_PROBE],
+    ),
+    Migration(
+        2,
+        "Progress and priority filter indexes on cases",
+        [
+            "CREATE INDEX IF NOT EXISTS ix_cases_progress ON cases (progress)",
+            "CREATE INDEX IF NOT EXISTS ix_cases_priority ON cases (priority)",
+        ],
+        probes=[PROGRESS_PROBE, PRIORITY_PROBE],
+    ),
+    Migration(
+        3,
+        "Prefix-friendly NIK indexes on suspects and victims",
+        {
+            # LIKE 'x%' can only use an index with a matching collation/opclass
+            "sqlite": [
+                "CREATE INDEX IF NOT EXISTS ix_suspects_nik_prefix ON suspects (nik COLLATE NOCASE)",
+                "CREATE INDEX IF NOT EXISTS ix_victims_nik_prefix ON victims (nik COLLATE NOCASE)",
+            ],
+            "postgresql": [
+                "CREATE INDEX IF NOT EXISTS ix_suspects_nik_prefix ON suspects (nik varchar_pattern_ops)",
+                "CREATE INDEX IF NOT EXISTS ix_victims_nik_prefix ON victims (nik varchar_pattern_ops)",
+            ],
+            "default": [
+                "CREATE INDEX IF NOT EXISTS ix_suspects_nik_prefix ON suspects (nik)",
+                "CREATE INDEX IF NOT EXISTS ix_victims_nik_prefix ON victims (nik)",
+            ],
+        },
+        probes=[SUSPECT_NIK_PROBE, VICTIM_NIK_PROBE],
+    ),
+    Migration(
+        4,
+        "Reverse lookup indexes on the case association tables",
+        [
+            "CREATE INDEX IF NOT EXISTS ix_case_suspects_suspect_id ON case_suspects (suspect_id, case_id)",
+            "CREATE INDEX IF NOT EXISTS ix_case_victims_victim_id ON case_victims (victim_id, case_id)",
+        ],
+        probes=[SUSPECT_CASES_PROBE, VICTIM_CASES_PROBE],
+    ),
+    Migration(
+        5,
+        "Denormalized case_count counters on suspects and victims",
+        [
+            add_column("suspects", "case_count", "INTEGER NOT NULL DEFAULT 0"),
+            add_column("victims", "case_count", "INTEGER NOT NULL DEFAULT 0"),
+            "UPDATE suspects SET case_count = (SELECT count(*) FROM case_suspects "
+            "WHERE case_suspects.suspect_id = suspects.id)",
+            "UPDATE victims SET case_count = (SELECT count(*) FROM case_victims "
+            "WHERE case_victims.victim_id = victims.id)",
+            "CREATE INDEX IF NOT EXISTS ix_suspects_case_count ON suspects (case_count, id)",
+            "CREATE INDEX IF NOT EXISTS ix_victims_case_count ON victims (case_count, id)",
+        ],
+        probes=[TOP_SUSPECTS_PROBE, TOP_VICTIMS_PROBE],
+    ),
+    Migration(
+        6,
+        "Full-text indexes on case descriptions, suspect notes and victim forensic results",
+        {
+            # FTS5 shadow tables; triggers keep them in step with every write
+            "sqlite": (sqlite_fts("cases", "description")
+                       + sqlite_fts("suspects", "note")
+                       + sqlite_fts("victims", "forensic_result")),
+            # Expression indexes are maintained by PostgreSQL itself
+            "postgresql": [
+                "CREATE INDEX IF NOT EXISTS ix_cases_description_fts ON cases "
+                "USING GIN (to_tsvector('simple', description))",
+                "CREATE INDEX IF NOT EXISTS ix_suspects_note_fts ON suspects "
+                "USING GIN (to_tsvector('simple', note))",
+                "CREATE INDEX IF NOT EXISTS ix_victims_forensic_result_fts ON victims "
+                "USING GIN (to_tsvector('simple', forensic_result))",
+            ],
+        },
+        probes=[CASE_TEXT_PROBE],
+    ),
+    Migration(
+        7,
+        "Detective filter index on cases",
+        ['CREATE INDEX IF NOT EXISTS ix_cases_detective_start_date_id '
+         'ON cases (detective, "startDate", id)'],
+        probes=[DETECTIVE_PROBE],
+    ),
+    Migration(
+        8,
+        "Picture path indexes for picture reference counts",
+        [
+            "CREATE INDEX IF NOT EXISTS ix_suspects_picture_path ON suspects (picture_path)",
+            "CREATE INDEX IF NOT EXISTS ix_victims_picture_path ON victims (picture_path)",
+        ],
+        probes=[PICTURE_REFERENCES_PROBE],
+    ),
+]
+
+
+def applied_versions(connection):
+    """Returns the versions already recorded in schema_migrations."""
+    if not inspect(connection).has_table(SchemaMigrations.name):
+        return set()
+    return {row.version for row in connection.execute(SchemaMigrations.select())}
+
+
+def pending_migrations(connection, migrations=None):
+    """Returns the migrations not applied yet, in version order."""
+    applied = applied_versions(connection)
+    migrations = MIGRATIONS if migrations is None else migrations
+    return sorted((m for m in migrations if m.version not in applied),
+                  key=lambda m: m.version)
+
+
+def query_plan(connection, sql):
+    """Returns the database's plan for ``sql`` as a list of lines."""
+    if connection.dialect.name == "sqlite":
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").all()
+        return [row[-1] for row in rows]
+    return [row[0] for row in connection.exec_driver_sql(f"EXPLAIN {sql}").all()]
+
+
+def run_migrations(bind=engine, dry_run=False, migrations=None):
+    """Applies pending migrations and returns a report of what was (or would be) done.
+
+    With ``dry_run`` every pending migration is executed inside a transaction
+    that is rolled back, and the report lists the plans of the migration's
+    probe queries before and after, so the expected plan changes can be
+    reviewed without touching the database.
+    """
+    report = []
+    with bind.connect() as connection:
+        if not dry_run:
+            SchemaMigrations.create(connection, checkfirst=True)
+            connection.commit()
+
+        pending = pending_migrations(connection, migrations)
+        for migration in pending:
+            _begin_ddl(connection)
+            probes = migration.probes_for(connection.dialect.name)
+            before = {sql: _probe_plan(connection, sql)
+                      for sql in probes} if dry_run else {}
+
+            statements = migration.statements_for(connection.dialect.name)
+            for statement in statements:
+                if callable(statement):
+                    statement(connection)
+                else:
+                    connection.exec_driver_sql(statement)
+
+            entry = {
+                "version": migration.version,
+                "description": migration.description,
+                "statements": [s if isinstance(s, str) else s.__doc__ or s.__name__
+                               for s in statements],
+            }
+            if dry_run:
+                entry["plans"] = [
+                    {"query": sql, "before": before[sql],
+                     "after": query_plan(connection, sql)}
+                    for sql in probes
+                ]
+                connection.rollback()
+            else:
+                connection.execute(SchemaMigrations.insert().values(
+                    version=migration.version,
+                    description=migration.description,
+                    applied_at=datetime.now(),
+                ))
+                connection.commit()
+            report.append(entry)
+
+        if dry_run:
+            connection.rollback()
+    return report
+
+
+def _probe_plan(connection, sql):
+    """Like query_plan, but reports probes that cannot be planned before the migration runs."""
+    connection.exec_driver_sql("SAVEPOINT probe_plan")
+    try:
+        plan = query_plan(connection, sql)
+    except DBAPIError as exc:
+        # e.g. the probe reads a column the migration is about to add
+        connection.exec_driver_sql("ROLLBACK TO SAVEPOINT probe_plan")
+        plan = [f"not plannable: {exc.orig}"]
+    connection.exec_driver_sql("RELEASE SAVEPOINT probe_plan")
+    return plan
+
+
+def _begin_ddl(connection):
+    """Starts a transaction that also covers DDL statements.
+
+    pysqlite only opens transactions implicitly before DML, so without an
+    explicit BEGIN a CREATE INDEX would be committed immediately.
+    """
+    if connection.in_transaction():
+        connection.commit()
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("BEGIN")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Apply pending database migrations.")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="show the pending migrations and their expected plan changes without applying them")
+    args = parser.parse_args()
+
+    if args.dry_run:
+        report = run_migrations(dry_run=True)
+    else:
+        # pylint: disable=import-outside-toplevel
+        from .init_database import init_db
+        report = init_db()
+
+    if not report:
+        print("Database is up to date.")
+    for entry in report:
+        print(f"[{entry['version']}] {entry['description']}")
+        for statement in entry["statements"]:
+            print(f"    {statement}")
+        for plan in entry.get("plans", []):
+            marker = "changed" if plan["before"] != plan["after"] else "unchanged"
+            print(f"  plan ({marker}): {plan['query']}")
+            print(f"    before: {' | '.join(plan['before'])}")
+            print(f"    after:  {' | '.join(plan['after'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from .database import SessionLocal
+
+# Scope used when no page session is active, e.g. in scripts and tests
+DEFAULT_SCOPE = "default"
+
+_current_scope = ContextVar("session_scope", default=DEFAULT_SCOPE)
+
+
+class SessionManager:
+    """Hands out one database session per scope, such as a Flet page session.
+
+    A scope's session lives until the next user action starts (``begin_action``)
+    or the scope ends (``close``), so connections go back to the pool and the
+    identity map does not grow for the lifetime of the app.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self._session_factory = session_factory
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def current_scope():
+        """Returns the scope active in the current context."""
+        return _current_scope.get()
+
+    @contextmanager
+    def scope(self, scope):
+        """Makes ``scope`` the active scope for controllers created inside the block."""
+        token = _current_scope.set(scope)
+        try:
+            yield
+        finally:
+            _current_scope.reset(token)
+
+    def get(self, scope=None):
+        """Returns the session of the given (or active) scope, opening it on first use."""
+        scope = self.current_scope() if scope is None else scope
+        with self._lock:
+            session = self._sessions.get(scope)
+            if session is None:
+                session = self._session_factory()
+                self._sessions[scope] = session
+            return session
+
+    def begin_action(self, scope=None):
+        """Starts a new user action: the scope's previous session is closed."""
+        self.close(scope)
+
+    def expire(self, scope=None):
+        """Expires every object loaded by the scope's session so it is reloaded on access."""
+        scope = self.current_scope() if scope is None else scope
+        with self._lock:
+            session = self._sessions.get(scope)
+        if session is not None:
+            session.expire_all()
+
+    def close(self, scope=None):
+        """Closes the scope's session, returning its connection to the pool."""
+        scope = self.current_scope() if scope is None else scope
+        with self._lock:
+            session = self._sessions.pop(scope, None)
+        if session is not None:
+            session.close()
+
+    def close_all(self):
+        """Closes the sessions of every scope."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def active_scopes(self):
+        """Returns the scopes that currently hold an open session."""
+        with self._lock:
+            return list(self._sessions)
+
+    @contextmanager
+    def isolated(self):
+        """Yields a session of no scope, closed on exit, for work on other threads."""
+        session = self._session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    @contextmanager
+    def unit_of_work(self, scope=None):
+        """Yields the scope's session, committing on success and rolling back on error."""
+        session = self.get(scope)
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+
+
+session_manager = SessionManager()
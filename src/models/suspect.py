@@ -1,11 +1,20 @@
-from sqlalchemy import Column, Integer, String, Boolean, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Index, Integer, String, Boolean, Text, func
+from sqlalchemy.orm import column_property, relationship
 from .case_suspect import CaseSuspect
 from .database import Base
 
+# Number of characters of the note shown on a suspect card
+NOTE_PREVIEW_LENGTH = 200
+
 
 class Suspect(Base):
     __tablename__ = "suspects"
+    __table_args__ = (
+        # Serves the top-N by case_count as an index scan
+        Index("ix_suspects_case_count", "case_count", "id"),
+        # Serves the picture store's reference count
+        Index("ix_suspects_picture_path", "picture_path"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -16,6 +25,12 @@ class Suspect(Base):
     age = Column(Integer, nullable=False)
     gender = Column(Boolean, nullable=False)
     note = Column(Text, nullable=False)
+    # Truncated by the database, so cards never transfer the full text
+    note_preview = column_property(
+        func.substr(note, 1, NOTE_PREVIEW_LENGTH), deferred=True)
+
+    # Number of linked cases, maintained by the assignment paths
+    case_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     cases = relationship('Case', secondary=CaseSuspect,
                          back_populates='suspects')
@@ -1,11 +1,20 @@
-from sqlalchemy import Column, Integer, String, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Index, Integer, String, Text, func
+from sqlalchemy.orm import column_property, relationship
 from .case_victim import CaseVictim
 from .database import Base
 
+# Number of characters of the forensic result shown on a victim card
+FORENSIC_PREVIEW_LENGTH = 200
+
 
 class Victim(Base):
     __tablename__ = "victims"
+    __table_args__ = (
+        # Serves the top-N by case_count as an index scan
+        Index("ix_victims_case_count", "case_count", "id"),
+        # Serves the picture store's reference count
+        Index("ix_victims_picture_path", "picture_path"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -15,6 +24,12 @@ class Victim(Base):
 
     age = Column(Integer, nullable=False)
     forensic_result = Column(Text, nullable=False)
+    # Truncated by the database, so cards never transfer the full text
+    forensic_result_preview = column_property(
+        func.substr(forensic_result, 1, FORENSIC_PREVIEW_LENGTH), deferred=True)
+
+    # Number of linked cases, maintained by the assignment paths
+    case_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     cases = relationship('Case', secondary=CaseVictim,
                          back_populates='victims')
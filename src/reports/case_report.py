@@ -0,0 +1,291 @@
+# reports/case_report.py
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from fpdf import FPDF
+
+from src.controllers.calendar_controller import month_bounds
+from src.controllers.case_filter import CaseFilter
+from src.models.case import Case
+from src.models.database import SessionLocal
+from src.models.loading import REPORT, loading_options
+from src.reports.report_cache import ReportCache
+
+# Part of every report digest; bump when render_case_report changes its output
+LAYOUT_VERSION = 1
+
+# Batch exports start from a worker thread of the running app; forking a
+# process with live threads can deadlock the child, so workers are spawned
+_PROCESS_CONTEXT = multiprocessing.get_context("spawn")
+
+# Single reports render here so the file-picker callback returns at once
+_threads = ThreadPoolExecutor(max_workers=2, thread_name_prefix="case-report")
+
+
+class CaseReportData:
+    """Everything a case report prints, detached from the session so it can cross processes.
+
+    Suspects and victims are (id, nik, name) tuples in ID order.
+    """
+    __slots__ = ("id", "progress", "start_date", "detective", "priority", "description",
+                 "suspects", "victims")
+
+    def __init__(self, id, progress, start_date, detective, priority,  # pylint: disable=redefined-builtin
+                 description, suspects, victims):
+        self.id = id
+        self.progress = progress
+        self.start_date = start_date
+        self.detective = detective
+        self.priority = priority
+        self.description = description
+        self.suspects = suspects
+        self.victims = victims
+
+    @classmethod
+    def from_case(cls, case):
+        return cls(
+            case.id, case.progress, str(case.startDate).split(' ')[0], case.detective,
+            case.priority, case.description,
+            sorted((suspect.id, suspect.nik, suspect.name) for suspect in case.suspects),
+            sorted((victim.id, victim.nik, victim.name) for victim in case.victims),
+        )
+
+    def digest(self):
+        """SHA-256 of exactly what the report prints plus the layout version."""
+        fields = [LAYOUT_VERSION, printed_content(self)]
+        return hashlib.sha256(json.dumps(fields).encode()).hexdigest()
+
+
+def report_filename(case_id):
+    return f"laporan_kasus_{case_id}.pdf"
+
+
+def load_report_data(db, case_filter=None, case_ids=None):
+    """Loads the report data of the matching cases in three queries, in (startDate, id) order."""
+    query = db.query(Case).options(*loading_options(Case, REPORT))
+    if case_filter is not None:
+        query = case_filter.apply(query)
+    if case_ids is not None:
+        query = query.filter(Case.id.in_(list(case_ids)))
+    return [CaseReportData.from_case(case)
+            for case in query.order_by(Case.startDate, Case.id).all()]
+
+
+def printed_content(data):
+    """Every value the report prints, in print order: (details, description, people).
+
+    ``render_case_report`` lays out only this and the digest hashes all of
+    it, so no field can reach the PDF without changing the cache key.
+    """
+    details = [
+        ("Case ID", str(data.id)),
+        ("Progress", str(data.progress)),
+        ("Start Date", str(data.start_date)),
+        ("Detective", str(data.detective) if data.detective else "-"),
+        ("Priority", str(data.priority) if data.priority else "-"),
+    ]
+    people = [
+        (heading, [f"- {name}" for _id, _nik, name in persons])
+        for heading, persons in (("Daftar Tersangka", data.suspects),
+                                 ("Daftar Korban", data.victims))
+        if persons
+    ]
+    return details, data.description, people
+
+
+def render_case_report(data):
+    """Renders one case report and returns the PDF bytes."""
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", size=12)
+
+    # Judul
+    pdf.set_font("Arial", style="B", size=16)
+    pdf.cell(0, 10, "Laporan Kasus", ln=True, align="C")
+    pdf.ln(10)
+
+    # Informasi Kasus
+    pdf.set_font("Arial", style="B", size=12)
+    pdf.cell(0, 10, "Informasi Kasus", ln=True)
+
+    details, description, people = printed_content(data)
+    pdf.set_font("Arial", size=12)
+
+    # Menambahkan detail kasus
+    for label, value in details:
+        pdf.cell(60, 10, f"{label}:", 0, 0)
+        pdf.cell(0, 10, value, ln=True)
+
+    # Deskripsi Kasus
+    pdf.ln(5)
+    pdf.set_font("Arial", 'B', 12)
+    pdf.cell(0, 10, "Deskripsi Kasus", ln=True)
+    pdf.set_font("Arial", size=12)
+    pdf.multi_cell(0, 10, description)
+
+    # Tersangka dan korban
+    for heading, lines in people:
+        pdf.ln(5)
+        pdf.set_font("Arial", 'B', 12)
+        pdf.cell(0, 10, heading, ln=True)
+        pdf.set_font("Arial", size=12)
+        for line in lines:
+            pdf.cell(0, 10, line, ln=True)
+
+    return bytes(pdf.output())
+
+
+def _render_entry(data):
+    """Process pool worker: returns (data, pdf bytes)."""
+    return data, render_case_report(data)
+
+
+def _write_file(path, content):
+    """Writes through a temporary file so a reader never sees a partial PDF."""
+    temporary = f"{path}.{threading.get_ident()}.tmp"
+    with open(temporary, "wb") as output:
+        output.write(content)
+    os.replace(temporary, path)
+
+
+class ReportService:
+    """Renders case reports off the UI thread.
+
+    Every method returns a Future. Data is loaded on the worker with its own
+    session, since the page's session must stay on the UI thread. Rendered
+    reports go through ``cache``, so an unchanged case is only copied.
+    """
+
+    def __init__(self, session_factory=SessionLocal, cache=None):
+        self._session_factory = session_factory
+        self.cache = cache or ReportCache()
+
+    def generate(self, case_id, path):
+        """Writes one case's report to ``path``; the Future resolves to the path, or None if no case."""
+        def run():
+            with self._session_factory() as db:
+                reports = load_report_data(db, case_ids=[case_id])
+            if not reports:
+                return None
+            digest = reports[0].digest()
+            if not self.cache.copy_to(digest, path):
+                content = render_case_report(reports[0])
+                self.cache.put(digest, content)
+                _write_file(path, content)
+            return path
+
+        return _threads.submit(run)
+
+    def export(self, destination, case_filter=None, month=None, year=None,
+               workers=None, progress=None):
+        """Writes the reports of every matching case, rendered in parallel across processes.
+
+        Cases are those matching ``case_filter`` and, if given, starting in
+        ``month``/``year``. A ``destination`` ending in ``.zip`` gets one ZIP
+        with the PDFs written into it as they arrive; otherwise it is a
+        directory of PDFs. ``progress(done, total)`` is called from the worker
+        thread. The Future resolves to the number of reports written.
+        """
+        case_filter = case_filter or CaseFilter()
+        if month is not None:
+            start, end = month_bounds(month, year)
+            case_filter = case_filter.replace(start_from=start, start_before=end)
+
+        def run():
+            with self._session_factory() as db:
+                reports = load_report_data(db, case_filter)
+            if progress:
+                progress(0, len(reports))
+            if not reports:
+                return 0
+            return self._write_batch(reports, destination, workers, progress)
+
+        return _threads.submit(run)
+
+    def _contents(self, reports, workers):
+        """Yields (data, pdf bytes) for every report, cached ones first.
+
+        Cache misses render in a process pool, started only if there are any.
+        A cached file evicted between lookup and read is rendered here instead.
+        """
+        hits = []
+        missing = []
+        for data in reports:
+            (missing if self.cache.lookup(data.digest()) is None else hits).append(data)
+        pool = (ProcessPoolExecutor(max_workers=workers, mp_context=_PROCESS_CONTEXT)
+                if missing else None)
+        try:
+            rendered = pool.map(_render_entry, missing, chunksize=4) if pool else ()
+            for data in hits:
+                content = self.cache.read(data.digest())
+                if content is None:
+                    content = render_case_report(data)
+                    self.cache.put(data.digest(), content, evict=False)
+                yield data, content
+            for data, content in rendered:
+                self.cache.put(data.digest(), content, evict=False)
+                yield data, content
+        finally:
+            if pool:
+                pool.shutdown(cancel_futures=True)
+        self.cache.evict()
+
+    def _write_batch(self, reports, destination, workers, progress):
+        """Writes every report into the ZIP or directory at ``destination``."""
+        total = len(reports)
+        entries = enumerate(self._contents(reports, workers), start=1)
+        if destination.lower().endswith(".zip"):
+            os.makedirs(os.path.dirname(os.path.abspath(destination)), exist_ok=True)
+            temporary = f"{destination}.tmp"
+            with zipfile.ZipFile(temporary, "w", zipfile.ZIP_DEFLATED) as archive:
+                for done, (data, content) in entries:
+                    archive.writestr(report_filename(data.id), content)
+                    if progress:
+                        progress(done, total)
+            os.replace(temporary, destination)
+        else:
+            os.makedirs(destination, exist_ok=True)
+            for done, (data, content) in entries:
+                _write_file(os.path.join(destination, report_filename(data.id)), content)
+                if progress:
+                    progress(done, total)
+        return total
+
+
+# Shared by every page and view, so the cache and its lock are process-wide
+report_service = ReportService()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export case reports as PDFs.")
+    parser.add_argument("destination", help="a .zip file, or a directory for loose PDFs")
+    parser.add_argument("--month", type=int, help="only cases starting in this month")
+    parser.add_argument("--year", type=int, help="year of --month")
+    parser.add_argument("--progress", type=int,
+                        help="only cases with this progress (0 solved, 1 unsolved, 2 ongoing)")
+    parser.add_argument("--detective", help="only cases of this detective")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="render processes (default: one per CPU)")
+    args = parser.parse_args()
+    if (args.month is None) != (args.year is None):
+        parser.error("--month and --year go together")
+
+    def show_progress(done, total):
+        print(f"\r{done}/{total}", end="", flush=True)
+
+    written = ReportService().export(
+        args.destination, CaseFilter(progress=args.progress, detective=args.detective),
+        month=args.month, year=args.year, workers=args.workers, progress=show_progress,
+    ).result()
+    print(f"\nwrote {written} report(s) to {args.destination}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
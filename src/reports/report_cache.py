@@ -0,0 +1,95 @@
+# reports/report_cache.py
+import os
+import shutil
+import threading
+import uuid
+
+# Rendered reports are kept here, named by the digest of what they print
+CACHE_DIR = os.path.join(".cache", "reports")
+
+# Least recently used reports are evicted once the cache grows past this
+MAX_BYTES = 256 * 1024 * 1024
+
+
+class ReportCache:
+    """Rendered PDFs on disk keyed by content digest, bounded in size with LRU eviction.
+
+    Recency is the file's mtime, refreshed on every hit, so it survives
+    restarts and is shared by every process using the same directory.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def path_for(self, digest):
+        return os.path.join(self.directory, f"{digest}.pdf")
+
+    def lookup(self, digest):
+        """Returns the cached file for ``digest`` and marks it as used, or None."""
+        path = self.path_for(digest)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def read(self, digest):
+        """Returns the cached report's bytes and marks it as used, or None."""
+        path = self.lookup(digest)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as cached:
+                return cached.read()
+        except FileNotFoundError:
+            # Evicted by another process in between
+            return None
+
+    def copy_to(self, digest, destination):
+        """Copies the cached report to ``destination``; returns False on a miss."""
+        path = self.lookup(digest)
+        if path is None:
+            return False
+        temporary = f"{destination}.{uuid.uuid4().hex}.tmp"
+        try:
+            shutil.copyfile(path, temporary)
+        except FileNotFoundError:
+            # Evicted by another process in between
+            return False
+        os.replace(temporary, destination)
+        return True
+
+    def put(self, digest, content, evict=True):
+        """Stores a rendered report; pass ``evict=False`` when storing many and call evict() after."""
+        os.makedirs(self.directory, exist_ok=True)
+        temporary = os.path.join(self.directory, f".{uuid.uuid4().hex}.tmp")
+        with open(temporary, "wb") as output:
+            output.write(content)
+        os.replace(temporary, self.path_for(digest))
+        if evict:
+            self.evict()
+
+    def evict(self):
+        """Deletes the least recently used reports until the cache fits in max_bytes."""
+        with self._lock:
+            try:
+                with os.scandir(self.directory) as entries:
+                    files = [(entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                             for entry in entries
+                             if entry.name.endswith(".pdf") and entry.is_file()]
+            except FileNotFoundError:
+                return 0
+            total = sum(size for _mtime, size, _path in files)
+            removed = 0
+            for _mtime, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+            return removed
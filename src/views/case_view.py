@@ -1,10 +1,17 @@
 # views/case_view.py
 from datetime import date
 import flet as ft
-from fpdf import FPDF
 
 from src.controllers.case_controller import CaseController
+from src.controllers.case_filter import CaseFilter
+from src.controllers.suspect_controller import SuspectController
+from src.controllers.victim_controller import VictimController
 from src.routes.destinations import destinations
+from src.views.report_export import ReportExportBar
+from src.views.typeahead import TypeaheadPicker, isolated_search
+from src.models import instrumentation
+from src.models.session_manager import session_manager
+from src.reports.case_report import report_filename, report_service
 
 
 def on_navigation_change(page: ft.Page, selected_index: int):
@@ -21,37 +28,40 @@ def on_navigation_change(page: ft.Page, selected_index: int):
         on_change=lambda e: on_navigation_change(
             page, e.control.selected_index),
     )
-    if selected_index == 0:
-        CaseView().render(page)
-    elif selected_index == 1:
-        from src.views.suspect_view import SuspectView
-        SuspectView().render(page)
-    elif selected_index == 2:
-        from src.views.victim_view import VictimView
-        VictimView().render(page)
-    elif selected_index == 3:
-        from src.views.schedule_view import Schedule
-        Schedule().render(page)
-    elif selected_index == 4:
-        from src.views.statistic_view import Statistic
-        Statistic().render(page)
-    else:
-        page.controls.clear()
-        page.add(
-            ft.Row(
-                [
-                    rail,
-                    ft.VerticalDivider(width=1),
-                    ft.Container(
-                        content=ft.Text("On Progress", size=24),
-                        padding=10,
-                        alignment=ft.alignment.center,
-                    ),
-                ],
-                expand=True,
+    # Each navigation is a new user action with a fresh session for this page
+    session_manager.begin_action(page.session_id)
+    with session_manager.scope(page.session_id):
+        if selected_index == 0:
+            CaseView().render(page)
+        elif selected_index == 1:
+            from src.views.suspect_view import SuspectView
+            SuspectView().render(page)
+        elif selected_index == 2:
+            from src.views.victim_view import VictimView
+            VictimView().render(page)
+        elif selected_index == 3:
+            from src.views.schedule_view import Schedule
+            Schedule().render(page)
+        elif selected_index == 4:
+            from src.views.statistic_view import Statistic
+            Statistic().render(page)
+        else:
+            page.controls.clear()
+            page.add(
+                ft.Row(
+                    [
+                        rail,
+                        ft.VerticalDivider(width=1),
+                        ft.Container(
+                            content=ft.Text("On Progress", size=24),
+                            padding=10,
+                            alignment=ft.alignment.center,
+                        ),
+                    ],
+                    expand=True,
+                )
             )
-        )
-        page.update()
+            page.update()
 
 
 class CaseView:
@@ -61,18 +71,59 @@ class CaseView:
         self.page_number = 1
         self.per_page = 12
         self.total_pages = 1  # Initialize total pages
-        self.filter_progress = None
+        # Criteria of the filter bar, and the labels of the people picked in it
+        self.case_filter = CaseFilter()
+        self.filter_labels = {}
+        # Keyset cursors for the current page and its neighbours
+        self.cursor = None
+        self.backwards = False
+        self.next_cursor = None
+        self.prev_cursor = None
+        # Full-text search; results page forward only, so earlier cursors are kept
+        self.search_query = None
+        self.search_history = []
+        self.snippets = {}
+        # PDF reports render on worker threads and processes
+        self.reports = report_service
+        # One per page session, so a running export stays visible; set by render
+        self.export_bar = None
 
     def fetch_cases(self):
         """Fetches cases for the current page with optional filtering."""
-        pagination_data = self.controller.get_all_cases_pagination(
-            page=self.page_number,
+        if self.search_query:
+            return self.fetch_search_results()
+        self.snippets = {}
+        pagination_data = self.controller.get_all_cases_cursor(
+            cursor=self.cursor,
             per_page=self.per_page,
-            filter_progress=self.filter_progress,  # Pass the filter
+            case_filter=self.case_filter,  # Pass the filter
+            backwards=self.backwards,
         )
         self.total_pages = pagination_data["total_pages"]
+        self.next_cursor = pagination_data["next_cursor"]
+        self.prev_cursor = pagination_data["prev_cursor"]
+        if self.prev_cursor is None:
+            self.page_number = 1
         return pagination_data["cases"]
 
+    def fetch_search_results(self):
+        """Fetches the current page of search hits and remembers their snippets."""
+        result = self.controller.search_cases(
+            self.search_query,
+            self.case_filter,
+            cursor=self.cursor,
+            per_page=self.per_page,
+        )
+        self.snippets = {hit.case.id: hit.snippet for hit in result["hits"]}
+        self.next_cursor = result["next_cursor"]
+        self.prev_cursor = None
+        return [hit.case for hit in result["hits"]]
+
+    def _has_previous_page(self):
+        if self.search_query:
+            return bool(self.search_history)
+        return self.prev_cursor is not None
+
     def build_cases_component(self, cases):
         """Builds the cases component with the given list of cases."""
         temp_row = []
@@ -94,6 +145,9 @@ class CaseView:
                                 f"Start Date: {str(case.startDate).split(' ')[0]}", size=12),
                             ft.Text(f"Detective: {case.detective}", size=12),
                             ft.Text(f"Priority: {case.priority}", size=12),
+                            # A search snippet, or else the start of the description
+                            ft.Text(self.snippets.get(case.id) or case.description_preview,
+                                    size=12, italic=True, color="#9AA0A6", max_lines=3),
                         ],
                         alignment=ft.MainAxisAlignment.START,
                     ),
@@ -122,13 +176,14 @@ class CaseView:
                 ft.ElevatedButton(
                     "Previous",
                     on_click=self.previous_page,
-                    disabled=self.page_number <= 1,
+                    disabled=not self._has_previous_page(),
                 ),
-                ft.Text(f"Page {self.page_number} of {self.total_pages}"),
+                ft.Text(f"Page {self.page_number}" if self.search_query
+                        else f"Page {self.page_number} of {self.total_pages}"),
                 ft.ElevatedButton(
                     "Next",
                     on_click=self.next_page,
-                    disabled=self.page_number >= self.total_pages,
+                    disabled=self.next_cursor is None,
                 ),
             ],
             alignment=ft.MainAxisAlignment.CENTER,
@@ -136,16 +191,48 @@ class CaseView:
 
     def previous_page(self, _e):
         """Handles the Previous button click."""
-        if self.page_number > 1:
+        if self.search_query and self.search_history:
             self.page_number -= 1
+            self.cursor = self.search_history.pop()
+            self.render(self.page)
+        elif self.prev_cursor is not None:
+            self.page_number = max(self.page_number - 1, 1)
+            self.cursor = self.prev_cursor
+            self.backwards = True
             self.render(self.page)
 
     def next_page(self, _e):
         """Handles the Next button click."""
-        if self.page_number < self.total_pages:
+        if self.next_cursor is not None:
+            if self.search_query:
+                self.search_history.append(self.cursor)
             self.page_number += 1
+            self.cursor = self.next_cursor
+            self.backwards = False
+            self.render(self.page)
+
+    def reset_pagination(self):
+        """Moves back to the first page, e.g. after the filter changes."""
+        self.page_number = 1
+        self.cursor = None
+        self.backwards = False
+        self.search_history = []
+
+    def build_search_box(self):
+        """Builds the full-text search field; submitting an empty query clears the search."""
+        def search_submitted(e):
+            self.search_query = e.control.value.strip() or None
+            self.reset_pagination()
             self.render(self.page)
 
+        return ft.TextField(
+            label="Search descriptions and notes",
+            value=self.search_query or "",
+            width=320,
+            prefix_icon=ft.Icons.SEARCH,
+            on_submit=search_submitted,
+        )
+
     def build_dropdown(self):
         """Builds the dropdown for filtering cases."""
         def dropdown_changed(e):
@@ -155,9 +242,7 @@ class CaseView:
                 "Unsolved": 1,
                 "Ongoing": 2,
             }
-            self.filter_progress = filter_mapping.get(dd.value, None)
-            self.page_number = 1  # Reset to the first page
-            self.render(self.page)  # Re-render with the updated filter
+            self.change_filter(progress=filter_mapping.get(dd.value, None))
 
         # Map current filter progress to dropdown value
         filter_mapping_reverse = {
@@ -167,7 +252,7 @@ class CaseView:
             2: "Ongoing",
         }
         current_filter = filter_mapping_reverse.get(
-            self.filter_progress, "Remove Filter")
+            self.case_filter.progress, "Remove Filter")
 
         # Define the dropdown
         dd = ft.Dropdown(
@@ -185,10 +270,94 @@ class CaseView:
 
         return dd
 
+    def change_filter(self, labels=None, **changes):
+        """Updates the filter criteria and shows the first matching page."""
+        self.case_filter = self.case_filter.replace(**changes)
+        self.filter_labels.update(labels or {})
+        self.reset_pagination()  # Reset to the first page
+        self.render(self.page)  # Re-render with the updated filter
+
+    def clear_filters(self, _e):
+        self.case_filter = CaseFilter()
+        self.filter_labels = {}
+        self.reset_pagination()
+        self.render(self.page)
+
+    def build_filter_bar(self):
+        """Builds the filter bar; every criterion narrows the same listing query."""
+        def priority_changed(e):
+            self.change_filter(priority=None if e.control.value == "Semua" else e.control.value)
+
+        def detective_submitted(e):
+            self.change_filter(detective=e.control.value.strip() or None)
+
+        def date_submitted(e, field):
+            value = e.control.value.strip()
+            try:
+                changes = {field: date.fromisoformat(value) if value else None}
+                self.case_filter.replace(**changes)
+            except ValueError:
+                e.control.error_text = "Use YYYY-MM-DD, from before until"
+                e.control.update()
+                return
+            self.change_filter(**changes)
+
+        def person_picker(label, field, search):
+            picker = TypeaheadPicker(
+                label=label,
+                search=search,
+                on_select=lambda key: self.change_filter(
+                    labels={field: picker.field.value}, **{field: key}),
+                width=260,
+            )
+            picker.field.value = self.filter_labels.get(field, "") if getattr(
+                self.case_filter, field) is not None else ""
+            return picker.control
+
+        priority = ft.Dropdown(
+            label="Priority",
+            width=130,
+            options=[ft.dropdown.Option(option)
+                     for option in ("Semua", "Rendah", "Sedang", "Tinggi")],
+            value=self.case_filter.priority or "Semua",
+            on_change=priority_changed,
+        )
+        detective = ft.TextField(
+            label="Detective", width=180, value=self.case_filter.detective or "",
+            on_submit=detective_submitted)
+        start_from = ft.TextField(
+            label="Start from", width=140, hint_text="YYYY-MM-DD",
+            value=str(self.case_filter.start_from or ""),
+            on_submit=lambda e: date_submitted(e, "start_from"))
+        start_before = ft.TextField(
+            label="Start before", width=140, hint_text="YYYY-MM-DD",
+            value=str(self.case_filter.start_before or ""),
+            on_submit=lambda e: date_submitted(e, "start_before"))
+        # The pickers search on a timer thread, each search on a session of its own
+        suspect = person_picker("Involves suspect", "suspect_id", isolated_search(
+            lambda db, term: [(person.id, person.name)
+                              for person in SuspectController(db).search_suspects(name=term)]))
+        victim = person_picker("Involves victim", "victim_id", isolated_search(
+            lambda db, term: [(person.id, person.name)
+                              for person in VictimController(db).search_victims(name=term)]))
+
+        return ft.Row(
+            [
+                self.build_dropdown(), priority, detective, start_from, start_before,
+                suspect, victim,
+                ft.TextButton("Clear filters", on_click=self.clear_filters,
+                              disabled=self.case_filter.is_empty()),
+            ],
+            wrap=True,
+            vertical_alignment=ft.CrossAxisAlignment.START,
+        )
+
+    @instrumentation.action("CaseView.render")
     def render(self, page: ft.Page):
         """Renders the case management view."""
         self.page = page
         cases = self.fetch_cases()
+        self.export_bar = ReportExportBar.for_page(page, self.reports, lambda: self.case_filter)
 
         rail = ft.NavigationRail(
             selected_index=0,
@@ -217,7 +386,9 @@ class CaseView:
                                     padding=10,
                                     alignment=ft.alignment.center,
                                 ),
-                                self.build_dropdown(),
+                                self.build_search_box(),
+                                self.build_filter_bar(),
+                                self.export_bar.control,
                                 ft.Column(
                                     [self.build_cases_component(cases)],
                                     expand=True,
@@ -366,6 +537,7 @@ class CaseView:
         )
         self.page.update()
 
+    @instrumentation.action("CaseView.render_detail")
     def render_detail(self, case_id):
         """Renders the details of a specific case."""
         # Fetch case details using the controller
@@ -407,90 +579,28 @@ class CaseView:
 
         def download_report(e):
             """Handles the download report button click."""
-            case = self.controller.get_case_by_id(case_id)
-            if case:
-                # Buat dialog untuk memilih lokasi penyimpanan
-                file_picker = ft.FilePicker(
-                    on_result=lambda e: handle_file_pick(e, case)
-                )
-                self.page.overlay.append(file_picker)
-                self.page.update()
-                file_picker.save_file(
-                    dialog_title="Simpan Laporan Kasus",
-                    file_name=f"laporan_kasus_{case_id}.pdf"
-                )
+            # Buat dialog untuk memilih lokasi penyimpanan
+            file_picker = ft.FilePicker(on_result=handle_file_pick)
+            self.page.overlay.append(file_picker)
+            self.page.update()
+            file_picker.save_file(
+                dialog_title="Simpan Laporan Kasus",
+                file_name=report_filename(case_id)
+            )
 
-        def handle_file_pick(e, case):
-            """Proses generate PDF setelah memilih lokasi"""
+        def handle_file_pick(e):
+            """Generates the PDF off the UI thread after a location was picked."""
             if e.path:
-                try:
-                    generate_case_report(case, e.path)
-                    self.page.show_snack_bar(
-                        ft.SnackBar(content=ft.Text(
-                            "Laporan berhasil dibuat!"))
-                    )
-                except Exception as ex:
-                    self.page.show_snack_bar(
-                        ft.SnackBar(content=ft.Text(
-                            f"Gagal membuat laporan: {str(ex)}"))
-                    )
+                self.reports.generate(case_id, e.path).add_done_callback(report_done)
 
-        def generate_case_report(case, filename):
-            """Generates a PDF report for the given case."""
-            pdf = FPDF()
-            pdf.add_page()
-            pdf.set_font("Arial", size=12)
-
-            # Judul
-            pdf.set_font("Arial", style="B", size=16)
-            pdf.cell(0, 10, "Laporan Kasus", ln=True, align="C")
-            pdf.ln(10)
-
-            # Informasi Kasus
-            pdf.set_font("Arial", style="B", size=12)
-            pdf.cell(0, 10, "Informasi Kasus", ln=True)
-
-            pdf.set_font("Arial", size=12)
-            case_details = [
-                ("Case ID", str(case.id)),
-                ("Progress", case.progress),
-                ("Start Date", str(case.startDate).split(' ')[0]),
-                ("Detective", case.detective if case.detective else "-"),
-                ("Priority", case.priority if case.priority else "-")
-            ]
-
-            # Menambahkan detail kasus
-            for label, value in case_details:
-                pdf.cell(60, 10, f"{label}:", 0, 0)
-                pdf.cell(0, 10, str(value), ln=True)
-
-            # Deskripsi Kasus
-            pdf.ln(5)
-            pdf.set_font("Arial", 'B', 12)
-            pdf.cell(0, 10, "Deskripsi Kasus", ln=True)
-            pdf.set_font("Arial", size=12)
-            pdf.multi_cell(0, 10, case.description)
-
-            # Tersangka
-            if case.suspects:
-                pdf.ln(5)
-                pdf.set_font("Arial", 'B', 12)
-                pdf.cell(0, 10, "Daftar Tersangka", ln=True)
-                pdf.set_font("Arial", size=12)
-                for suspect in case.suspects:
-                    pdf.cell(0, 10, f"- {suspect.name}", ln=True)
-
-            # Korban
-            if case.victims:
-                pdf.ln(5)
-                pdf.set_font("Arial", 'B', 12)
-                pdf.cell(0, 10, "Daftar Korban", ln=True)
-                pdf.set_font("Arial", size=12)
-                for victim in case.victims:
-                    pdf.cell(0, 10, f"- {victim.name}", ln=True)
-
-            # Menyimpan PDF
-            pdf.output(filename)
+        def report_done(future):
+            """Reports the outcome of a generated report; runs on the worker thread."""
+            try:
+                message = ("Laporan berhasil dibuat!" if future.result()
+                           else "Kasus tidak ditemukan")
+            except Exception as ex:  # pylint: disable=broad-except
+                message = f"Gagal membuat laporan: {str(ex)}"
+            self.page.show_snack_bar(ft.SnackBar(content=ft.Text(message)))
 
         # Display case details
         self.page.controls.clear()
@@ -740,25 +850,25 @@ class CaseView:
         )
         self.page.update()
 
+    @instrumentation.action("CaseView.render_assign_suspects")
     def render_assign_suspects(self, case):
         """Renders a dialog to assign suspects to the case."""
-        # Fetch unassigned suspects
+        # Search unassigned suspects by name or NIK as the user types
         case_id = case.id
-        unassigned_suspects = self.controller.get_unassigned_suspects(case_id)
-
-        # Create a dropdown for unassigned suspects
-        suspect_dropdown = ft.Dropdown(
-            label="Select Suspect",
-            options=[
-                ft.dropdown.Option(key=suspect.id, text=suspect.name)
-                for suspect in unassigned_suspects
-            ]
+        suspect_picker = TypeaheadPicker(
+            label="Search Suspect (name or NIK)",
+            search=isolated_search(lambda db, term: [
+                (suspect.id, f"{suspect.name} ({suspect.nik})")
+                for suspect in CaseController(db).get_unassigned_suspects(case_id, term)
+            ]),
         )
+        suspect_picker.load()
 
         def assign_suspect(e):
-            if suspect_dropdown.value:
+            if suspect_picker.selected is not None:
+                suspect_picker.cancel()
                 self.controller.assign_suspect_to_case(
-                    case.id, int(suspect_dropdown.value))
+                    case.id, suspect_picker.selected)
                 # Re-render the case detail view
                 self.render_detail(case.id)
 
@@ -789,7 +899,8 @@ class CaseView:
                 content=ft.Column([
                     ft.Text("Assign Suspects to Case", size=24),
                     ft.Text(f"Case ID: {case.id}", size=16),
-                    ft.Row([suspect_dropdown, assign_button]),
+                    ft.Row([suspect_picker.control, assign_button],
+                           vertical_alignment=ft.CrossAxisAlignment.START),
                     ft.Text("Currently Assigned Suspects:",
                             size=18, weight="bold"),
                     assigned_suspects_list,
@@ -812,25 +923,25 @@ class CaseView:
         # Re-render the assign suspects view
         self.render_assign_suspects(case)
 
+    @instrumentation.action("CaseView.render_assign_victims")
     def render_assign_victims(self, case):
         """Renders a dialog to assign victims to the case."""
-        # Fetch unassigned victims
+        # Search unassigned victims by name or NIK as the user types
         case_id = case.id
-        unassigned_victims = self.controller.get_unassigned_victims(case_id)
-
-        # Create a dropdown for unassigned victims
-        victim_dropdown = ft.Dropdown(
-            label="Select Victim",
-            options=[
-                ft.dropdown.Option(key=victim.id, text=victim.name)
-                for victim in unassigned_victims
-            ]
+        victim_picker = TypeaheadPicker(
+            label="Search Victim (name or NIK)",
+            search=isolated_search(lambda db, term: [
+                (victim.id, f"{victim.name} ({victim.nik})")
+                for victim in CaseController(db).get_unassigned_victims(case_id, term)
+            ]),
         )
+        victim_picker.load()
 
         def assign_victim(e):
-            if victim_dropdown.value:
+            if victim_picker.selected is not None:
+                victim_picker.cancel()
                 self.controller.assign_victim_to_case(
-                    case.id, int(victim_dropdown.value))
+                    case.id, victim_picker.selected)
                 # Re-render the case detail view
                 self.render_detail(case.id)
 
@@ -861,7 +972,8 @@ class CaseView:
                 content=ft.Column([
                     ft.Text("Assign Victims to Case", size=24),
                     ft.Text(f"Case ID: {case.id}", size=16),
-                    ft.Row([victim_dropdown, assign_button]),
+                    ft.Row([victim_picker.control, assign_button],
+                           vertical_alignment=ft.CrossAxisAlignment.START),
                     ft.Text("Currently Assigned Victims:",
                             size=18, weight="bold"),
                     assigned_victims_list,
@@ -0,0 +1,73 @@
+# views/debug_overlay.py
+import os
+
+import flet as ft
+
+from src.models import instrumentation
+
+# Where the "Save JSON" button writes the query statistics
+DUMP_PATH = os.getenv("DB_INSTRUMENTATION_FILE", "query_stats.json")
+
+
+def format_summary(summary, limit=10):
+    """Formats the busiest actions and callers plus N+1 findings as plain text."""
+    lines = ["Actions (statements / total ms / runs):"]
+    for name, data in list(summary["actions"].items())[:limit]:
+        lines.append(f"  {name}: {data['count']} / {data['total_ms']:.1f} / {data['runs']}")
+    lines.append("")
+    lines.append("Callers (statements / total ms / max ms):")
+    for name, data in list(summary["callers"].items())[:limit]:
+        lines.append(f"  {name}: {data['count']} / {data['total_ms']:.1f} / {data['max_ms']:.1f}")
+    lines.append("")
+    lines.append(f"N+1 suspects (> {summary['n_plus_one_threshold']} repeats):")
+    if not summary["n_plus_one"]:
+        lines.append("  none")
+    for finding in summary["n_plus_one"][-limit:]:
+        lines.append(f"  {finding['action']} via {finding['caller']}: "
+                     f"{finding['count']}x {finding['statement'][:120]}")
+    return "\n".join(lines)
+
+
+def show_query_stats(page: ft.Page):
+    """Opens a dialog with the query statistics recorded so far."""
+    def close(_e):
+        dialog.open = False
+        page.update()
+
+    def save(_e):
+        path = instrumentation.stats.dump(DUMP_PATH)
+        page.show_snack_bar(ft.SnackBar(content=ft.Text(f"Saved to {path}")))
+
+    def reset(_e):
+        instrumentation.stats.reset()
+        close(_e)
+
+    dialog = ft.AlertDialog(
+        title=ft.Text("Query statistics"),
+        content=ft.Container(
+            content=ft.Column(
+                [ft.Text(format_summary(instrumentation.stats.summary()),
+                         selectable=True, font_family="monospace", size=12)],
+                scroll=ft.ScrollMode.AUTO,
+            ),
+            width=900,
+            height=500,
+        ),
+        actions=[
+            ft.TextButton("Save JSON", on_click=save),
+            ft.TextButton("Reset", on_click=reset),
+            ft.TextButton("Close", on_click=close),
+        ],
+    )
+    page.overlay.append(dialog)
+    dialog.open = True
+    page.update()
+
+
+def install_shortcut(page: ft.Page):
+    """Opens the query statistics dialog on Ctrl+Shift+D."""
+    def on_keyboard(e: ft.KeyboardEvent):
+        if e.ctrl and e.shift and e.key.upper() == "D":
+            show_query_stats(page)
+
+    page.on_keyboard_event = on_keyboard
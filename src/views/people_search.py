@@ -0,0 +1,77 @@
+# views/people_search.py
+import flet as ft
+
+from src.controllers.search_controller import SearchController
+from src.media import thumbnails
+from src.models.session_manager import session_manager
+
+KIND_LABELS = {"suspect": "Suspect", "victim": "Victim"}
+
+
+class PersonMatch:
+    """A search_people row shaped like the card rows of its own screen."""
+    __slots__ = ("kind", "id", "nik", "name", "age", "picture_path", "gender", "summary")
+
+    def __init__(self, row):
+        self.kind = row.kind
+        self.id = row.id
+        self.nik = row.nik
+        self.name = row.name
+        self.age = row.age
+        self.picture_path = row.picture_path
+        self.gender = row.gender
+        self.summary = row.summary
+
+    @property
+    def note(self):
+        return self.summary
+
+    @property
+    def forensic_result(self):
+        return self.summary
+
+
+def search_people_by_kind(name, nik):
+    """Runs one combined suspect and victim search; returns {kind: matches}, best first."""
+    found = {kind: [] for kind in KIND_LABELS}
+    for row in SearchController().search_people(name or None, nik or None):
+        found[row.kind].append(PersonMatch(row))
+    return found
+
+
+def open_person(page, kind, person_id):
+    """Shows the detail page of a suspect or victim as a new user action."""
+    session_manager.begin_action(page.session_id)
+    with session_manager.scope(page.session_id):
+        if kind == "suspect":
+            from src.views.suspect_view import SuspectView
+            view = SuspectView()
+            view.page = page
+            view.render_suspect_detail(person_id)
+        else:
+            from src.views.victim_view import VictimView
+            view = VictimView()
+            view.page = page
+            view.render_victim_detail(person_id)
+
+
+def build_other_matches(page, kind, people):
+    """A compact list of the ``kind`` people the same search found, each opening its detail page."""
+    if not people:
+        return ft.Column([])
+    return ft.Column(
+        [ft.Text(f"Also matching {KIND_LABELS[kind].lower()}s:", size=14, weight="bold")]
+        + [
+            ft.ListTile(
+                leading=ft.Image(
+                    src=thumbnails.thumbnail_for(person.picture_path, thumbnails.SMALL),
+                    width=40, height=40, fit=ft.ImageFit.COVER),
+                title=ft.Text(person.name),
+                subtitle=ft.Text(f"{KIND_LABELS[kind]} · NIK {person.nik} · {person.age}"),
+                dense=True,
+                on_click=lambda e, person_id=person.id: open_person(page, kind, person_id),
+            )
+            for person in people
+        ],
+        spacing=0,
+    )
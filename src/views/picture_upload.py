@@ -0,0 +1,85 @@
+# views/picture_upload.py
+import flet as ft
+
+from src.media import picture_store
+
+
+class PictureUploadField:
+    """A picture path field whose picker stores the chosen file off the UI thread.
+
+    The copy runs on the picture store's worker with a progress bar; ``busy``
+    is True until it finishes and ``value`` then holds the stored path. Add
+    ``file_picker`` to the page overlay.
+    """
+
+    def __init__(self, value=None, label="Picture Path",
+                 allowed_extensions=("jpg", "jpeg", "png")):
+        self.value = value
+        self.busy = False
+        self.shown_fraction = 0.0
+
+        self.path_field = ft.TextField(
+            label=label, value=value or "", read_only=True, hint_text="Select a picture")
+        self.file_picker = ft.FilePicker(on_result=self.handle_pick)
+        self.button = ft.ElevatedButton(
+            "Pick Picture",
+            icon=ft.Icons.IMAGE,
+            on_click=lambda _: self.file_picker.pick_files(
+                allow_multiple=False, allowed_extensions=list(allowed_extensions)),
+        )
+        self.progress = ft.ProgressBar(value=0, width=400, visible=False)
+        self.status = ft.Text("", size=12, color="#9AA0A6")
+        self.control = ft.Column([
+            ft.Row([self.path_field, self.button],
+                   alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+            self.progress,
+            self.status,
+        ])
+
+    def handle_pick(self, e: ft.FilePickerResultEvent):
+        if not e.files:
+            self.status.value = "No file selected"
+            self.refresh()
+            return
+
+        self.busy = True
+        self.shown_fraction = 0.0
+        self.button.disabled = True
+        self.progress.value = 0
+        self.progress.visible = True
+        self.status.value = f"Copying {e.files[0].name}..."
+        self.refresh()
+
+        future = picture_store.upload(e.files[0].path, progress=self.show_progress)
+        future.add_done_callback(self.finish)
+
+    def show_progress(self, copied, total):
+        """Runs on the upload thread; redraws at most once per percent."""
+        fraction = copied / total if total else 1.0
+        if fraction < 1.0 and fraction - self.shown_fraction < 0.01:
+            return
+        self.shown_fraction = fraction
+        self.progress.value = fraction
+        self.refresh()
+
+    def finish(self, future):
+        self.busy = False
+        self.button.disabled = False
+        self.progress.visible = False
+        try:
+            picture = future.result()
+        except Exception as exc:  # pylint: disable=broad-except
+            # Runs on the upload thread; anything raised here would be lost
+            self.status.value = f"Upload failed: {exc}"
+        else:
+            self.value = picture.path
+            self.path_field.value = picture.path
+            self.path_field.error_text = None
+            self.status.value = ("Same picture already stored, reusing it"
+                                 if picture.reused else "Picture stored")
+        self.refresh()
+
+    def refresh(self):
+        # Skip the refresh if the form was left while the copy ran
+        if self.control.page is not None:
+            self.control.update()
@@ -0,0 +1,77 @@
+# views/report_export.py
+import flet as ft
+
+
+class ReportExportBar:
+    """A button exporting the case reports of a filter to a ZIP, with a progress bar.
+
+    ``case_filter`` is called when the export starts, so the export covers
+    the filters active at that moment. Rendering runs on the report service's
+    workers. Add ``file_picker`` to the page overlay, or use ``for_page``.
+    """
+
+    SESSION_KEY = "report_export_bar"
+
+    def __init__(self, reports, case_filter):
+        self.reports = reports
+        self.case_filter = case_filter
+
+        self.file_picker = ft.FilePicker(on_result=self.handle_pick)
+        self.button = ft.OutlinedButton(
+            "Export PDFs",
+            icon=ft.Icons.PICTURE_AS_PDF,
+            on_click=lambda _: self.file_picker.save_file(
+                dialog_title="Ekspor Laporan Kasus",
+                file_name="laporan_kasus.zip",
+                allowed_extensions=["zip"]),
+        )
+        self.progress = ft.ProgressBar(width=240, value=0, visible=False)
+        self.status = ft.Text("", size=12)
+        self.control = ft.Row([self.button, self.progress, self.status],
+                              vertical_alignment=ft.CrossAxisAlignment.CENTER)
+
+    @classmethod
+    def for_page(cls, page, reports, case_filter):
+        """The page session's bar, created and added to the overlay on first use.
+
+        Reusing it keeps a running export visible across navigation, and the
+        overlay gets one file picker per session rather than one per render.
+        """
+        export_bar = page.session.get(cls.SESSION_KEY)
+        if export_bar is None:
+            export_bar = cls(reports, case_filter)
+            page.session.set(cls.SESSION_KEY, export_bar)
+            page.overlay.append(export_bar.file_picker)
+        export_bar.case_filter = case_filter
+        return export_bar
+
+    def handle_pick(self, e: ft.FilePickerResultEvent):
+        if not e.path:
+            return
+        path = e.path if e.path.lower().endswith(".zip") else f"{e.path}.zip"
+        self.button.disabled = True
+        self.progress.value = 0
+        self.progress.visible = True
+        self.refresh()
+        future = self.reports.export(path, self.case_filter(), progress=self.show_progress)
+        future.add_done_callback(self.finish)
+
+    def show_progress(self, done, total):
+        """Runs on the report worker thread."""
+        self.progress.value = done / total if total else 1
+        self.status.value = f"{done}/{total} laporan"
+        self.refresh()
+
+    def finish(self, future):
+        self.progress.visible = False
+        self.button.disabled = False
+        try:
+            self.status.value = f"{future.result()} laporan diekspor"
+        except Exception as exc:  # pylint: disable=broad-except
+            self.status.value = f"Gagal mengekspor: {exc}"
+        self.refresh()
+
+    def refresh(self):
+        # Skip the refresh if the list was left while the export ran
+        if self.control.page is not None:
+            self.control.update()
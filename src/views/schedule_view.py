@@ -4,6 +4,8 @@ from datetime import datetime, timedelta
 import flet as ft
 
 from src.routes.destinations import destinations
+from src.models import instrumentation
+from src.models.session_manager import session_manager
 from src.controllers.case_controller import CaseController
 from src.controllers.victim_controller import VictimController
 from src.controllers.suspect_controller import SuspectController
@@ -23,37 +25,40 @@ def on_navigation_change(page: ft.Page, selected_index: int):
             page, e.control.selected_index),
     )
 
-    if selected_index == 0:
-        from src.views.case_view import CaseView
-        CaseView().render(page)
-    elif selected_index == 1:
-        from src.views.suspect_view import SuspectView
-        SuspectView().render(page)
-    elif selected_index == 2:
-        from src.views.victim_view import VictimView
-        VictimView().render(page)
-    elif selected_index == 3:
-        Schedule().render(page)
-    elif selected_index == 4:
-        from src.views.statistic_view import Statistic
-        Statistic().render(page)
-    else:
-        page.controls.clear()
-        page.add(
-            ft.Row(
-                [
-                    rail,
-                    ft.VerticalDivider(width=1),
-                    ft.Container(
-                        content=ft.Text("On Progress", size=24),
-                        padding=10,
-                        alignment=ft.alignment.center,
-                    ),
-                ],
-                expand=True,
+    # Each navigation is a new user action with a fresh session for this page
+    session_manager.begin_action(page.session_id)
+    with session_manager.scope(page.session_id):
+        if selected_index == 0:
+            from src.views.case_view import CaseView
+            CaseView().render(page)
+        elif selected_index == 1:
+            from src.views.suspect_view import SuspectView
+            SuspectView().render(page)
+        elif selected_index == 2:
+            from src.views.victim_view import VictimView
+            VictimView().render(page)
+        elif selected_index == 3:
+            Schedule().render(page)
+        elif selected_index == 4:
+            from src.views.statistic_view import Statistic
+            Statistic().render(page)
+        else:
+            page.controls.clear()
+            page.add(
+                ft.Row(
+                    [
+                        rail,
+                        ft.VerticalDivider(width=1),
+                        ft.Container(
+                            content=ft.Text("On Progress", size=24),
+                            padding=10,
+                            alignment=ft.alignment.center,
+                        ),
+                    ],
+                    expand=True,
+                )
             )
-        )
-        page.update()
+            page.update()
 
 
 class Schedule:
@@ -70,10 +75,9 @@ class Schedule:
         self.selected_victim = "No Victims"
         self.selected_suspect = "No Suspects"
 
-        # Fetch all cases for the current month and year (initial unfiltered cases)
-        self.cases = self.calendar_controller.get_all_cases(
-            self.current_month, self.current_year)
-        self.filtered_cases = self.cases  # Initially no filtering
+        # Per-day case counts by priority for the current month and filters
+        self.day_counts = {}
+        self.load_cases()
 
     def get_priority_color(self, priority):
         """Returns color based on priority."""
@@ -84,6 +88,7 @@ class Schedule:
         }
         return priority_colors.get(priority, ft.colors.GREY_300)
 
+    @instrumentation.action("Schedule.render")
     def render(self, page):
         """Renders the schedule page."""
         self.page = page
@@ -124,11 +129,12 @@ class Schedule:
         victims = self.victim_controller.get_all_victims()
         suspects = self.suspect_controller.get_all_suspects()
 
-        # Prepare victim and suspect options dynamically
-        victim_options = [ft.dropdown.Option(
-            victim.name) for victim in victims]
-        suspect_options = [ft.dropdown.Option(
-            suspect.name) for suspect in suspects]
+        # Prepare victim and suspect options dynamically, keyed by ID so
+        # people sharing a name stay distinct
+        victim_options = [ft.dropdown.Option("No Victims")] + [
+            ft.dropdown.Option(key=str(victim.id), text=victim.name) for victim in victims]
+        suspect_options = [ft.dropdown.Option("No Suspects")] + [
+            ft.dropdown.Option(key=str(suspect.id), text=suspect.name) for suspect in suspects]
 
         header = ft.Row(
             [
@@ -186,30 +192,17 @@ class Schedule:
         start_day = first_day_of_month - \
             timedelta(days=first_day_of_month.weekday() + 1)
 
-        # Create a dictionary to map the date to the case IDs
-        case_map = {}
-        for case in self.filtered_cases:
-            case_day = case.startDate.day
-            if case.startDate.month == self.current_month and case.startDate.year == self.current_year:
-                case_day = case.startDate.day
-                if case_day not in case_map:
-                    case_map[case_day] = []
-                case_map[case_day].append({
-                    'id': f"ID: {case.id}",
-                    'priority': case.priority
-                })
-
         for i in range(42):
             day = start_day + timedelta(days=i)
 
             case_texts = []
             if day.month == self.current_month and day.year == self.current_year:
-                day_cases = case_map.get(day.day, [])
-                for case_info in day_cases:
-                    color = self.get_priority_color(case_info['priority'])
+                day_counts = self.day_counts.get(day.day, {})
+                for priority in sorted(day_counts, key=self.priority_rank):
+                    color = self.get_priority_color(priority)
                     case_texts.append(
                         ft.Text(
-                            case_info['id'],
+                            f"{day_counts[priority]} {priority or '-'}",
                             color=color,
                             size=13,
                             weight="bold",
@@ -283,12 +276,8 @@ class Schedule:
         self.current_month = month_mapping.get(month, self.current_month)
         self.current_year = int(year)
 
-        # Fetch all cases for the selected month and year
-        self.cases = self.calendar_controller.get_all_cases(
-            self.current_month, self.current_year)
-
-        # Apply the current filters to the newly fetched cases
-        self.apply_filter()
+        # Load the selected month with the current filters
+        self.load_cases()
 
         self.render(self.page)
 
@@ -299,25 +288,34 @@ class Schedule:
         self.selected_victim = victim
         self.selected_suspect = suspect
 
-        # Apply the filter to the cases
-        self.apply_filter()
+        # Reload the month with the new filters
+        self.load_cases()
 
         # Re-render the page with the updated filter values
         self.render(self.page)
 
-    def apply_filter(self):
-        """Applies the selected filters to the cases and stores the filtered cases."""
-        self.filtered_cases = [
-            case for case in self.cases
-            if (
-                # Filter by priority
-                (self.current_priority == "Semua" or case.priority == self.current_priority) and
-                # Filter by victim
-                (self.selected_victim == "No Victims" or any(victim.name == self.selected_victim for victim in case.victims)) and
-                (self.selected_suspect == "No Suspects" or any(suspect.name ==
-                                                               self.selected_suspect for suspect in case.suspects))  # Filter by suspect
-            )
-        ]
+    @instrumentation.action("Schedule.load_cases")
+    def load_cases(self):
+        """Loads per-day case counts for the current month, filtered in SQL."""
+        filters = {
+            "priority": None if self.current_priority == "Semua" else self.current_priority,
+            "victim_id": None if self.selected_victim == "No Victims" else int(
+                self.selected_victim),
+            "suspect_id": None if self.selected_suspect == "No Suspects" else int(
+                self.selected_suspect),
+        }
+        self.day_counts = self.calendar_controller.get_daily_counts(
+            self.current_month, self.current_year, **filters)
+
+        # Warm the neighbouring months so browsing to them is instant
+        self.calendar_controller.prefetch_adjacent(
+            self.current_month, self.current_year, **filters)
+
+    @staticmethod
+    def priority_rank(priority):
+        """Sort key listing the most urgent priority first."""
+        order = ["Tinggi", "Sedang", "Rendah"]
+        return order.index(priority) if priority in order else len(order)
 
     def get_priority_color(self, priority):
         """Returns color based on priority."""
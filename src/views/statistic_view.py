@@ -1,6 +1,10 @@
 import flet as ft
 from src.routes.destinations import destinations
-from src.controllers.case_controller import CaseController
+from src.models import instrumentation
+from src.models.session_manager import session_manager
+from src.controllers.statistics import (
+    AVERAGES, BY_PRIORITY, BY_PROGRESS, PER_MONTH, TOP_SUSPECTS, TOP_VICTIMS, WORKLOAD,
+    StatisticsService)
 
 
 def on_navigation_change(page: ft.Page, selected_index: int):
@@ -16,62 +20,89 @@ def on_navigation_change(page: ft.Page, selected_index: int):
             page, e.control.selected_index),
     )
 
-    if selected_index == 0:
-        from src.views.case_view import CaseView
-        CaseView().render(page)
-    elif selected_index == 1:
-        from src.views.suspect_view import SuspectView
-        SuspectView().render(page)
-    elif selected_index == 2:
-        from src.views.victim_view import VictimView
-        VictimView().render(page)
-    elif selected_index == 3:
-        from src.views.schedule_view import Schedule
-        Schedule().render(page)
-    elif selected_index == 4:
-        Statistic().render(page)
-    else:
-        page.controls.clear()
-        page.add(
-            ft.Row(
-                [
-                    rail,
-                    ft.VerticalDivider(width=1),
-                    ft.Container(
-                        content=ft.Text("On Progress", size=24),
-                        padding=10,
-                        alignment=ft.alignment.center,
-                    ),
-                ],
-                expand=True,
+    # Each navigation is a new user action with a fresh session for this page
+    session_manager.begin_action(page.session_id)
+    with session_manager.scope(page.session_id):
+        if selected_index == 0:
+            from src.views.case_view import CaseView
+            CaseView().render(page)
+        elif selected_index == 1:
+            from src.views.suspect_view import SuspectView
+            SuspectView().render(page)
+        elif selected_index == 2:
+            from src.views.victim_view import VictimView
+            VictimView().render(page)
+        elif selected_index == 3:
+            from src.views.schedule_view import Schedule
+            Schedule().render(page)
+        elif selected_index == 4:
+            Statistic().render(page)
+        else:
+            page.controls.clear()
+            page.add(
+                ft.Row(
+                    [
+                        rail,
+                        ft.VerticalDivider(width=1),
+                        ft.Container(
+                            content=ft.Text("On Progress", size=24),
+                            padding=10,
+                            alignment=ft.alignment.center,
+                        ),
+                    ],
+                    expand=True,
+                )
             )
-        )
-        page.update()
+            page.update()
+
+
+# Labels of the progress codes used by the case forms
+PROGRESS_LABELS = {0: "On-going", 1: "Solved", 2: "Unsolved"}
+
+# Tab title -> panels it shows; only the visible tab's panels are requested
+TABS = [
+    ("People", (TOP_VICTIMS, TOP_SUSPECTS)),
+    ("Cases", (BY_PROGRESS, BY_PRIORITY, AVERAGES)),
+    ("Timeline", (PER_MONTH,)),
+    ("Detectives", (WORKLOAD,)),
+]
 
 
 class Statistic:
     def __init__(self):
-        self.case_controller = CaseController()
+        self.statistics = StatisticsService(session_manager.get())
+        self.page = None
+        self.body = ft.Column(
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            scroll=ft.ScrollMode.AUTO,
+            expand=True,
+        )
 
     def _create_bar_chart(self, top_entities, title, color):
         """Creates a bar chart for the given entities."""
-        if not top_entities:
+        return self._bar_chart(
+            [(entity.name, entity.cases_count) for entity in top_entities],
+            f"Number of {title} Cases", color)
+
+    def _bar_chart(self, items, axis_title, color):
+        """Creates a bar chart from (label, value) pairs."""
+        if not items:
             return ft.Text("No data available", size=16)
 
         bar_groups = []
         bottom_axis_labels = []
 
-        for i, entity in enumerate(top_entities):
+        for i, (label, value) in enumerate(items):
             bar_groups.append(
                 ft.BarChartGroup(
                     x=i,
                     bar_rods=[
                         ft.BarChartRod(
                             from_y=0,
-                            to_y=entity.cases_count,
-                            width=40,
+                            to_y=value,
+                            width=max(min(40, 600 // len(items) - 4), 4),
                             color=color,
-                            tooltip=f"{entity.name}: {entity.cases_count} cases",
+                            tooltip=f"{label}: {value}",
                             border_radius=0,
                         ),
                     ],
@@ -81,22 +112,21 @@ class Statistic:
                 ft.ChartAxisLabel(
                     value=i,
                     label=ft.Container(
-                        ft.Text(entity.name, size=8,
+                        ft.Text(label, size=8,
                                 text_align=ft.TextAlign.CENTER),
                         padding=2
                     )
                 )
             )
 
-        max_y = max([e.cases_count for e in top_entities]) + \
-            5 if top_entities else 10
+        max_y = max(value for _label, value in items) + 5
 
         return ft.BarChart(
             bar_groups=bar_groups,
             border=ft.border.all(1, ft.Colors.GREY_400),
             left_axis=ft.ChartAxis(
                 labels_size=30,
-                title=ft.Text(f"Number of {title} Cases", size=10),
+                title=ft.Text(axis_title, size=10),
                 title_size=30
             ),
             bottom_axis=ft.ChartAxis(
@@ -115,7 +145,71 @@ class Statistic:
             width=600,
         )
 
+    def _people_panels(self, stats):
+        return [
+            ft.Text("Top 10 Victims by Case Involvement", size=14),
+            self._create_bar_chart(stats[TOP_VICTIMS], "Victims", ft.Colors.BLUE),
+            ft.Text("Top 10 Suspects by Case Involvement", size=14),
+            self._create_bar_chart(stats[TOP_SUSPECTS], "Suspects", ft.Colors.RED),
+        ]
+
+    def _case_panels(self, stats):
+        averages = stats[AVERAGES]
+        by_progress = [(PROGRESS_LABELS.get(progress, str(progress)), count)
+                       for progress, count in sorted(stats[BY_PROGRESS].items())]
+        by_priority = [(priority or "-", count)
+                       for priority, count in sorted(stats[BY_PRIORITY].items(),
+                                                     key=lambda item: -item[1])]
+        return [
+            ft.Text(f"{averages['cases']} cases, "
+                    f"{averages['suspects_per_case']:.2f} suspects and "
+                    f"{averages['victims_per_case']:.2f} victims per case on average",
+                    size=14),
+            ft.Text("Cases by Progress", size=14),
+            self._bar_chart(by_progress, "Cases", ft.Colors.GREEN),
+            ft.Text("Cases by Priority", size=14),
+            self._bar_chart(by_priority, "Cases", ft.Colors.ORANGE),
+        ]
+
+    def _timeline_panels(self, stats):
+        # Show the most recent two years so the bars stay readable
+        months = stats[PER_MONTH][-24:]
+        return [
+            ft.Text("Cases Opened per Month", size=14),
+            self._bar_chart([(f"{month:02d}/{year}", count) for (year, month), count in months],
+                            "Cases", ft.Colors.PURPLE),
+        ]
+
+    def _detective_panels(self, stats):
+        workload = stats[WORKLOAD]
+        return [
+            ft.Text("Detective Workload (total / open cases)", size=14),
+            self._bar_chart([(row["detective"] or "-", row["cases"]) for row in workload[:15]],
+                            "Cases", ft.Colors.TEAL),
+            ft.Column([
+                ft.Text(f"{row['detective'] or '-'}: {row['cases']} cases, {row['open']} open",
+                        size=12)
+                for row in workload
+            ]),
+        ]
+
+    def show_tab(self, index):
+        """Fetches only the panels of the selected tab and renders them."""
+        title, panels = TABS[index]
+        stats = self.statistics.get(*panels)
+        builders = {
+            "People": self._people_panels,
+            "Cases": self._case_panels,
+            "Timeline": self._timeline_panels,
+            "Detectives": self._detective_panels,
+        }
+        self.body.controls = builders[title](stats)
+        if self.page is not None:
+            self.page.update()
+
+    @instrumentation.action("Statistic.render")
     def render(self, page: ft.Page):
+        self.page = page
         rail = ft.NavigationRail(
             selected_index=4,
             label_type=ft.NavigationRailLabelType.ALL,
@@ -127,19 +221,10 @@ class Statistic:
                 page, e.control.selected_index),
         )
 
-        top_victims = self.case_controller.get_top_ten_victims()
-        top_suspects = self.case_controller.get_top_ten_suspects()
-
-        victims_chart = self._create_bar_chart(
-            top_victims,
-            "Victims",
-            ft.Colors.BLUE
-        )
-
-        suspects_chart = self._create_bar_chart(
-            top_suspects,
-            "Suspects",
-            ft.Colors.RED
+        tabs = ft.Tabs(
+            selected_index=0,
+            tabs=[ft.Tab(text=title) for title, _panels in TABS],
+            on_change=lambda e: self.show_tab(e.control.selected_index),
         )
 
         page.controls.clear()
@@ -154,12 +239,8 @@ class Statistic:
                                 [
                                     ft.Text("Case Statistics", size=20,
                                             weight=ft.FontWeight.BOLD),
-                                    ft.Text(
-                                        "Top 10 Victims by Case Involvement", size=14),
-                                    victims_chart,
-                                    ft.Text(
-                                        "Top 10 Suspects by Case Involvement", size=14),
-                                    suspects_chart
+                                    tabs,
+                                    self.body,
                                 ],
                                 horizontal_alignment=ft.CrossAxisAlignment.CENTER,
                                 expand=True,
@@ -174,4 +255,4 @@ class Statistic:
                 expand=True
             )
         )
-        page.update()
+        self.show_tab(0)
@@ -1,12 +1,14 @@
 
 import os
-import shutil
-import uuid
-from datetime import datetime
 
 import flet as ft
 from src.controllers.suspect_controller import SuspectController
 from src.routes.destinations import destinations
+from src.media import thumbnails
+from src.views.people_search import build_other_matches, search_people_by_kind
+from src.views.picture_upload import PictureUploadField
+from src.models import instrumentation
+from src.models.session_manager import session_manager
 
 
 def on_navigation_change(page: ft.Page, selected_index: int):
@@ -22,37 +24,40 @@ def on_navigation_change(page: ft.Page, selected_index: int):
         on_change=lambda e: on_navigation_change(
             page, e.control.selected_index),
     )
-    if selected_index == 0:
-        from src.views.case_view import CaseView
-        CaseView().render(page)
-    elif selected_index == 1:
-        SuspectView().render(page)
-    elif selected_index == 2:
-        from src.views.victim_view import VictimView
-        VictimView().render(page)
-    elif selected_index == 3:
-        from src.views.schedule_view import Schedule
-        Schedule().render(page)
-    elif selected_index == 4:
-        from src.views.statistic_view import Statistic
-        Statistic().render(page)
-    else:
-        page.controls.clear()
-        page.add(
-            ft.Row(
-                [
-                    rail,
-                    ft.VerticalDivider(width=1),
-                    ft.Container(
-                        content=ft.Text("On Progress", size=24),
-                        padding=10,
-                        alignment=ft.alignment.center,
-                    ),
-                ],
-                expand=True,
+    # Each navigation is a new user action with a fresh session for this page
+    session_manager.begin_action(page.session_id)
+    with session_manager.scope(page.session_id):
+        if selected_index == 0:
+            from src.views.case_view import CaseView
+            CaseView().render(page)
+        elif selected_index == 1:
+            SuspectView().render(page)
+        elif selected_index == 2:
+            from src.views.victim_view import VictimView
+            VictimView().render(page)
+        elif selected_index == 3:
+            from src.views.schedule_view import Schedule
+            Schedule().render(page)
+        elif selected_index == 4:
+            from src.views.statistic_view import Statistic
+            Statistic().render(page)
+        else:
+            page.controls.clear()
+            page.add(
+                ft.Row(
+                    [
+                        rail,
+                        ft.VerticalDivider(width=1),
+                        ft.Container(
+                            content=ft.Text("On Progress", size=24),
+                            padding=10,
+                            alignment=ft.alignment.center,
+                        ),
+                    ],
+                    expand=True,
+                )
             )
-        )
-        page.update()
+            page.update()
 
 
 class SuspectView:
@@ -62,14 +67,21 @@ class SuspectView:
         self.page_number = 1
         self.per_page = 12
         self.total_pages = 1  # Initialize total pages
+        # Last suspect ID before each visited page, used to seek to it
+        self.page_cursors = {1: None}
 
     def fetch_suspects(self):
         """Fetch suspects for the current page."""
-        suspects = self.controller.get_all_suspects()
-        self.total_pages = (len(suspects) + self.per_page - 1) // self.per_page
-        start_idx = (self.page_number - 1) * self.per_page
-        end_idx = start_idx + self.per_page
-        return suspects[start_idx:end_idx]
+        pagination_data = self.controller.get_suspects_page(
+            page=self.page_number,
+            per_page=self.per_page,
+            after_id=self.page_cursors.get(self.page_number),
+        )
+        self.total_pages = pagination_data["total_pages"]
+        suspects = pagination_data["suspects"]
+        if suspects:
+            self.page_cursors[self.page_number + 1] = suspects[-1].id
+        return suspects
 
     def build_suspects_component(self, suspects):
         """Build the suspects component with the given list of suspects."""
@@ -90,7 +102,7 @@ class SuspectView:
                                 # Picture of the suspect
                                 ft.Container(
                                     content=ft.Image(
-                                        src=suspect.picture_path,  # Assuming the path is valid
+                                        src=thumbnails.thumbnail_for(suspect.picture_path, thumbnails.SMALL),
                                         width=80,
                                         height=80,
                                         fit=ft.ImageFit.COVER,
@@ -202,6 +214,7 @@ class SuspectView:
             self.page_number += 1
             self.render(self.page)
 
+    @instrumentation.action("SuspectView.render")
     def render(self, page: ft.Page):
         """Renders the suspect management view."""
         self.page = page
@@ -234,8 +247,9 @@ class SuspectView:
 
             search_results.controls.clear()
 
-            # Perform search via the controller
-            results = self.controller.search_suspects(name, nik)
+            # One query finds suspects and victims alike
+            found = search_people_by_kind(name, nik)
+            results = found["suspect"]
 
             if results:
                 search_results.controls.append(
@@ -243,6 +257,8 @@ class SuspectView:
             else:
                 search_results.controls.append(
                     ft.Text("No suspects found matching your criteria."))
+            search_results.controls.append(
+                build_other_matches(page, "victim", found["victim"]))
             # Update page with search results
             page.update()
 
@@ -293,38 +309,9 @@ class SuspectView:
         self.page.update()
 
     def render_add_suspect(self):
-        """Renders the Add Suspect form with unique filenames for uploaded pictures."""
-        # Directory to upload files
-        upload_directory = "img/"
-
-        # Ensure the upload directory exists
-        if not os.path.exists(upload_directory):
-            os.makedirs(upload_directory)
-
-        # File picker logic
-        def pick_file_result(e: ft.FilePickerResultEvent):
-            """Handles the file picker result."""
-            if e.files:
-                # Use the first selected file
-                file = e.files[0]
-
-                # Generate a unique filename
-                timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-                unique_filename = f"{timestamp}_{uuid.uuid4().hex}_{file.name}"
-                destination_path = os.path.join(
-                    upload_directory, unique_filename)
-
-                # Copy the file to the upload directory
-                shutil.copy(file.path, destination_path)
-
-                # Update the picture path field
-                picture_path_field.value = destination_path
-                picture_path_field.update()
-            else:
-                picture_path_field.value = "No file selected"
-                picture_path_field.update()
-
-        pick_file_dialog = ft.FilePicker(on_result=pick_file_result)
+        """Renders the Add Suspect form; the picture is stored by content."""
+        # The picture is copied into the store off the UI thread
+        picture_upload = PictureUploadField()
 
         # Form submission logic
         def handle_form_submission(e):
@@ -336,9 +323,13 @@ class SuspectView:
                 self.page.update()
                 return
 
-            picture_path = picture_path_field.value.strip()
+            if picture_upload.busy:
+                picture_upload.path_field.error_text = "Wait for the picture to finish copying."
+                self.page.update()
+                return
+            picture_path = (picture_upload.value or "").strip()
             if not os.path.exists(picture_path):
-                picture_path_field.error_text = "Invalid picture path."
+                picture_upload.path_field.error_text = "Invalid picture path."
                 self.page.update()
                 return
 
@@ -375,9 +366,6 @@ class SuspectView:
 
         # Form fields
         nik_field = ft.TextField(label="NIK")
-        picture_path_field = ft.TextField(
-            label="Picture Path", read_only=True, hint_text="Select a picture"
-        )
         name_field = ft.TextField(label="Name")
         age_field = ft.TextField(
             label="Age", keyboard_type=ft.KeyboardType.NUMBER
@@ -391,22 +379,13 @@ class SuspectView:
         )
         note_field = ft.TextField(label="Note (Optional)", multiline=True)
 
-        # File picker button
-        file_picker_button = ft.ElevatedButton(
-            "Pick Picture",
-            icon=ft.Icons.IMAGE,
-            on_click=lambda _: pick_file_dialog.pick_files(
-                allow_multiple=False, allowed_extensions=["jpg", "jpeg", "png"]
-            )
-        )
-
         # Submit button
         submit_button = ft.ElevatedButton(
             text="Add Suspect", on_click=handle_form_submission
         )
 
         # Add file picker to page overlay
-        self.page.overlay.append(pick_file_dialog)
+        self.page.overlay.append(picture_upload.file_picker)
 
         def go_back(e):
             """Handles the back button click."""
@@ -419,10 +398,7 @@ class SuspectView:
                 content=ft.Column(
                     [
                         nik_field,
-                        ft.Row(
-                            [picture_path_field, file_picker_button],
-                            alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-                        ),
+                        picture_upload.control,
                         name_field,
                         age_field,
                         gender_dropdown,
@@ -446,6 +422,7 @@ class SuspectView:
         )
         self.page.update()
 
+    @instrumentation.action("SuspectView.render_suspect_detail")
     def render_suspect_detail(self, suspect_id):
         """Renders the details of a specific suspect by ID."""
         # Fetch the suspect by ID
@@ -484,7 +461,7 @@ class SuspectView:
                 ),
                 ft.Text(f"Note: {suspect.note or 'N/A'}", size=18),
                 ft.Image(
-                    src=suspect.picture_path,
+                    src=thumbnails.thumbnail_for(suspect.picture_path, thumbnails.LARGE),
                     width=300,
                     height=300,
                     fit=ft.ImageFit.CONTAIN,
@@ -551,9 +528,7 @@ class SuspectView:
 
         # Prepopulate fields with suspect data
         nik_field = ft.TextField(label="NIK", value=suspect.nik)
-        picture_path_field = ft.TextField(
-            label="Picture Path", value=suspect.picture_path, read_only=True
-        )
+        picture_upload = PictureUploadField(value=suspect.picture_path)
         name_field = ft.TextField(label="Name", value=suspect.name)
         age_field = ft.TextField(
             label="Age", value=str(suspect.age), keyboard_type=ft.KeyboardType.NUMBER
@@ -569,19 +544,6 @@ class SuspectView:
         note_field = ft.TextField(
             label="Note (Optional)", value=suspect.note, multiline=True)
 
-        def pick_file_result(e: ft.FilePickerResultEvent):
-            """Handle file picker result."""
-            if e.files:
-                file = e.files[0]
-                timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-                unique_filename = f"{timestamp}_{uuid.uuid4().hex}_{file.name}"
-                destination_path = os.path.join("img/", unique_filename)
-                shutil.copy(file.path, destination_path)
-                picture_path_field.value = destination_path
-                picture_path_field.update()
-
-        pick_file_dialog = ft.FilePicker(on_result=pick_file_result)
-
         def handle_update(e):
             """Handles the update process."""
             nik = nik_field.value.strip()
@@ -589,7 +551,7 @@ class SuspectView:
             age = age_field.value
             gender = gender_dropdown.value
             note = note_field.value.strip()
-            picture_path = picture_path_field.value.strip()
+            picture_path = (picture_upload.value or "").strip()
 
             if not nik or not name or not age or gender is None:
                 # Validate inputs and display errors
@@ -613,6 +575,11 @@ class SuspectView:
                 self.page.update()
                 return
 
+            if picture_upload.busy:
+                picture_upload.path_field.error_text = "Wait for the picture to finish copying."
+                self.page.update()
+                return
+
             # Update the suspect details
             self.controller.update_suspect(
                 suspect_id, nik=nik, picture_path=picture_path, name=name, age=age, gender=gender, note=note
@@ -620,7 +587,7 @@ class SuspectView:
             self.render(self.page)
 
         # Add file picker overlay
-        self.page.overlay.append(pick_file_dialog)
+        self.page.overlay.append(picture_upload.file_picker)
 
         def go_back(e):
             """Handles the back button click."""
@@ -633,11 +600,7 @@ class SuspectView:
                 content=ft.Column(
                     [
                         nik_field,
-                        ft.Row(
-                            [picture_path_field, ft.ElevatedButton(
-                                "Pick Picture", on_click=lambda _: pick_file_dialog.pick_files(allow_multiple=False))],
-                            alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-                        ),
+                        picture_upload.control,
                         name_field,
                         age_field,
                         gender_dropdown,
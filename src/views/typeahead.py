@@ -0,0 +1,101 @@
+# views/typeahead.py
+import threading
+
+import flet as ft
+
+from src.models.session_manager import session_manager
+
+# Seconds to wait after the last keystroke before querying
+DEBOUNCE_SECONDS = 0.3
+
+
+class TypeaheadPicker:
+    """A text field that queries matching options as the user types.
+
+    ``search`` takes the typed term (or None) and returns ``(key, label)``
+    pairs; it runs on a timer thread once typing pauses, and results of
+    superseded searches are dropped. ``selected`` holds the key picked last.
+    Wrap database searches in isolated_search(), never the page's session.
+    """
+
+    def __init__(self, label, search, on_select=None, width=400):
+        self.search = search
+        self.on_select = on_select
+        self.selected = None
+        self.timer = None
+        self.generation = 0
+        self.lock = threading.Lock()
+
+        self.field = ft.TextField(
+            label=label, width=width, on_change=self.handle_change)
+        self.status = ft.Text("", size=12, color="#9AA0A6")
+        self.results = ft.Column(spacing=0, width=width, tight=True)
+        self.control = ft.Column([self.field, self.status, self.results])
+
+    def load(self, term=None):
+        """Runs a search immediately, e.g. to show the first options on open."""
+        with self.lock:
+            self.generation += 1
+            generation = self.generation
+        self._run(term, generation, update=False)
+
+    def handle_change(self, e):
+        self.selected = None
+        term = e.control.value.strip() or None
+        with self.lock:
+            self.generation += 1
+            generation = self.generation
+            if self.timer is not None:
+                self.timer.cancel()
+            self.timer = threading.Timer(
+                DEBOUNCE_SECONDS, self._run, args=(term, generation))
+            self.timer.daemon = True
+            self.timer.start()
+
+    def cancel(self):
+        """Stops a pending search, e.g. when leaving the screen."""
+        with self.lock:
+            self.generation += 1
+            if self.timer is not None:
+                self.timer.cancel()
+
+    def _run(self, term, generation, update=True):
+        options = self.search(term)
+        with self.lock:
+            if generation != self.generation:
+                # The user kept typing; a newer search will fill the list
+                return
+        self.results.controls = [
+            ft.ListTile(
+                title=ft.Text(label),
+                dense=True,
+                on_click=lambda e, key=key, label=label: self.pick(key, label),
+            )
+            for key, label in options
+        ]
+        self.status.value = "" if options else "No matches"
+        # Skip the refresh if the screen was left while the query ran
+        if update and self.control.page is not None:
+            self.control.update()
+
+    def pick(self, key, label):
+        """Selects an option and collapses the result list."""
+        self.selected = key
+        self.field.value = label
+        self.results.controls = []
+        self.status.value = ""
+        self.control.update()
+        if self.on_select:
+            self.on_select(key)
+
+
+def isolated_search(query):
+    """Wraps ``query(db, term)`` so every search runs on a session of its own.
+
+    The page's session belongs to the UI thread. ``query`` must return plain
+    ``(key, label)`` pairs, built before its session closes.
+    """
+    def search(term):
+        with session_manager.isolated() as db:
+            return query(db, term)
+    return search
@@ -1,10 +1,19 @@
 import os
-import shutil
-import uuid
-from datetime import datetime
+import threading
+from collections import deque
 import flet as ft
 from src.controllers.victim_controller import VictimController
 from src.routes.destinations import destinations
+from src.media import thumbnails
+from src.views.people_search import build_other_matches, search_people_by_kind
+from src.views.picture_upload import PictureUploadField
+from src.models import instrumentation
+from src.models.session_manager import session_manager
+
+# Victim batches kept on screen; batches scrolled far away are evicted
+MAX_RENDERED_BATCHES = 4
+# Distance in pixels from either end of the list that triggers loading more
+SCROLL_THRESHOLD = 300
 
 
 def on_navigation_change(page: ft.Page, selected_index: int):
@@ -20,54 +29,127 @@ def on_navigation_change(page: ft.Page, selected_index: int):
         on_change=lambda e: on_navigation_change(
             page, e.control.selected_index),
     )
-    if selected_index == 0:
-        from src.views.case_view import CaseView
-        CaseView().render(page)
-    elif selected_index == 1:
-        from src.views.suspect_view import SuspectView
-        SuspectView().render(page)
-    elif selected_index == 2:
-        VictimView().render(page)
-    elif selected_index == 3:
-        from src.views.schedule_view import Schedule
-        Schedule().render(page)
-    elif selected_index == 4:
-        from src.views.statistic_view import Statistic
-        Statistic().render(page)
-    else:
-        page.controls.clear()
-        page.add(
-            ft.Row(
-                [
-                    rail,
-                    ft.VerticalDivider(width=1),
-                    ft.Container(
-                        content=ft.Text("On Progress", size=24),
-                        padding=10,
-                        alignment=ft.alignment.center,
-                    ),
-                ],
-                expand=True,
+    # Each navigation is a new user action with a fresh session for this page
+    session_manager.begin_action(page.session_id)
+    with session_manager.scope(page.session_id):
+        if selected_index == 0:
+            from src.views.case_view import CaseView
+            CaseView().render(page)
+        elif selected_index == 1:
+            from src.views.suspect_view import SuspectView
+            SuspectView().render(page)
+        elif selected_index == 2:
+            VictimView().render(page)
+        elif selected_index == 3:
+            from src.views.schedule_view import Schedule
+            Schedule().render(page)
+        elif selected_index == 4:
+            from src.views.statistic_view import Statistic
+            Statistic().render(page)
+        else:
+            page.controls.clear()
+            page.add(
+                ft.Row(
+                    [
+                        rail,
+                        ft.VerticalDivider(width=1),
+                        ft.Container(
+                            content=ft.Text("On Progress", size=24),
+                            padding=10,
+                            alignment=ft.alignment.center,
+                        ),
+                    ],
+                    expand=True,
+                )
             )
-        )
-        page.update()
+            page.update()
 
 
 class VictimView:
     def __init__(self):
         self.controller = VictimController()
         self.page = None
-        self.page_number = 1
-        self.per_page = 12
-        self.total_pages = 1  # Initialize total pages
-
-    def fetch_victims(self):
-        """Fetches victims for the current page."""
-        victims = self.controller.get_all_victims()
-        self.total_pages = (len(victims) + self.per_page - 1) // self.per_page
-        start_idx = (self.page_number - 1) * self.per_page
-        end_idx = start_idx + self.per_page
-        return victims[start_idx:end_idx]
+        self.list_view = None
+        # Rendered batches as (first_id, last_id, control), oldest first
+        self.batches = deque()
+        self.evicted_before = 0  # Batches dropped from the top of the list
+        self.stream = None
+        self.exhausted = False
+        self.searching = False
+        self.loading = threading.Lock()
+
+    def start_stream(self, after_id=None):
+        """(Re)starts streaming victim batches after the given ID."""
+        self.close_stream()
+        self.stream = self.controller.iter_victim_batches(after_id=after_id)
+        self.exhausted = False
+
+    def close_stream(self):
+        """Releases the database cursor of the current stream."""
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+    def navigate(self, selected_index):
+        """Leaves the list for another destination, releasing the stream first."""
+        # begin_action closes the page session, so no cursor may be left on it
+        self.close_stream()
+        on_navigation_change(self.page, selected_index)
+
+    @instrumentation.action("VictimView.load_next_batch")
+    def load_next_batch(self):
+        """Appends the next streamed batch, evicting the oldest one when the window is full."""
+        if self.exhausted or self.stream is None:
+            return False
+        victims = next(self.stream, None)
+        if not victims:
+            self.exhausted = True
+            return False
+
+        self.batches.append(
+            (victims[0].id, victims[-1].id, self.build_victims_component(victims)))
+        self.list_view.controls.append(self.batches[-1][2])
+        if len(self.batches) > MAX_RENDERED_BATCHES:
+            self.batches.popleft()
+            self.list_view.controls.pop(0)
+            self.evicted_before += 1
+        return True
+
+    @instrumentation.action("VictimView.load_previous_batch")
+    def load_previous_batch(self):
+        """Re-fetches the batch above the window, evicting the newest one."""
+        if not self.evicted_before or not self.batches:
+            return False
+        victims = self.controller.get_victims_before(self.batches[0][0])
+        if not victims:
+            self.evicted_before = 0
+            return False
+
+        self.batches.appendleft(
+            (victims[0].id, victims[-1].id, self.build_victims_component(victims)))
+        self.list_view.controls.insert(0, self.batches[0][2])
+        self.evicted_before -= 1
+        if len(self.batches) > MAX_RENDERED_BATCHES:
+            self.batches.pop()
+            self.list_view.controls.pop()
+            # The stream ran ahead of the window, so resume after the new end
+            self.start_stream(after_id=self.batches[-1][1])
+        return True
+
+    def handle_scroll(self, e: ft.OnScrollEvent):
+        """Loads more victims when the user nears either end of the list."""
+        # Scroll events that arrive while a batch is loading are dropped
+        if self.searching or self.loading.locked():
+            return
+        with self.loading:
+            if e.pixels >= e.max_scroll_extent - SCROLL_THRESHOLD:
+                changed = self.load_next_batch()
+            elif e.pixels <= e.min_scroll_extent + SCROLL_THRESHOLD:
+                changed = self.load_previous_batch()
+            else:
+                changed = False
+            if changed:
+                self.list_view.update()
 
     def build_victims_component(self, victims):
         """Builds the victims component with the given list of victims."""
@@ -88,7 +170,7 @@ class VictimView:
                                 # Picture of the victim
                                 ft.Container(
                                     content=ft.Image(
-                                        src=victim.picture_path,  # Assuming the path is valid
+                                        src=thumbnails.thumbnail_for(victim.picture_path, thumbnails.SMALL),
                                         width=80,
                                         height=80,
                                         fit=ft.ImageFit.COVER,
@@ -161,41 +243,10 @@ class VictimView:
 
         return ft.ResponsiveRow(temp_row, expand=False)
 
-    def build_pagination_controls(self):
-        """Build pagination controls."""
-        return ft.Row(
-            [
-                ft.ElevatedButton(
-                    "Previous",
-                    on_click=self.previous_page,
-                    disabled=self.page_number <= 1,
-                ),
-                ft.Text(f"Page {self.page_number} of {self.total_pages}"),
-                ft.ElevatedButton(
-                    "Next",
-                    on_click=self.next_page,
-                    disabled=self.page_number >= self.total_pages,
-                ),
-            ],
-            alignment=ft.MainAxisAlignment.CENTER,
-        )
-
-    def previous_page(self, _e):
-        """Handles the Previous button click."""
-        if self.page_number > 1:
-            self.page_number -= 1
-            self.render(self.page)
-
-    def next_page(self, _e):
-        """Handles the Next button click."""
-        if self.page_number < self.total_pages:
-            self.page_number += 1
-            self.render(self.page)
-
+    @instrumentation.action("VictimView.render")
     def render(self, page: ft.Page):
         """Renders the victim management view."""
         self.page = page
-        victims = self.fetch_victims()
 
         rail = ft.NavigationRail(
             selected_index=2,
@@ -204,12 +255,23 @@ class VictimView:
             min_extended_width=400,
             group_alignment=-0.9,
             destinations=destinations,
-            on_change=lambda e: on_navigation_change(
-                page, e.control.selected_index),
+            on_change=lambda e: self.navigate(e.control.selected_index),
         )
 
-        search_results = ft.Column(
-            [self.build_victims_component(victims)], expand=True)
+        # Lazily populated list; batches stream in as the user scrolls
+        search_results = ft.ListView(
+            expand=True,
+            on_scroll=self.handle_scroll,
+            on_scroll_interval=50,
+        )
+        self.list_view = search_results
+        self.batches.clear()
+        self.evicted_before = 0
+        self.searching = False
+        self.start_stream()
+        # Two batches so the list is tall enough to scroll
+        self.load_next_batch()
+        self.load_next_batch()
 
         def perform_search(e):
             name = name_field.value.strip()
@@ -222,10 +284,13 @@ class VictimView:
                 page.update()
                 return
 
+            self.searching = True
+            self.close_stream()
             search_results.controls.clear()
 
-            # Perform search via the controller
-            results = self.controller.search_victims(name, nik)
+            # One query finds suspects and victims alike
+            found = search_people_by_kind(name, nik)
+            results = found["victim"]
 
             if results:
                 search_results.controls.append(
@@ -233,6 +298,8 @@ class VictimView:
             else:
                 search_results.controls.append(
                     ft.Text("No victims found matching your criteria."))
+            search_results.controls.append(
+                build_other_matches(page, "suspect", found["suspect"]))
             # Update page with search results
             page.update()
 
@@ -264,7 +331,6 @@ class VictimView:
                                 ft.Row([name_field, nik_field, search_button,
                                        clear_button], alignment=ft.MainAxisAlignment.START),
                                 search_results,
-                                self.build_pagination_controls(),
                             ],
                             expand=True,
                         ),
@@ -283,38 +349,9 @@ class VictimView:
         self.page.update()
 
     def render_add_victim(self):
-        """Renders the Add Victim form with unique filenames for uploaded pictures."""
-        # Directory to upload files
-        upload_directory = "img/"
-
-        # Ensure the upload directory exists
-        if not os.path.exists(upload_directory):
-            os.makedirs(upload_directory)
-
-        # File picker logic
-        def pick_file_result(e: ft.FilePickerResultEvent):
-            """Handles the file picker result."""
-            if e.files:
-                # Use the first selected file
-                file = e.files[0]
-
-                # Generate a unique filename
-                timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-                unique_filename = f"{timestamp}_{uuid.uuid4().hex}_{file.name}"
-                destination_path = os.path.join(
-                    upload_directory, unique_filename)
-
-                # Copy the file to the upload directory
-                shutil.copy(file.path, destination_path)
-
-                # Update the picture path field
-                picture_path_field.value = destination_path
-                picture_path_field.update()
-            else:
-                picture_path_field.value = "No file selected"
-                picture_path_field.update()
-
-        pick_file_dialog = ft.FilePicker(on_result=pick_file_result)
+        """Renders the Add Victim form; the picture is stored by content."""
+        # The picture is copied into the store off the UI thread
+        picture_upload = PictureUploadField()
 
         # Form submission logic
         def handle_form_submission(e):
@@ -326,9 +363,13 @@ class VictimView:
                 self.page.update()
                 return
 
-            picture_path = picture_path_field.value.strip()
+            if picture_upload.busy:
+                picture_upload.path_field.error_text = "Wait for the picture to finish copying."
+                self.page.update()
+                return
+            picture_path = (picture_upload.value or "").strip()
             if not os.path.exists(picture_path):
-                picture_path_field.error_text = "Invalid picture path."
+                picture_upload.path_field.error_text = "Invalid picture path."
                 self.page.update()
                 return
 
@@ -354,6 +395,7 @@ class VictimView:
                 return
 
             # Add the victim via the controller
+            self.close_stream()
             self.controller.add_victim(
                 nik, picture_path, name, age, forensic_result)
 
@@ -362,31 +404,19 @@ class VictimView:
 
         # Form fields
         nik_field = ft.TextField(label="NIK")
-        picture_path_field = ft.TextField(
-            label="Picture Path", read_only=True, hint_text="Select a picture"
-        )
         name_field = ft.TextField(label="Name")
         age_field = ft.TextField(
             label="Age", keyboard_type=ft.KeyboardType.NUMBER
         )
         forensic_result_field = ft.TextField(label="Forensic Result")
 
-        # File picker button
-        file_picker_button = ft.ElevatedButton(
-            "Pick Picture",
-            icon=ft.Icons.IMAGE,
-            on_click=lambda _: pick_file_dialog.pick_files(
-                allow_multiple=False, allowed_extensions=["jpg", "jpeg", "png"]
-            )
-        )
-
         # Submit button
         submit_button = ft.ElevatedButton(
             text="Add Victim", on_click=handle_form_submission
         )
 
         # Add file picker to page overlay
-        self.page.overlay.append(pick_file_dialog)
+        self.page.overlay.append(picture_upload.file_picker)
 
         def go_back(e):
             """Handles the back button click."""
@@ -399,10 +429,7 @@ class VictimView:
                 content=ft.Column(
                     [
                         nik_field,
-                        ft.Row(
-                            [picture_path_field, file_picker_button],
-                            alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-                        ),
+                        picture_upload.control,
                         name_field,
                         age_field,
                         forensic_result_field,
@@ -425,6 +452,7 @@ class VictimView:
         )
         self.page.update()
 
+    @instrumentation.action("VictimView.render_victim_detail")
     def render_victim_detail(self, victim_id):
         """Renders the details of a specific victim."""
         victim = self.controller.get_victim_by_id(victim_id)
@@ -455,7 +483,7 @@ class VictimView:
                 ft.Text(f"Cases: {', '.join([str(case.id) for case in victim.cases])}"
                         if victim.cases else "Cases: None", size=18),
                 ft.Image(
-                    src=victim.picture_path,
+                    src=thumbnails.thumbnail_for(victim.picture_path, thumbnails.LARGE),
                     width=300,
                     height=300,
                     fit=ft.ImageFit.CONTAIN,
@@ -522,9 +550,7 @@ class VictimView:
 
         # Prepopulate fields with victim data
         nik_field = ft.TextField(label="NIK", value=victim.nik)
-        picture_path_field = ft.TextField(
-            label="Picture Path", value=victim.picture_path, read_only=True
-        )
+        picture_upload = PictureUploadField(value=victim.picture_path)
         name_field = ft.TextField(label="Name", value=victim.name)
         age_field = ft.TextField(
             label="Age", value=str(victim.age), keyboard_type=ft.KeyboardType.NUMBER
@@ -532,26 +558,13 @@ class VictimView:
         forensic_result_field = ft.TextField(
             label="Forensic Result", value=victim.forensic_result)
 
-        def pick_file_result(e: ft.FilePickerResultEvent):
-            """Handle file picker result."""
-            if e.files:
-                file = e.files[0]
-                timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-                unique_filename = f"{timestamp}_{uuid.uuid4().hex}_{file.name}"
-                destination_path = os.path.join("img/", unique_filename)
-                shutil.copy(file.path, destination_path)
-                picture_path_field.value = destination_path
-                picture_path_field.update()
-
-        pick_file_dialog = ft.FilePicker(on_result=pick_file_result)
-
         def handle_update(e):
             """Handles the update process."""
             nik = nik_field.value.strip()
             name = name_field.value.strip()
             age = age_field.value
             forensic_result = forensic_result_field.value.strip()
-            picture_path = picture_path_field.value.strip()
+            picture_path = (picture_upload.value or "").strip()
 
             if not nik or not name or not age or not forensic_result:
                 # Validate inputs and display errors
@@ -575,14 +588,20 @@ class VictimView:
                 self.page.update()
                 return
 
+            if picture_upload.busy:
+                picture_upload.path_field.error_text = "Wait for the picture to finish copying."
+                self.page.update()
+                return
+
             # Update the victim details
+            self.close_stream()
             self.controller.update_victim(
                 victim_id, nik=nik, picture_path=picture_path, name=name, age=age, forensic_result=forensic_result
             )
             self.render(self.page)
 
         # Add file picker overlay
-        self.page.overlay.append(pick_file_dialog)
+        self.page.overlay.append(picture_upload.file_picker)
 
         def go_back(e):
             """Handles the back button click."""
@@ -595,11 +614,7 @@ class VictimView:
                 content=ft.Column(
                     [
                         nik_field,
-                        ft.Row(
-                            [picture_path_field, ft.ElevatedButton(
-                                "Pick Picture", on_click=lambda _: pick_file_dialog.pick_files(allow_multiple=False))],
-                            alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-                        ),
+                        picture_upload.control,
                         name_field,
                         age_field,
                         forensic_result_field,
@@ -627,6 +642,7 @@ class VictimView:
         """Deletes a victim after confirmation."""
         def confirm_delete(_):
             """Handles the confirmation dialog response."""
+            self.close_stream()
             self.controller.delete_victim(victim_id)
             self.render(self.page)
             self.page.close(dlg_modal)
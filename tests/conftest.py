@@ -1,4 +1,15 @@
-from src.models.init_database import init_db
+import pytest
+from sqlalchemy import event
+
+from tests import db_factory
+
+# Every test process works on its own copy of the seeded template database;
+# this has to happen before anything below imports src
+TEST_DATABASE = db_factory.use_worker_database()
+
+# pylint: disable=wrong-import-position
+from src.models.database import engine
+from src.models.init_database import load_models
 
 
 def pytest_configure(config):
@@ -7,5 +18,66 @@ def pytest_configure(config):
     This hook is called for every plugin and initial conftest
     file after command line options have been parsed.
     """
-    init_db()
-    print("Database initialized...")
+    config.addinivalue_line(
+        "markers",
+        "max_queries(n): fail the test when it issues more than n SQL statements",
+    )
+    load_models()
+    print(f"Database initialized at {TEST_DATABASE}")
+
+
+def pytest_unconfigure(config):
+    """Drops this process's test database."""
+    engine.dispose()
+    db_factory.remove_worker_database(TEST_DATABASE)
+
+
+class QueryRecorder:
+    """Records the SQL statements executed on an engine while installed."""
+
+    def __init__(self, bind):
+        self.bind = bind
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.bind, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.bind, "before_cursor_execute", self._record)
+
+    def __len__(self):
+        return len(self.statements)
+
+    def report(self):
+        return "\n".join(f"  {i}. {statement}"
+                         for i, statement in enumerate(self.statements, 1))
+
+
+@pytest.fixture
+def query_counter():
+    """Counts the statements the test runs against the app's engine."""
+    with QueryRecorder(engine) as recorder:
+        yield recorder
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """Enforces @pytest.mark.max_queries(n) on the test body."""
+    marker = item.get_closest_marker("max_queries")
+    if marker is None:
+        return (yield)
+
+    budget = marker.args[0]
+    with QueryRecorder(engine) as recorder:
+        result = yield
+    if len(recorder) > budget:
+        pytest.fail(
+            f"{item.name} ran {len(recorder)} SQL statements, "
+            f"budget is {budget}:\n{recorder.report()}",
+            pytrace=False,
+        )
+    return result
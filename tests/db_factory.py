@@ -0,0 +1,101 @@
+"""Builds a private SQLite database for each test process.
+
+The schema plus the seed snapshot is built once into a template file keyed by
+a fingerprint of the models and the snapshot; every process (one per xdist
+worker) then gets a byte copy of it. Nothing here imports ``src`` at module
+level, because the app's engine is created from DATABASE_URL on import.
+"""
+import glob
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT = os.path.join(TESTS_DIR, "fixtures", "seed.sql")
+MODELS_DIR = os.path.join(os.path.dirname(TESTS_DIR), "src", "models")
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "ketebak-tests")
+
+
+def worker_id():
+    """Returns the xdist worker name, or "main" when running without xdist."""
+    return os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+
+def fingerprint():
+    """Hashes the model sources and the snapshot so schema changes rebuild the template."""
+    digest = hashlib.sha1()
+    for path in sorted(glob.glob(os.path.join(MODELS_DIR, "*.py"))) + [SNAPSHOT]:
+        with open(path, "rb") as source:
+            digest.update(source.read())
+    return digest.hexdigest()[:12]
+
+
+def build_template(path):
+    """Creates the schema, loads the snapshot and applies migrations into ``path``."""
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import create_engine
+    from src.models.database import Base
+    from src.models.init_database import load_models
+    from src.models.migrations import run_migrations
+
+    load_models()
+    template = create_engine(f"sqlite:///{path}")
+    try:
+        Base.metadata.create_all(bind=template)
+        with open(SNAPSHOT, encoding="utf-8") as snapshot:
+            connection = sqlite3.connect(path)
+            try:
+                connection.executescript(snapshot.read())
+                connection.commit()
+            finally:
+                connection.close()
+        # Migrations run last, as on a real database that already holds data
+        run_migrations(template)
+    finally:
+        template.dispose()
+
+
+def template_path():
+    """Returns the template database, building it if this schema has none yet."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = os.path.join(CACHE_DIR, f"template-{fingerprint()}.sqlite")
+    if not os.path.exists(path):
+        # Build under a private name and rename, so concurrent workers never
+        # see a half-written template
+        fd, building = tempfile.mkstemp(suffix=".sqlite", dir=CACHE_DIR)
+        os.close(fd)
+        os.remove(building)
+        try:
+            build_template(building)
+            os.replace(building, path)
+            _remove_stale_templates(path)
+        finally:
+            if os.path.exists(building):
+                os.remove(building)
+    return path
+
+
+def _remove_stale_templates(current):
+    for stale in glob.glob(os.path.join(CACHE_DIR, "template-*.sqlite")):
+        if stale != current:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+def use_worker_database():
+    """Points DATABASE_URL at a fresh copy of the template and returns its path."""
+    directory = tempfile.mkdtemp(prefix=f"ketebak-{worker_id()}-")
+    path = os.path.join(directory, "test.sqlite")
+    # Set before the template build imports src, so the app engine never
+    # binds to anything else; it only connects once the copy is in place
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    shutil.copyfile(template_path(), path)
+    return path
+
+
+def remove_worker_database(path):
+    shutil.rmtree(os.path.dirname(path), ignore_errors=True)
@@ -0,0 +1,23 @@
+-- Compact snapshot loaded once into the test template database.
+-- Tests may rely on these rows existing (e.g. suspect 1 and victim 1).
+INSERT INTO cases (id, progress, "startDate", description, detective, priority) VALUES
+    (1, 0, '2024-12-02', 'Pencurian di gudang pelabuhan', 'Rina Wijaya', 'Tinggi'),
+    (2, 1, '2024-12-15', 'Penipuan investasi daring', 'Agus Salim', 'Sedang'),
+    (3, 2, '2024-11-20', 'Perampokan minimarket', 'Rina Wijaya', 'Rendah'),
+    (4, 0, '2024-10-05', 'Pembobolan rumah kosong', 'Dimas Putra', 'Sedang');
+
+INSERT INTO suspects (id, nik, picture_path, name, age, gender, note) VALUES
+    (1, '3201010101900001', 'img/placeholder.png', 'Joko Prasetyo', 34, 1, 'Terlihat di lokasi kejadian'),
+    (2, '3201010101900002', 'img/placeholder.png', 'Sari Lestari', 29, 0, 'Pemilik rekening penampung'),
+    (3, '3201010101900003', 'img/placeholder.png', 'Hendra Gunawan', 45, 1, 'Residivis');
+
+INSERT INTO victims (id, nik, picture_path, name, age, forensic_result) VALUES
+    (1, '3273010101800001', 'img/placeholder.png', 'Wati Kusuma', 52, 'Luka memar ringan'),
+    (2, '3273010101800002', 'img/placeholder.png', 'Yusuf Hakim', 38, 'Tidak ada luka fisik'),
+    (3, '3273010101800003', 'img/placeholder.png', 'Maya Sari', 27, 'Trauma psikologis');
+
+INSERT INTO case_suspects (case_id, suspect_id) VALUES
+    (1, 1), (1, 3), (2, 2), (3, 3);
+
+INSERT INTO case_victims (case_id, victim_id) VALUES
+    (1, 1), (2, 2), (3, 3), (4, 1);
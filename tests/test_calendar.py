@@ -1,5 +1,9 @@
+from datetime import date
 from src.models.case import Case
-from src.controllers.calendar_controller import CalendarController
+from src.controllers.calendar_controller import (
+    CalendarController, MonthCache, month_bounds, month_cache, month_prefetcher)
+from src.controllers.case_controller import CaseController
+from src.controllers.victim_controller import VictimController
 
 
 def test_get_all_cases():
@@ -9,3 +13,92 @@ def test_get_all_cases():
     cases = controller.get_all_cases(month=12, year=2024)
 
     assert all(isinstance(case, Case) for case in cases)  # Verify type
+    assert all(date(2024, 12, 1) <= case.startDate < date(2025, 1, 1)
+               for case in cases)
+
+
+def test_month_bounds():
+    """Test that month_bounds returns a half-open range, rolling over the year."""
+    assert month_bounds(2, 2024) == (date(2024, 2, 1), date(2024, 3, 1))
+    assert month_bounds(12, 2024) == (date(2024, 12, 1), date(2025, 1, 1))
+
+
+def test_get_daily_counts():
+    """Test that get_daily_counts aggregates cases per day and priority."""
+    controller = CalendarController()
+    before = controller.get_daily_counts(month=1, year=2023)
+
+    CaseController().add_case(progress=0, startDate=date(
+        2023, 1, 31), description="Calendar Case", detective="John Doe", priority="Tinggi")
+    CaseController().add_case(progress=0, startDate=date(
+        2023, 2, 1), description="Next Month", detective="John Doe", priority="Tinggi")
+
+    after = controller.get_daily_counts(month=1, year=2023)
+    assert after[31]["Tinggi"] == before.get(31, {}).get("Tinggi", 0) + 1
+    # The case on February 1st falls outside the half-open January range
+    assert sum(sum(c.values()) for c in after.values()) == \
+        sum(sum(c.values()) for c in before.values()) + 1
+
+
+def test_get_filtered_cases_matches_people_by_id():
+    """Test that victim/suspect filters match by ID, not by a shared name."""
+    case_controller = CaseController()
+    victims = VictimController()
+    first = victims.add_victim(nik="900001", picture_path="/path/to/picture",
+                               name="Same Name", age=30, forensic_result="-")
+    second = victims.add_victim(nik="900002", picture_path="/path/to/picture",
+                                name="Same Name", age=31, forensic_result="-")
+
+    case_controller.add_case(progress=0, startDate=date(
+        2022, 6, 10), description="Filter Case", detective="John Doe", priority="Sedang")
+    case = max(case_controller.get_all_cases(), key=lambda c: c.id)
+    case_controller.assign_victim_to_case(case.id, first.id)
+
+    controller = CalendarController()
+    matched = controller.get_filtered_cases(6, 2022, victim_id=first.id)
+    assert case.id in [c.id for c in matched]
+    assert case.id not in [
+        c.id for c in controller.get_filtered_cases(6, 2022, victim_id=second.id)]
+    assert case.id not in [
+        c.id for c in controller.get_filtered_cases(6, 2022, priority="Tinggi", victim_id=first.id)]
+
+    counts = controller.get_daily_counts(6, 2022, victim_id=first.id)
+    assert counts[10]["Sedang"] >= 1
+
+
+def test_daily_counts_are_cached_until_a_write():
+    """Test that month counts come from the cache until a case write invalidates it."""
+    controller = CalendarController()
+    first = controller.get_daily_counts(month=3, year=2021)
+    assert controller.get_daily_counts(month=3, year=2021) is first
+
+    CaseController().add_case(progress=0, startDate=date(
+        2021, 3, 5), description="Cache Case", detective="John Doe", priority="Rendah")
+    second = controller.get_daily_counts(month=3, year=2021)
+    assert second is not first
+    assert second[5]["Rendah"] == first.get(5, {}).get("Rendah", 0) + 1
+
+
+def test_prefetch_adjacent_warms_neighbouring_months():
+    """Test that prefetch_adjacent caches the previous and next month in the background."""
+    month_cache.invalidate()
+    CalendarController().prefetch_adjacent(month=1, year=2020)
+    month_prefetcher.wait()
+
+    assert (2019, 12, None, None, None) in month_cache
+    assert (2020, 2, None, None, None) in month_cache
+
+
+def test_month_cache_evicts_least_recently_used():
+    """Test that MonthCache drops the oldest entry and ignores stale writes."""
+    cache = MonthCache(max_entries=2)
+    cache.put("a", 1, cache.generation)
+    cache.put("b", 2, cache.generation)
+    cache.get("a")
+    cache.put("c", 3, cache.generation)
+    assert "a" in cache and "c" in cache and "b" not in cache
+
+    generation = cache.generation
+    cache.invalidate()
+    cache.put("d", 4, generation)
+    assert len(cache) == 0
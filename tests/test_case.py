@@ -1,16 +1,23 @@
 from datetime import date
+import pytest
 from src.models.case import Case
+from src.models.suspect import Suspect
+from src.controllers import assignments, case_controller
+from src.controllers.case_filter import CaseFilter
 from src.controllers.case_controller import CaseController
+from src.models.counters import SUSPECT
 
 controller = CaseController()
 
 
+@pytest.mark.max_queries(1)
 def test_get_all_cases():
     """Test that get_all_cases returns all cases."""
     cases = controller.get_all_cases()
     assert all(isinstance(case, Case) for case in cases)
 
 
+@pytest.mark.max_queries(2)
 def test_get_all_cases_pagination():
     """Test that get_all_cases_pagination returns paginated cases."""
     pagination_result = controller.get_all_cases_pagination(page=1, per_page=5)
@@ -22,6 +29,7 @@ def test_get_all_cases_pagination():
     assert len(pagination_result['cases']) <= 5
 
 
+@pytest.mark.max_queries(4)
 def test_add_case():
     """Test that add_case adds a new case to the database."""
     # get all cases
@@ -34,3 +42,120 @@ def test_add_case():
     # get all cases again
     cases = controller.get_all_cases()
     assert len(cases) == length + 1
+
+
+@pytest.mark.max_queries(11)
+def test_get_all_cases_cursor():
+    """Test that cursor pagination walks cases in (startDate, id) order both ways."""
+    for day in (3, 1, 2):
+        controller.add_case(progress=0, startDate=date(
+            2024, 11, day), description="Cursor Case", detective="Jane Doe", priority="Rendah")
+
+    # The three cases above alone fill more than one page of two
+    first = controller.get_all_cases_cursor(per_page=2)
+    assert len(first['cases']) == 2
+    assert first['prev_cursor'] is None
+    assert first['next_cursor'] is not None
+
+    keys = [(case.startDate, case.id) for case in first['cases']]
+    assert keys == sorted(keys)
+
+    second = controller.get_all_cases_cursor(
+        cursor=first['next_cursor'], per_page=2)
+    assert second['cases']
+    assert (second['cases'][0].startDate, second['cases'][0].id) > keys[-1]
+    assert second['prev_cursor'] is not None
+
+    back = controller.get_all_cases_cursor(
+        cursor=second['prev_cursor'], per_page=2, backwards=True)
+    assert [case.id for case in back['cases']] == [
+        case.id for case in first['cases']]
+
+
+@pytest.fixture(name="unassigned_suspect")
+def unassigned_suspect_fixture():
+    """A fresh case and suspect that are not linked yet."""
+    case = Case(progress=0, startDate=date(2024, 10, 1), description="Budget Case",
+                detective="Jane Doe", priority="Rendah")
+    suspect = Suspect(nik="555", picture_path="/path/to/picture", name="Budget Suspect",
+                      age=40, gender=True, note="-")
+    controller.db.add_all([case, suspect])
+    controller.db.commit()
+    return case.id, suspect.id
+
+
+@pytest.mark.max_queries(1)
+def test_get_top_ten_suspects():
+    """Test that get_top_ten_suspects aggregates in a single query."""
+    top = controller.get_top_ten_suspects()
+    assert len(top) <= 10
+    counts = [suspect.cases_count for suspect in top]
+    assert counts == sorted(counts, reverse=True)
+
+
+@pytest.mark.max_queries(1)
+def test_get_top_ten_victims():
+    """Test that get_top_ten_victims aggregates in a single query."""
+    top = controller.get_top_ten_victims()
+    assert len(top) <= 10
+
+
+@pytest.mark.max_queries(8)
+def test_assign_and_remove_suspect(unassigned_suspect):
+    """Test that assigning and removing a suspect links and unlinks it."""
+    case_id, suspect_id = unassigned_suspect
+    controller.assign_suspect_to_case(case_id, suspect_id)
+    assert suspect_id in [s.id for s in controller.get_case_by_id(case_id).suspects]
+
+    controller.remove_suspect_from_case(case_id, suspect_id)
+    assert suspect_id not in [s.id for s in controller.get_case_by_id(case_id).suspects]
+
+
+@pytest.mark.max_queries(5)
+def test_link_is_bulk_and_idempotent(unassigned_suspect):
+    """Test that linking many suspects is one statement and skips existing or unknown rows."""
+    case_id, suspect_id = unassigned_suspect
+    assert controller.link(SUSPECT, case_id, [suspect_id, 1, 999999]) == 2
+    assert controller.link(SUSPECT, case_id, [suspect_id, 1]) == 0
+    assert controller.unlink(SUSPECT, case_id, [suspect_id, 1]) == 2
+
+
+def test_link_people_without_on_conflict(unassigned_suspect, monkeypatch):
+    """Test the NOT EXISTS fallback used on dialects without ON CONFLICT DO NOTHING."""
+    monkeypatch.setattr(assignments, "_insert_ignoring_duplicates", lambda *args: None)
+    case_id, suspect_id = unassigned_suspect
+    assert controller.link(SUSPECT, case_id, [suspect_id]) == 1
+    assert controller.link(SUSPECT, case_id, [suspect_id]) == 0
+    controller.unlink(SUSPECT, case_id, [suspect_id])
+
+
+@pytest.mark.max_queries(4)
+def test_get_unassigned_suspects(unassigned_suspect):
+    """Test that unassigned suspects exclude linked ones and honour the term and limit."""
+    case_id, suspect_id = unassigned_suspect
+    controller.link(SUSPECT, case_id, [1])
+
+    unassigned = [s.id for s in controller.get_unassigned_suspects(case_id, limit=1000)]
+    assert suspect_id in unassigned and 1 not in unassigned
+
+    matches = controller.get_unassigned_suspects(case_id, term="budget sus", limit=1)
+    assert len(matches) == 1 and matches[0].name == "Budget Suspect"
+
+
+def test_count_cache_is_bounded(monkeypatch, query_counter):
+    """Test that the case count cache keeps only the most recent filters and drops expired ones."""
+    monkeypatch.setattr(case_controller, "COUNT_CACHE_SIZE", 2)
+    CaseController.invalidate_counts()
+
+    def queries_for(detective):
+        before = len(query_counter)
+        controller.count_cases(case_filter=CaseFilter(detective=detective))
+        return len(query_counter) - before
+
+    assert [queries_for(name) for name in ("Count A", "Count B", "Count C")] == [1, 1, 1]
+    # "Count A" was the least recently used entry, so it was evicted
+    assert [queries_for(name) for name in ("Count C", "Count A")] == [0, 1]
+
+    monkeypatch.setattr(case_controller, "COUNT_CACHE_TTL", 0)
+    assert queries_for("Count A") == 1
+    CaseController.invalidate_counts()
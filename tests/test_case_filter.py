@@ -0,0 +1,80 @@
+from datetime import date
+import pytest
+from src.controllers.case_controller import CaseController
+from src.controllers.case_filter import CaseFilter
+from src.models.case import Case
+from src.models.database import engine
+from src.models.migrations import query_plan
+
+controller = CaseController()
+
+
+def listing_plan(case_filter):
+    """SQLite's plan for the first page of the filtered case listing."""
+    query = case_filter.apply(controller.db.query(Case)).order_by(
+        Case.startDate, Case.id).limit(11)
+    sql = str(query.statement.compile(
+        dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as connection:
+        return query_plan(connection, sql)
+
+
+@pytest.mark.max_queries(2)
+def test_combined_filter_in_one_query():
+    """Test that every criterion is applied by the page query, plus one count."""
+    case_filter = CaseFilter(detective="Rina Wijaya", suspect_id=3,
+                             start_from=date(2024, 11, 1), start_before=date(2025, 1, 1))
+    result = controller.get_all_cases_cursor(per_page=10, case_filter=case_filter)
+
+    assert [case.id for case in result["cases"]] == [3, 1]
+    assert result["total_cases"] == 2
+    assert result["next_cursor"] is None
+
+
+def test_filter_fields():
+    """Test progress, priority and involvement filters against the seeded cases."""
+    def ids(**fields):
+        return {case.id for case in controller.get_all_cases_cursor(
+            per_page=50, case_filter=CaseFilter(**fields))["cases"]}
+
+    assert ids(victim_id=1) >= {1, 4}
+    assert ids(victim_id=1, progress=0, priority="Sedang") >= {4}
+    assert 1 not in ids(victim_id=1, progress=0, priority="Sedang")
+    assert ids(suspect_id=1, victim_id=1) == {1}
+
+    # The legacy progress argument combines with a filter
+    merged = controller.get_all_cases_cursor(
+        per_page=50, filter_progress=2, case_filter=CaseFilter(detective="Rina Wijaya"))
+    assert [case.id for case in merged["cases"]] == [3]
+
+
+def test_from_dict_validates():
+    """Test that dict filters are checked and ISO dates parsed."""
+    case_filter = CaseFilter.from_dict({"priority": "Tinggi", "start_from": "2024-01-01"})
+    assert case_filter == CaseFilter(priority="Tinggi", start_from=date(2024, 1, 1))
+    with pytest.raises(ValueError):
+        CaseFilter.from_dict({"description": "x"})
+    with pytest.raises(ValueError):
+        CaseFilter(start_from=date(2024, 2, 1), start_before=date(2024, 1, 1))
+
+
+@pytest.mark.parametrize("case_filter, index", [
+    (CaseFilter(detective="Rina Wijaya"), "ix_cases_detective_start_date_id"),
+    (CaseFilter(start_from=date(2024, 1, 1), start_before=date(2024, 6, 1)),
+     "ix_cases_start_date_id"),
+    (CaseFilter(detective="Rina Wijaya", start_from=date(2024, 1, 1), suspect_id=3),
+     "ix_cases_detective_start_date_id"),
+])
+def test_plan_uses_case_index(case_filter, index):
+    """Test that case criteria are served by an index in keyset order, without a sort."""
+    plan = listing_plan(case_filter)
+    assert f"SEARCH cases USING INDEX {index}" in plan[0]
+    assert not any("TEMP B-TREE" in line for line in plan)
+
+
+def test_plan_probes_links_by_index():
+    """Test that involvement EXISTS checks search the association primary keys."""
+    plan = listing_plan(CaseFilter(suspect_id=3, victim_id=1))
+    assert any(line.startswith("SEARCH case_suspects USING COVERING INDEX") for line in plan)
+    assert any(line.startswith("SEARCH case_victims USING COVERING INDEX") for line in plan)
+    assert not any(line.startswith("SCAN case_") for line in plan)
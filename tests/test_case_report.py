@@ -0,0 +1,167 @@
+from datetime import date
+import os
+import zipfile
+import pytest
+from src.controllers.case_controller import CaseController
+from src.controllers.case_filter import CaseFilter
+from src.controllers.suspect_controller import SuspectController
+from src.models.case import Case
+from src.models.database import SessionLocal
+from src.reports import case_report
+from src.reports.case_report import CaseReportData, ReportService
+from src.reports.report_cache import ReportCache
+
+controller = CaseController()
+suspect_controller = SuspectController()
+
+
+def add_case(progress, start_date, description, priority):
+    controller.add_case(progress=progress, startDate=start_date, description=description,
+                        detective="Detektif Laporan", priority=priority)
+    return controller.db.query(Case).filter(Case.description == description).one()
+
+
+@pytest.fixture(name="report_cases")
+def report_cases_fixture():
+    """Three cases of one detective, two of them in March 2031, one with a suspect."""
+    cases = [
+        add_case("Open", date(2031, 3, 2), "Laporan pertama", "Tinggi"),
+        add_case("Closed", date(2031, 3, 20), "Laporan kedua", "Rendah"),
+        add_case("Open", date(2031, 4, 1), "Laporan ketiga", "Sedang"),
+    ]
+    suspect = suspect_controller.add_suspect("3201017777000001", "img/none.png",
+                                             "Tersangka Laporan", 41, "True", "-")
+    controller.assign_suspect_to_case(cases[0].id, suspect.id)
+    yield [case.id for case in cases]
+    for case in cases:
+        controller.delete_case(case.id)
+    suspect_controller.delete_suspect(suspect.id)
+
+
+@pytest.fixture(name="service")
+def service_fixture(tmp_path):
+    """A report service with its own cache directory."""
+    return ReportService(cache=ReportCache(str(tmp_path / "cache")))
+
+
+def test_report_data_is_detached(report_cases):
+    """Test that report data carries the linked names and renders to a PDF."""
+    with SessionLocal() as db:
+        data = case_report.load_report_data(db, case_ids=report_cases[:1])[0]
+
+    assert [name for _id, _nik, name in data.suspects] == ["Tersangka Laporan"]
+    assert data.start_date == "2031-03-02"
+    assert case_report.render_case_report(data).startswith(b"%PDF")
+
+
+def test_digest_follows_the_printed_content(monkeypatch):
+    """Test that the digest changes exactly when the text the renderer writes changes."""
+    written = []
+    for method in ("cell", "multi_cell"):
+        original = getattr(case_report.FPDF, method)
+
+        def record(pdf, *args, _original=original, **kwargs):
+            written.append(args[2] if len(args) > 2 else kwargs.get("text", ""))
+            return _original(pdf, *args, **kwargs)
+        monkeypatch.setattr(case_report.FPDF, method, record)
+
+    def report(**changes):
+        fields = {"id": 7, "progress": 1, "start_date": "2031-03-02", "detective": "Detektif",
+                  "priority": "Tinggi", "description": "Deskripsi",
+                  "suspects": [(1, "3201", "Tersangka")], "victims": [(2, "3202", "Korban")]}
+        fields.update(changes)
+        data = CaseReportData(**fields)
+        written.clear()
+        case_report.render_case_report(data)
+        return data.digest(), list(written)
+
+    digest, text = report()
+    for changes in [{"id": 8}, {"progress": 2}, {"start_date": "2031-03-03"},
+                    {"detective": "Detektif Lain"}, {"priority": None},
+                    {"description": "Deskripsi baru"}, {"suspects": [(1, "3201", "Nama Baru")]},
+                    {"victims": []}]:
+        changed_digest, changed_text = report(**changes)
+        assert changed_text != text and changed_digest != digest, changes
+
+    # The NIK is carried for the detail links but never printed
+    assert report(suspects=[(1, "9999", "Tersangka")]) == (digest, text)
+
+
+def test_generate_runs_off_thread(report_cases, service, tmp_path):
+    """Test that a single report is written by the returned future."""
+    path = str(tmp_path / "single.pdf")
+
+    assert service.generate(report_cases[0], path).result(timeout=30) == path
+    with open(path, "rb") as report:
+        assert report.read(4) == b"%PDF"
+    assert service.generate(-1, path + "x").result(timeout=30) is None
+
+
+def test_export_month_to_zip_and_directory(report_cases, service, tmp_path):
+    """Test that a batch export covers the filtered month into a ZIP or a directory."""
+    case_filter = CaseFilter(detective="Detektif Laporan")
+    archive_path = str(tmp_path / "march.zip")
+    calls = []
+
+    written = service.export(archive_path, case_filter, month=3, year=2031, workers=2,
+                             progress=lambda done, total: calls.append((done, total)))
+
+    assert written.result(timeout=60) == 2
+    assert calls == [(0, 2), (1, 2), (2, 2)]
+    with zipfile.ZipFile(archive_path) as archive:
+        assert sorted(archive.namelist()) == sorted(
+            case_report.report_filename(case_id) for case_id in report_cases[:2])
+        assert archive.read(case_report.report_filename(report_cases[0])).startswith(b"%PDF")
+
+    directory = str(tmp_path / "all")
+    assert service.export(directory, case_filter).result(timeout=60) == 3
+    assert sorted(os.listdir(directory)) == sorted(
+        case_report.report_filename(case_id) for case_id in report_cases)
+
+
+def test_unchanged_cases_are_copied_from_the_cache(report_cases, service, tmp_path, monkeypatch):
+    """Test that only cases whose printed fields changed are rendered again."""
+    case_filter = CaseFilter(detective="Detektif Laporan")
+    first = str(tmp_path / "first.zip")
+    assert service.export(first, case_filter, workers=2).result(timeout=60) == 3
+
+    rendered = []
+    render = case_report.render_case_report
+    monkeypatch.setattr(case_report, "render_case_report",
+                        lambda data: rendered.append(data.id) or render(data))
+    path = str(tmp_path / "again.pdf")
+    service.generate(report_cases[0], path).result(timeout=30)
+    assert not rendered
+    with zipfile.ZipFile(first) as archive, open(path, "rb") as report:
+        assert report.read() == archive.read(case_report.report_filename(report_cases[0]))
+
+    # Renaming a linked suspect changes the digest of that case only
+    suspect_id = controller.get_case_by_id(report_cases[0]).suspects[0].id
+    suspect_controller.update_suspect(suspect_id, name="Tersangka Berganti Nama")
+    service.generate(report_cases[0], path).result(timeout=30)
+    service.generate(report_cases[1], path).result(timeout=30)
+    assert rendered == [report_cases[0]]
+
+
+def test_export_survives_evicted_hits_without_a_pool(report_cases, service, tmp_path, monkeypatch):
+    """Test that an all-hit export starts no processes and re-renders hits evicted meanwhile."""
+    case_filter = CaseFilter(detective="Detektif Laporan")
+    assert service.export(str(tmp_path / "warm"), case_filter).result(timeout=60) == 3
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("every report was cached")
+    monkeypatch.setattr(case_report, "ProcessPoolExecutor", no_pool)
+    lookup = service.cache.lookup
+
+    def lookup_then_evict(digest):
+        path = lookup(digest)
+        if path:
+            os.remove(path)
+        return path
+    monkeypatch.setattr(service.cache, "lookup", lookup_then_evict)
+
+    archive_path = str(tmp_path / "evicted.zip")
+    assert service.export(archive_path, case_filter).result(timeout=60) == 3
+    with zipfile.ZipFile(archive_path) as archive:
+        assert all(archive.read(name).startswith(b"%PDF") for name in archive.namelist())
+    assert len(os.listdir(service.cache.directory)) == 3
@@ -0,0 +1,56 @@
+from datetime import date
+from sqlalchemy import update
+from src.controllers.case_controller import CaseController
+from src.controllers.statistics import PersonStats
+from src.controllers.victim_controller import VictimController
+from src.models import counters
+from src.models.counters import VICTIM
+from src.models.database import engine
+from src.models.victim import Victim
+
+cases = CaseController()
+victims = VictimController()
+
+
+def case_count(victim_id):
+    cases.db.expire_all()
+    return victims.get_victim_by_id(victim_id).case_count
+
+
+def test_case_count_follows_links_and_case_deletes():
+    """Test that case_count changes with link, unlink and case deletion."""
+    victim_id = victims.add_victim(nik="313131", picture_path="/path/to/picture",
+                                   name="Counted Victim", age=30, forensic_result="-").id
+    for day in (1, 2):
+        cases.add_case(progress=0, startDate=date(2020, 5, day),
+                       description="Counter Case", detective="Jane Doe", priority="Rendah")
+    first, second = sorted(c.id for c in cases.get_all_cases())[-2:]
+
+    victims.link_to_cases(victim_id, [first, second])
+    assert case_count(victim_id) == 2
+    cases.unlink(VICTIM, first, [victim_id])
+    assert case_count(victim_id) == 1
+    cases.delete_case(second)
+    assert case_count(victim_id) == 0
+    assert counters.verify(engine) == {"suspect": [], "victim": []}
+
+
+def test_verify_and_rebuild_repair_drift():
+    """Test that drifted counters are reported and then repaired."""
+    with engine.begin() as connection:
+        connection.execute(update(Victim.__table__).where(
+            Victim.__table__.c.id == 1).values(case_count=99))
+
+    drift = counters.verify(engine)
+    assert [row[0] for row in drift["victim"]] == [1]
+    assert counters.rebuild(engine) == {"suspect": 0, "victim": 1}
+    assert counters.verify(engine) == {"suspect": [], "victim": []}
+
+
+def test_top_ten_returns_slotted_records():
+    """Test that the top-ten lists are PersonStats ordered by case count."""
+    top = cases.get_top_ten_victims()
+    assert top and all(isinstance(person, PersonStats) for person in top)
+    assert not hasattr(top[0], "__dict__")
+    counts = [person.cases_count for person in top]
+    assert counts == sorted(counts, reverse=True)
@@ -0,0 +1,80 @@
+from datetime import date
+import pytest
+from src.controllers.case_controller import CaseController
+from src.controllers.suspect_controller import SuspectController
+from src.models.case import Case
+
+controller = CaseController()
+suspect_controller = SuspectController()
+
+
+def add_case(description, progress=1):
+    controller.add_case(progress=progress, startDate=date(2023, 6, 1),
+                        description=description, detective="FTS Detective", priority="Sedang")
+    return controller.db.query(Case).filter(Case.description == description).one()
+
+
+@pytest.fixture(name="searchable_cases")
+def searchable_cases_fixture():
+    """Two cases mentioning 'zamrud' in their description, one only via a suspect note."""
+    own = add_case("Pencurian kalung zamrud di toko perhiasan")
+    other = add_case("Zamrud palsu dijual sebagai zamrud asli zamrud", progress=0)
+    linked = add_case("Penggelapan dana koperasi")
+    suspect = suspect_controller.add_suspect(
+        "3201019999000001", "img/placeholder.png", "Budi Zamrudin", 40, "True",
+        "Pernah menadah zamrud curian")
+    controller.assign_suspect_to_case(linked.id, suspect.id)
+    yield own.id, other.id, linked.id
+    for case_id in (own.id, other.id, linked.id):
+        controller.delete_case(case_id)
+    suspect_controller.delete_suspect(suspect.id)
+
+
+@pytest.mark.max_queries(2)
+def test_search_ranks_description_matches_first(searchable_cases):
+    """Test that description matches outrank matches found only through linked people."""
+    own_id, other_id, linked_id = searchable_cases
+    hits = controller.search_cases("zamrud")["hits"]
+    ids = [hit.case.id for hit in hits]
+
+    assert set(ids) == {own_id, other_id, linked_id}
+    assert ids[-1] == linked_id
+    assert [hit.tier for hit in hits] == [0, 0, 1]
+    assert all("[" in hit.snippet for hit in hits)
+
+
+def test_search_prefix_filters_and_cursor(searchable_cases):
+    """Test prefix matching, filters and paging through the results with the cursor."""
+    own_id, other_id, linked_id = searchable_cases
+    assert [hit.case.id for hit in controller.search_cases(
+        "zamr kalung")["hits"]] == [own_id]
+    assert [hit.case.id for hit in controller.search_cases(
+        "zamrud", {"progress": 0})["hits"]] == [other_id]
+
+    seen = []
+    cursor = None
+    while True:
+        result = controller.search_cases("zamrud", cursor=cursor, per_page=1)
+        seen.extend(hit.case.id for hit in result["hits"])
+        cursor = result["next_cursor"]
+        if cursor is None:
+            break
+    assert sorted(seen) == sorted([own_id, other_id, linked_id])
+
+    with pytest.raises(ValueError):
+        controller.search_cases("zamrud", {"description": "x"})
+    assert controller.search_cases("  \"*  ")["hits"] == []
+
+
+def test_search_index_follows_writes(searchable_cases):
+    """Test that the index triggers pick up updated and deleted descriptions."""
+    own_id, _other_id, _linked_id = searchable_cases
+    case = controller.get_case_by_id(own_id)
+    controller.update_case(own_id, case.progress, case.startDate,
+                           "Pencurian kalung safir", case.detective, case.priority)
+
+    assert own_id not in [hit.case.id for hit in controller.search_cases("zamrud")["hits"]]
+    assert [hit.case.id for hit in controller.search_cases("safir")["hits"]] == [own_id]
+
+    controller.delete_case(own_id)
+    assert controller.search_cases("safir")["hits"] == []
@@ -0,0 +1,34 @@
+from sqlalchemy import text
+from src.controllers.case_controller import CaseController
+from src.models import instrumentation
+from src.models.database import engine, SessionLocal
+
+
+def test_statement_shape_collapses_parameter_lists():
+    """Test that IN lists of different lengths normalize to the same shape."""
+    assert (instrumentation.statement_shape("SELECT 1 WHERE id IN (?, ?)")
+            == instrumentation.statement_shape("SELECT 1\n WHERE id IN (?)"))
+
+
+def test_action_records_callers_and_n_plus_one():
+    """Test that statements are tagged with their action and caller and repeats are flagged."""
+    instrumentation.install(engine)
+    instrumentation.stats.reset()
+    db = SessionLocal()
+    try:
+        with instrumentation.action("test.n_plus_one"):
+            CaseController(db).get_all_cases()
+            for _ in range(instrumentation.N_PLUS_ONE_THRESHOLD + 1):
+                db.execute(text("SELECT id FROM cases WHERE id = :id"), {"id": 1})
+        summary = instrumentation.stats.summary()
+    finally:
+        db.close()
+        instrumentation.uninstall(engine)
+
+    action = summary["actions"]["test.n_plus_one"]
+    assert action["runs"] == 1
+    assert action["count"] == instrumentation.N_PLUS_ONE_THRESHOLD + 2
+    assert "CaseController.get_all_cases" in summary["callers"]
+    findings = [f for f in summary["n_plus_one"] if f["action"] == "test.n_plus_one"]
+    assert len(findings) == 1
+    assert findings[0]["count"] == instrumentation.N_PLUS_ONE_THRESHOLD + 1
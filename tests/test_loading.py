@@ -0,0 +1,76 @@
+from datetime import date
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.exc import InvalidRequestError
+from src.controllers.calendar_controller import CalendarController
+from src.controllers.case_controller import CaseController
+from src.controllers.case_filter import CaseFilter
+from src.controllers.suspect_controller import SuspectController
+from src.models.case import DESCRIPTION_PREVIEW_LENGTH
+from src.models.database import SessionLocal
+from src.models.loading import REPORT
+
+
+@pytest.fixture(name="db")
+def db_fixture():
+    """A fresh session, so no earlier test has loaded the Text columns already."""
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.mark.max_queries(2)
+def test_list_profile_leaves_text_unloaded(db):
+    """Test that list loads skip the Text columns and refuse lazy loads of them."""
+    cases = CaseController(db).get_all_cases()
+    suspects = SuspectController(db).get_all_suspects()
+
+    assert all("description" in inspect(case).unloaded for case in cases)
+    assert all("note" in inspect(suspect).unloaded for suspect in suspects)
+    with pytest.raises(InvalidRequestError):
+        _ = cases[0].description
+
+
+def test_detail_fills_a_listed_case(db):
+    """Test that a detail load completes a case first loaded by a list."""
+    controller = CaseController(db)
+    listed = next(case for case in controller.get_all_cases() if case.id == 1)
+    detailed = controller.get_case_by_id(1)
+
+    assert detailed is listed
+    assert detailed.description == "Pencurian di gudang pelabuhan"
+
+
+def test_card_profile_has_preview(db):
+    """Test that case cards carry a preview truncated by the database."""
+    controller = CaseController(db)
+    controller.add_case(progress=1, startDate=date(2023, 2, 1), description="x" * 1000,
+                        detective="Preview Detective", priority="Rendah")
+    db.expunge_all()
+
+    cases = controller.get_all_cases_cursor(
+        per_page=5, case_filter=CaseFilter(detective="Preview Detective"))["cases"]
+    assert [case.description_preview for case in cases] == ["x" * DESCRIPTION_PREVIEW_LENGTH]
+    assert "description" in inspect(cases[0]).unloaded
+    controller.delete_case(cases[0].id)
+
+
+@pytest.mark.max_queries(3)
+def test_report_profile_loads_people(db):
+    """Test that a report load fetches the case and its people's names up front."""
+    case = CaseController(db).get_case_by_id(1, profile=REPORT)
+
+    assert case.description
+    assert {suspect.name for suspect in case.suspects} == {"Joko Prasetyo", "Hendra Gunawan"}
+    assert [victim.name for victim in case.victims] == ["Wati Kusuma"]
+    assert all("note" in inspect(suspect).unloaded for suspect in case.suspects)
+
+
+@pytest.mark.max_queries(3)
+def test_calendar_skips_text(db):
+    """Test that the calendar loads cases and people without their Text columns."""
+    cases = CalendarController(db).get_all_cases(month=12, year=2024)
+
+    assert cases
+    for case in cases:
+        assert "description" in inspect(case).unloaded
+        assert all("forensic_result" in inspect(victim).unloaded for victim in case.victims)
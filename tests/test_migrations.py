@@ -0,0 +1,57 @@
+from sqlalchemy import create_engine, inspect
+from src.models.migrations import MIGRATIONS, run_migrations
+
+# Schema as created before any index was declared
+LEGACY_SCHEMA = [
+    'CREATE TABLE cases (id INTEGER PRIMARY KEY, progress INTEGER NOT NULL, "startDate" DATE NOT NULL, '
+    'description TEXT NOT NULL, detective VARCHAR, priority VARCHAR)',
+    "CREATE TABLE suspects (id INTEGER PRIMARY KEY, nik VARCHAR NOT NULL, picture_path VARCHAR NOT NULL, "
+    "name VARCHAR NOT NULL, age INTEGER NOT NULL, gender BOOLEAN NOT NULL, note TEXT NOT NULL)",
+    "CREATE TABLE victims (id INTEGER PRIMARY KEY, nik VARCHAR NOT NULL, picture_path VARCHAR NOT NULL, "
+    "name VARCHAR NOT NULL, age INTEGER NOT NULL, forensic_result TEXT NOT NULL)",
+    "CREATE TABLE case_suspects (case_id INTEGER REFERENCES cases(id), suspect_id INTEGER REFERENCES suspects(id), "
+    "PRIMARY KEY (case_id, suspect_id))",
+    "CREATE TABLE case_victims (case_id INTEGER REFERENCES cases(id), victim_id INTEGER REFERENCES victims(id), "
+    "PRIMARY KEY (case_id, victim_id))",
+]
+
+
+def legacy_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        for statement in LEGACY_SCHEMA:
+            connection.exec_driver_sql(statement)
+    return engine
+
+
+def index_names(engine, table):
+    return {index["name"] for index in inspect(engine).get_indexes(table)}
+
+
+def test_dry_run_reports_plans_without_changing_schema(tmp_path):
+    """Test that a dry run reports plan changes and leaves the database untouched."""
+    engine = legacy_engine(tmp_path)
+    report = run_migrations(engine, dry_run=True)
+
+    assert [entry["version"] for entry in report] == [
+        m.version for m in MIGRATIONS]
+    nik_plans = next(entry["plans"] for entry in report if entry["version"] == 3)
+    assert all(plan["before"] != plan["after"] for plan in nik_plans)
+    assert any("ix_suspects_nik_prefix" in line for plan in nik_plans for line in plan["after"])
+
+    assert index_names(engine, "suspects") == set()
+    assert not inspect(engine).has_table("schema_migrations")
+
+
+def test_migrations_are_applied_once(tmp_path):
+    """Test that migrations add the indexes, are recorded, and are not re-run."""
+    engine = legacy_engine(tmp_path)
+    assert len(run_migrations(engine)) == len(MIGRATIONS)
+
+    assert {"ix_cases_start_date_id", "ix_cases_progress",
+            "ix_cases_priority"} <= index_names(engine, "cases")
+    assert "ix_case_suspects_suspect_id" in index_names(engine, "case_suspects")
+    assert "ix_victims_nik_prefix" in index_names(engine, "victims")
+
+    assert not run_migrations(engine)
+    assert not run_migrations(engine, dry_run=True)
@@ -0,0 +1,103 @@
+import os
+import time
+import pytest
+from src.controllers.victim_controller import VictimController
+from src.media import picture_gc, thumbnails
+from src.models.database import engine
+
+controller = VictimController()
+
+DAY = 24 * 60 * 60
+
+
+def write(path, size, age=2 * DAY):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+@pytest.fixture(name="picture_dir")
+def picture_dir_fixture(tmp_path):
+    """A picture directory with one live picture, two old orphans and a fresh one."""
+    live = write(tmp_path / "live.png", 10)
+    write(tmp_path / "orphan.png", 100)
+    write(tmp_path / "orphan.jpg", 50)
+    write(tmp_path / "fresh.png", 7, age=60)
+    write(tmp_path / ".gitignore", 1)
+    orphan_digest = "ab" * 32
+    write(tmp_path / ".thumbs" / "ab" / f"{orphan_digest}_96.webp", 5)
+    live_thumb = thumbnails.thumbnail_path(thumbnails.file_digest(live), 96,
+                                           str(tmp_path / ".thumbs"))
+    write(tmp_path / live_thumb, 5)
+
+    victim = controller.add_victim("3273019999000001", str(live), "GC Victim", 30, "-")
+    yield tmp_path
+    controller.delete_victim(victim.id)
+
+
+def test_dry_run_reports_without_touching(picture_dir):
+    """Test that a dry run lists old orphans and their bytes but changes nothing."""
+    before = sorted(os.listdir(picture_dir))
+    report = picture_gc.collect(engine, str(picture_dir), dry_run=True)
+
+    assert sorted(os.path.basename(path) for path, _size in report.orphans) == [
+        "ab" * 32 + "_96.webp", "orphan.jpg", "orphan.png"]
+    summary = report.summary()
+    assert summary["bytes_reclaimed"] == 155
+    assert summary["live"] == 2
+    assert summary["too_recent"] == 1
+    assert sorted(os.listdir(picture_dir)) == before
+
+
+def test_quarantine_and_delete(picture_dir):
+    """Test that quarantine moves orphans aside and delete removes them."""
+    report = picture_gc.collect(engine, str(picture_dir), mode="quarantine",
+                                include_thumbnails=False)
+    assert report.bytes_reclaimed == 150
+    assert not (picture_dir / "orphan.png").exists()
+    quarantined = [name for _root, _dirs, names in
+                   os.walk(picture_dir / picture_gc.QUARANTINE_DIR) for name in names]
+    assert sorted(quarantined) == ["orphan.jpg", "orphan.png"]
+    assert (picture_dir / "live.png").exists()
+    assert (picture_dir / "fresh.png").exists()
+
+    write(picture_dir / "later.png", 9)
+    report = picture_gc.collect(engine, str(picture_dir), mode="delete", grace_seconds=0)
+    assert sorted(os.path.basename(path) for path, _size in report.orphans) == [
+        "ab" * 32 + "_96.webp", "fresh.png", "later.png"]
+    assert (picture_dir / "live.png").exists()
+
+    with pytest.raises(ValueError):
+        picture_gc.collect(engine, str(picture_dir), mode="shred")
+
+
+def test_legacy_digests_are_hashed_once(picture_dir, tmp_path_factory, monkeypatch):
+    """Test that digest-named files outside the store are hashed, and only on the first run."""
+    elsewhere = tmp_path_factory.mktemp("elsewhere")
+    impostor = write(elsewhere / f"{'cd' * 32}.png", 12)
+    victim = controller.add_victim("3273019999000002", str(impostor), "GC Impostor", 31, "-")
+    real_thumb = thumbnails.thumbnail_path(thumbnails.file_digest(impostor), 96,
+                                           str(picture_dir / ".thumbs"))
+    write(picture_dir / real_thumb, 5)
+    named_thumb = write(picture_dir / ".thumbs" / "cd" / f"{'cd' * 32}_96.webp", 5)
+
+    hashed = []
+    file_digest = thumbnails.file_digest
+    monkeypatch.setattr(thumbnails, "file_digest",
+                        lambda path: hashed.append(path) or file_digest(path))
+    try:
+        report = picture_gc.collect(engine, str(picture_dir), dry_run=True)
+        assert str(named_thumb) in [path for path, _size in report.orphans]
+        assert str(picture_dir / real_thumb) not in [path for path, _size in report.orphans]
+        assert len(hashed) == 2
+
+        # The dry run saved nothing; the first real run saves the index for the next
+        picture_gc.collect(engine, str(picture_dir), mode="delete")
+        assert len(hashed) == 4
+        picture_gc.collect(engine, str(picture_dir), mode="delete")
+        assert len(hashed) == 4
+        assert (picture_dir / real_thumb).exists()
+    finally:
+        controller.delete_victim(victim.id)
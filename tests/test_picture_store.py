@@ -0,0 +1,100 @@
+import os
+from PIL import Image
+from src.controllers.suspect_controller import SuspectController
+from src.media import picture_store, thumbnails
+
+controller = SuspectController()
+
+
+def test_store_deduplicates(tmp_path):
+    """Test that the same content is stored once under its digest, with progress reported."""
+    store_dir = str(tmp_path / "img")
+    source = tmp_path / "photo.JPG"
+    source.write_bytes(os.urandom(10_000))
+    calls = []
+
+    first = picture_store.store(str(source), store_dir, chunk_size=4096,
+                                progress=lambda copied, total: calls.append((copied, total)))
+    again = picture_store.store(str(source), store_dir)
+
+    assert calls == [(4096, 10_000), (8192, 10_000), (10_000, 10_000)]
+    assert first.path == again.path == picture_store.stored_path(first.digest, ".jpg", store_dir)
+    assert (first.reused, again.reused) == (False, True)
+    assert os.listdir(store_dir) == [os.path.basename(first.path)]
+    assert picture_store.is_stored(first.path, store_dir)
+
+
+def test_upload_runs_off_thread_with_thumbnails(tmp_path):
+    """Test that upload returns a future and generates thumbnails next to the store."""
+    store_dir = str(tmp_path / "img")
+    source = str(tmp_path / "face.png")
+    Image.new("RGB", (400, 400), (1, 2, 3)).save(source)
+
+    picture = picture_store.upload(source, store_dir).result(timeout=10)
+
+    small = thumbnails.thumbnail_path(picture.digest, thumbnails.SMALL,
+                                      os.path.join(store_dir, ".thumbs"))
+    assert os.path.exists(picture.path)
+    assert os.path.exists(small)
+
+
+def test_release_only_unreferenced(tmp_path, monkeypatch):
+    """Test that a stored picture is deleted only when unreferenced and out of its grace period."""
+    store_dir = str(tmp_path / "img")
+    source = tmp_path / "shared.png"
+    source.write_bytes(os.urandom(256))
+    path = picture_store.store(str(source), store_dir).path
+    suspect = controller.add_suspect("3201018888000001", path, "Picture Owner", 33, "True", "-")
+    db = controller.db
+
+    assert picture_store.reference_count(db, path) == 1
+    assert not picture_store.release(db, path, store_dir)
+
+    controller.delete_suspect(suspect.id)
+    assert picture_store.reference_count(db, path) == 0
+    # Freshly stored: may still belong to an unsaved form
+    assert not picture_store.release(db, path, store_dir)
+
+    thumbnail_dir = os.path.join(store_dir, ".thumbs")
+    thumbnail_paths = [thumbnails.thumbnail_path(thumbnails.named_digest(path), size, thumbnail_dir)
+                       for size in thumbnails.SIZES]
+    for thumbnail_path in thumbnail_paths:
+        os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+        with open(thumbnail_path, "wb") as thumbnail:
+            thumbnail.write(b"x")
+
+    monkeypatch.setattr(picture_store, "PENDING_GRACE_SECONDS", 0)
+    assert picture_store.release(db, path, store_dir)
+    assert not os.path.exists(path)
+    assert not any(os.path.exists(thumbnail_path) for thumbnail_path in thumbnail_paths)
+    # Files outside the store are never touched
+    assert not picture_store.release(db, str(source), store_dir)
+    assert source.exists()
+
+
+def test_update_releases_replaced_picture(monkeypatch):
+    """Test that replacing or deleting a picture releases the old path after commit."""
+    released = []
+    monkeypatch.setattr(picture_store, "release", lambda db, path: released.append(path))
+    suspect = controller.add_suspect("3201018888000002", "img/old.png", "Repictured", 40, "True", "-")
+    suspect_id = suspect.id
+
+    controller.update_suspect(suspect_id, note="unchanged picture")
+    assert not released
+    controller.update_suspect(suspect_id, picture_path="img/new.png")
+    assert released == ["img/old.png"]
+    controller.delete_suspect(suspect_id)
+    assert released == ["img/old.png", "img/new.png"]
+
+
+def test_upload_survives_thumbnail_failure(tmp_path, monkeypatch):
+    """Test that a picture Pillow refuses to decode is still stored."""
+    def refuse(*args, **kwargs):
+        raise Image.DecompressionBombError("too many pixels")
+    monkeypatch.setattr(thumbnails, "generate", refuse)
+    source = tmp_path / "huge.png"
+    source.write_bytes(os.urandom(64))
+
+    picture = picture_store.upload(str(source), str(tmp_path / "img")).result(timeout=10)
+
+    assert os.path.exists(picture.path)
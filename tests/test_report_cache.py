@@ -0,0 +1,30 @@
+import os
+import time
+from src.reports.report_cache import ReportCache
+
+
+def test_lookup_and_copy(tmp_path):
+    """Test that a stored report is found by digest and copied out."""
+    cache = ReportCache(str(tmp_path / "cache"))
+    assert cache.lookup("a" * 64) is None
+    assert not cache.copy_to("a" * 64, str(tmp_path / "out.pdf"))
+
+    cache.put("a" * 64, b"%PDF-report")
+    assert cache.copy_to("a" * 64, str(tmp_path / "out.pdf"))
+    assert (tmp_path / "out.pdf").read_bytes() == b"%PDF-report"
+
+
+def test_evicts_least_recently_used(tmp_path):
+    """Test that eviction keeps the cache under its size, dropping the least recently used first."""
+    cache = ReportCache(str(tmp_path / "cache"), max_bytes=250)
+    now = time.time()
+    for age, digest in enumerate(("c", "b", "a")):
+        cache.put(digest * 64, b"x" * 100, evict=False)
+        stamp = now - 100 * (3 - age)
+        os.utime(cache.path_for(digest * 64), (stamp, stamp))
+    # Oldest by write, but used just now
+    cache.lookup("c" * 64)
+
+    assert cache.evict() == 1
+    assert cache.lookup("b" * 64) is None
+    assert cache.lookup("a" * 64) and cache.lookup("c" * 64)
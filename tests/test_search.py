@@ -0,0 +1,42 @@
+from src.controllers.search_controller import SearchController
+from src.controllers.suspect_controller import SuspectController
+from src.controllers.victim_controller import VictimController
+
+suspects = SuspectController()
+victims = VictimController()
+
+
+def test_search_suspects_combines_name_and_nik():
+    """Test that a name + NIK search returns only suspects matching both, best match first."""
+    suspects.add_suspect(nik="5501", picture_path="/path/to/picture",
+                         name="Budi Santoso", age=40, gender="True", note="-")
+    suspects.add_suspect(nik="5502", picture_path="/path/to/picture",
+                         name="Andi Budiman", age=41, gender="True", note="-")
+    suspects.add_suspect(nik="6601", picture_path="/path/to/picture",
+                         name="Budi Lain", age=42, gender="True", note="-")
+
+    results = suspects.search_suspects(name="budi", nik="55")
+    assert [s.name for s in results][:2] == ["Budi Santoso", "Andi Budiman"]
+    assert all(s.nik.startswith("55") for s in results)
+    assert len(suspects.search_suspects(name="budi", nik="55", limit=1)) == 1
+    assert suspects.search_suspects() == []
+
+
+def test_search_escapes_wildcards():
+    """Test that LIKE wildcards in the search term are matched literally."""
+    assert all("%" in s.name for s in suspects.search_suspects(name="%"))
+
+
+def test_search_people_spans_suspects_and_victims():
+    """Test that search_people returns suspects and victims from one query."""
+    suspects.add_suspect(nik="8801", picture_path="/path/to/picture",
+                         name="Citra Dewi", age=30, gender="False", note="-")
+    victims.add_victim(nik="8802", picture_path="/path/to/picture",
+                       name="Citra Ayu", age=31, forensic_result="-")
+
+    people = SearchController().search_people(name="citra", nik="88")
+    kinds = {(person.kind, person.name, person.gender) for person in people}
+    assert ("suspect", "Citra Dewi", False) in kinds
+    assert ("victim", "Citra Ayu", None) in kinds
+    assert all(person.summary == "-" for person in people if person.name.startswith("Citra"))
+    assert SearchController().search_people() == []
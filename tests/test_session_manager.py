@@ -0,0 +1,41 @@
+import pytest
+from src.models.case import Case
+from src.models.session_manager import SessionManager
+
+
+def test_scope_reuses_one_session():
+    """Test that controllers in the same scope share a session until the action ends."""
+    manager = SessionManager()
+    with manager.scope("page-1"):
+        first = manager.get()
+        assert manager.get() is first
+    assert manager.get("page-2") is not first
+
+    manager.begin_action("page-1")
+    assert "page-1" not in manager.active_scopes()
+    assert manager.get("page-1") is not first
+    manager.close_all()
+    assert not manager.active_scopes()
+
+
+def test_unit_of_work_rolls_back_on_error():
+    """Test that unit_of_work rolls back pending changes when the block fails."""
+    manager = SessionManager()
+    with pytest.raises(RuntimeError):
+        with manager.unit_of_work("uow") as session:
+            session.add(Case(progress=0, startDate=None, description="x"))
+            raise RuntimeError("boom")
+    assert not manager.get("uow").new
+    manager.close("uow")
+
+
+def test_isolated_session_belongs_to_no_scope():
+    """Test that an isolated session is separate from every scope and closed on exit."""
+    manager = SessionManager()
+    page_session = manager.get("page-1")
+    with manager.isolated() as session:
+        assert session is not page_session
+        assert session.query(Case).first() is not None
+    assert manager.active_scopes() == ["page-1"]
+    assert not session.in_transaction()
+    manager.close_all()
@@ -0,0 +1,51 @@
+from datetime import date
+import pytest
+from src.controllers import statistics
+from src.controllers.case_controller import CaseController
+
+controller = CaseController()
+service = statistics.StatisticsService(controller.db)
+
+ALL_PANELS = (statistics.BY_PROGRESS, statistics.BY_PRIORITY, statistics.PER_MONTH,
+              statistics.WORKLOAD, statistics.AVERAGES, statistics.TOP_SUSPECTS,
+              statistics.TOP_VICTIMS)
+
+
+@pytest.fixture(autouse=True)
+def cold_cache():
+    statistics.panel_cache.invalidate(*ALL_PANELS)
+
+
+@pytest.mark.max_queries(6)
+def test_get_statistics_groups_queries():
+    """Test that every panel is computed, progress and priority from one query."""
+    stats = service.get(*ALL_PANELS)
+    assert set(stats) == set(ALL_PANELS)
+
+    total = stats[statistics.AVERAGES]["cases"]
+    assert sum(stats[statistics.BY_PROGRESS].values()) == total
+    assert sum(stats[statistics.BY_PRIORITY].values()) == total
+    assert sum(count for _month, count in stats[statistics.PER_MONTH]) == total
+    assert sum(row["cases"] for row in stats[statistics.WORKLOAD]) == total
+
+
+def test_warm_cache_costs_no_query(query_counter):
+    """Test that panels are served from cache until a write invalidates them."""
+    first = service.get(statistics.BY_PROGRESS, statistics.TOP_VICTIMS)
+    queries = len(query_counter)
+    assert service.get(statistics.BY_PROGRESS, statistics.TOP_VICTIMS) == first
+    assert len(query_counter) == queries
+
+    controller.add_case(progress=2, startDate=date(2019, 3, 4),
+                        description="Stats Case", detective="Stat Detective", priority="Tinggi")
+    assert statistics.BY_PROGRESS not in statistics.panel_cache
+    assert statistics.TOP_VICTIMS in statistics.panel_cache
+
+    after = service.get(statistics.BY_PROGRESS)[statistics.BY_PROGRESS]
+    assert after[2] == first[statistics.BY_PROGRESS].get(2, 0) + 1
+
+
+def test_unknown_panel_is_rejected():
+    """Test that asking for a panel that does not exist raises ValueError."""
+    with pytest.raises(ValueError):
+        service.get("nope")
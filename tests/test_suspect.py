@@ -1,9 +1,11 @@
+import pytest
 from src.models.suspect import Suspect
 from src.controllers.suspect_controller import SuspectController
 
 controller = SuspectController()
 
 
+@pytest.mark.max_queries(1)
 def test_get_all_suspects():
     """Test that get_all_suspects returns all suspects."""
     suspects = controller.get_all_suspects()
@@ -11,14 +13,16 @@ def test_get_all_suspects():
     assert all(isinstance(suspect, Suspect) for suspect in suspects)
 
 
+@pytest.mark.max_queries(1)
 def test_get_suspect_by_id():
     """Test that get_suspect_by_id returns a suspect by their ID."""
     suspect = controller.get_suspect_by_id(
         1)  # Assuming a suspect with ID 1 exists
-    if (suspect):
-        assert suspect.id == 1
+    assert suspect is not None
+    assert suspect.id == 1
 
 
+@pytest.mark.max_queries(4)
 def test_add_suspect():
     """Test that add_suspect adds a new suspect to the database."""
     # get all suspects before adding
@@ -32,3 +36,37 @@ def test_add_suspect():
     # get all suspects after adding
     suspects = controller.get_all_suspects()
     assert len(suspects) == length + 1
+
+
+@pytest.mark.max_queries(8)
+def test_get_suspects_page():
+    """Test that get_suspects_page returns truncated card rows and seeks by ID."""
+    # Two new suspects guarantee a page after the first one
+    for nik in ("654321", "654322"):
+        controller.add_suspect(
+            nik=nik, picture_path="/path/to/picture", name="Jane Doe", age=25, gender="False", note="x" * 500
+        )
+    first = controller.get_suspects_page(page=1, per_page=1)
+    assert first['total_suspects'] >= 2
+    assert len(first['suspects']) == 1
+
+    page = controller.get_suspects_page(page=1, per_page=1000)
+    assert all(len(suspect.note) <= 200 for suspect in page['suspects'])
+    ids = [suspect.id for suspect in page['suspects']]
+    assert ids == sorted(ids)
+
+    after = controller.get_suspects_page(
+        page=2, per_page=1, after_id=first['suspects'][0].id)
+    assert len(after['suspects']) == 1
+    assert after['suspects'][0].id > first['suspects'][0].id
+
+
+@pytest.mark.max_queries(7)
+def test_link_to_cases():
+    """Test that one suspect is linked to and unlinked from many cases at once."""
+    suspect_id = controller.add_suspect(
+        nik="424242", picture_path="/path/to/picture", name="Link Suspect", age=33, gender="True", note="-"
+    ).id
+    assert controller.link_to_cases(suspect_id, [1, 2, 3]) == 3
+    assert controller.add_suspect_to_case(suspect_id, 1) is False
+    assert controller.unlink_from_cases(suspect_id, [1, 2, 3]) == 3
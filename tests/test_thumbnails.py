@@ -0,0 +1,83 @@
+import os
+import shutil
+import threading
+import time
+from PIL import Image
+from src.media import thumbnails
+
+
+def make_picture(path, size=(1200, 800), color=(200, 30, 30)):
+    Image.new("RGB", size, color).save(path, "PNG")
+    return str(path)
+
+
+def test_generate_sizes_and_reuse(tmp_path):
+    """Test that each size is written once and identical pictures share thumbnails."""
+    thumbs = str(tmp_path / ".thumbs")
+    source = make_picture(tmp_path / "a.png")
+    paths = thumbnails.generate(source, thumbnail_dir=thumbs)
+
+    with Image.open(paths[thumbnails.SMALL]) as small:
+        assert small.size == (thumbnails.SMALL, thumbnails.SMALL)
+    with Image.open(paths[thumbnails.LARGE]) as large:
+        assert large.size == (thumbnails.LARGE, 213)
+
+    copy = str(tmp_path / "b.png")
+    shutil.copy(source, copy)
+    mtime = os.stat(paths[thumbnails.SMALL]).st_mtime_ns
+    assert thumbnails.generate(copy, thumbnail_dir=thumbs) == paths
+    assert os.stat(paths[thumbnails.SMALL]).st_mtime_ns == mtime
+
+
+def test_thumbnail_for_falls_back(tmp_path):
+    """Test that views get the original until a thumbnail exists."""
+    thumbs = str(tmp_path / ".thumbs")
+    source = make_picture(tmp_path / "c.png", color=(10, 120, 10))
+
+    assert thumbnails.thumbnail_for(source, thumbnails.SMALL, thumbs) == source
+    paths = thumbnails.generate(source, thumbnail_dir=thumbs)
+    assert thumbnails.thumbnail_for(source, thumbnails.SMALL, thumbs) == paths[thumbnails.SMALL]
+    assert thumbnails.thumbnail_for("img/missing.png", thumbnails.SMALL, thumbs) == "img/missing.png"
+
+
+def test_thumbnail_for_never_hashes_on_the_caller(tmp_path, monkeypatch):
+    """Test that rendering reads digests from stored names and hashes other pictures in the background."""
+    thumbs = str(tmp_path / ".thumbs")
+    legacy = make_picture(tmp_path / "legacy.png", color=(5, 5, 200))
+    digest = thumbnails.file_digest(legacy)
+    stored = str(tmp_path / f"{digest}.png")
+    shutil.copy(legacy, stored)
+    thumbnails.generate(stored, thumbnail_dir=thumbs)
+    small = thumbnails.thumbnail_path(digest, thumbnails.SMALL, thumbs)
+
+    hashed_on = []
+    file_digest = thumbnails.file_digest
+    monkeypatch.setattr(thumbnails, "file_digest", lambda path: (
+        hashed_on.append(threading.current_thread()) or file_digest(path)))
+
+    assert thumbnails.thumbnail_for(stored, thumbnails.SMALL, thumbs) == small
+    assert thumbnails.thumbnail_for(legacy, thumbnails.SMALL, thumbs) == legacy
+    deadline = time.monotonic() + 10
+    while thumbnails.thumbnail_for(legacy, thumbnails.SMALL, thumbs) == legacy:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert thumbnails.thumbnail_for(legacy, thumbnails.SMALL, thumbs) == small
+    assert hashed_on and threading.current_thread() not in hashed_on
+
+
+def test_backfill_reports_failures(tmp_path):
+    """Test that the process pool backfill covers every picture and reports broken ones."""
+    for idx in range(3):
+        make_picture(tmp_path / f"p{idx}.png", color=(idx * 60, 0, 0))
+    (tmp_path / "broken.jpg").write_bytes(b"not an image")
+    (tmp_path / "notes.txt").write_text("skipped")
+    calls = []
+
+    result = thumbnails.backfill(str(tmp_path), workers=2,
+                                 progress=lambda done, total: calls.append((done, total)))
+
+    assert result["pictures"] == 4
+    assert list(result["failed"]) == [str(tmp_path / "broken.jpg")]
+    assert calls[-1] == (4, 4)
+    written = [name for _root, _dirs, names in os.walk(tmp_path / ".thumbs") for name in names]
+    assert len(written) == 3 * len(thumbnails.SIZES)
@@ -1,9 +1,11 @@
+import pytest
 from src.models.victim import Victim
 from src.controllers.victim_controller import VictimController
 
 controller = VictimController()
 
 
+@pytest.mark.max_queries(1)
 def test_get_all_victims():
     """Test that get_all_victims returns all victims."""
     victims = controller.get_all_victims()
@@ -11,6 +13,7 @@ def test_get_all_victims():
     assert all(isinstance(victim, Victim) for victim in victims)
 
 
+@pytest.mark.max_queries(1)
 def test_get_victim_by_id():
     """Test that get_victim_by_id returns a victim by their ID."""
     victim = controller.get_victim_by_id(
@@ -19,6 +22,7 @@ def test_get_victim_by_id():
     assert victim.id == 1
 
 
+@pytest.mark.max_queries(4)
 def test_add_victim():
     """Test that add_victim adds a new victim to the database."""
     # get all victims before adding
@@ -32,3 +36,22 @@ def test_add_victim():
     # get all victims after adding
     victims = controller.get_all_victims()
     assert len(victims) == length + 1
+
+
+@pytest.mark.max_queries(8)
+def test_iter_victim_batches():
+    """Test that iter_victim_batches streams ordered batches and get_victims_before walks back."""
+    for idx in range(3):
+        controller.add_victim(
+            nik=f"77{idx}", picture_path="/path/to/picture", name="Batch Victim", age=20, forensic_result="y" * 500
+        )
+
+    batches = list(controller.iter_victim_batches(batch_size=2))
+    assert all(len(batch) <= 2 for batch in batches)
+    ids = [victim.id for batch in batches for victim in batch]
+    assert ids == sorted(ids)
+    assert all(len(victim.forensic_result) <= 200
+               for batch in batches for victim in batch)
+
+    before = controller.get_victims_before(ids[-1], limit=2)
+    assert [victim.id for victim in before] == ids[-3:-1]